@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Cache of the loaded Alignak configuration
+
+The configuration loaded by the Arbiter is stored in a cache file, with the path, size,
+modification time and content hash of each configuration file. While none of these files
+changed, the configuration is loaded from the cache file rather than loaded again by the
+Arbiter.
+
+The configuration files are found as the Arbiter finds them: the main configuration files, the
+files of their `cfg_file` and `resource_file` directives and the `*.cfg` files in the
+directories of their `cfg_dir` directives.
+"""
+import os
+import re
+import sys
+import hashlib
+
+from six.moves import cPickle as pickle
+
+CACHE_FORMAT = 1
+
+
+def get_cache_dir():
+    """
+    Get the default cache directory (~/.cache/alignak-backend-import)
+
+    :return: cache directory
+    :rtype: str
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+    if not cache_home:
+        cache_home = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'alignak-backend-import')
+
+
+def get_cfg_files(cfg_files):
+    """
+    Get the configuration files read by the Arbiter for the main configuration files
+
+    :param cfg_files: main configuration files
+    :type cfg_files: list
+    :return: configuration files absolute paths, in reading order
+    :rtype: list
+    """
+    found = []
+    if not cfg_files:
+        return found
+    base_dir = os.path.dirname(os.path.abspath(cfg_files[0]))
+
+    def add(file_name):
+        """Add a file once"""
+        file_name = os.path.abspath(file_name)
+        if file_name not in found:
+            found.append(file_name)
+
+    for cfg_file in cfg_files:
+        add(cfg_file)
+        try:
+            with open(cfg_file, 'r') as lines:
+                lines = lines.readlines()
+        except IOError:
+            continue
+        for line in lines:
+            line = line.strip()
+            if '=' not in line:
+                continue
+            directive, path = line.split('=', 1)
+            path = os.path.join(base_dir, path.strip())
+            if re.search("^(cfg_file|resource_file)", directive):
+                add(path)
+            elif re.search("^cfg_dir", directive) and os.path.isdir(path):
+                for root, dummy, walk_files in os.walk(path, followlinks=True):
+                    for found_file in walk_files:
+                        if re.search(r"\.cfg$", found_file):
+                            add(os.path.join(root, found_file))
+    return found
+
+
+def get_files_key(files):
+    """
+    Get the cache key of some files: their path, size, modification time and content hash
+
+    A missing file is keyed with its path only.
+
+    :param files: files paths
+    :type files: list
+    :return: (path, size, modification time, sha1) list
+    :rtype: list
+    """
+    key = []
+    for file_name in files:
+        try:
+            stat = os.stat(file_name)
+            digest = hashlib.sha1()
+            with open(file_name, 'rb') as content:
+                chunk = content.read(65536)
+                while chunk:
+                    digest.update(chunk)
+                    chunk = content.read(65536)
+            key.append((file_name, stat.st_size, stat.st_mtime, digest.hexdigest()))
+        except (IOError, OSError):
+            key.append((file_name, None, None, None))
+    return key
+
+
+class ConfigurationCache(object):  # pylint: disable=useless-object-inheritance
+    """
+    Cache file of the configuration loaded from some main configuration files
+    """
+    def __init__(self, cfg_files, version, cache_dir=None):
+        """
+        :param cfg_files: main configuration files
+        :type cfg_files: list
+        :param version: versions the cached configuration depends on (eg. Alignak version)
+        :type version: str
+        :param cache_dir: cache files directory, default is ~/.cache/alignak-backend-import
+        :type cache_dir: str
+        """
+        self.cfg_files = [os.path.abspath(cfg_file) for cfg_file in cfg_files]
+        self.version = (CACHE_FORMAT, version, sys.version_info[0])
+        self.cache_dir = cache_dir or get_cache_dir()
+        name = hashlib.sha1('\n'.join(self.cfg_files).encode('utf-8')).hexdigest()
+        self.cache_file = os.path.join(self.cache_dir, '%s.cache' % name)
+        self.key = None
+
+    def get_key(self):
+        """
+        Get the cache key of the current configuration files
+
+        :return: cache key
+        :rtype: tuple
+        """
+        if self.key is None:
+            self.key = (self.version, get_files_key(get_cfg_files(self.cfg_files)))
+        return self.key
+
+    def load(self):
+        """
+        Load the cached configuration if the configuration files did not change
+
+        The cache key is read first, the configuration is only read if the key matches.
+
+        :return: cached configuration, None if there is no valid cached configuration
+        """
+        key = self.get_key()
+        try:
+            with open(self.cache_file, 'rb') as cache:
+                if pickle.load(cache) != key:
+                    return None
+                return pickle.load(cache)
+        except Exception:  # pylint: disable=broad-except
+            # Missing, incomplete or incompatible cache file
+            return None
+
+    def save(self, configuration):
+        """
+        Save the configuration in the cache file
+
+        The file is written aside and then renamed, thus a concurrent run never reads an
+        incomplete cache file.
+
+        :param configuration: configuration to cache
+        :return: None
+        :raise: any error when pickling the configuration or writing the file
+        """
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        temporary = '%s.%d' % (self.cache_file, os.getpid())
+        try:
+            with open(temporary, 'wb') as cache:
+                pickle.dump(self.get_key(), cache, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(configuration, cache, pickle.HIGHEST_PROTOCOL)
+            os.rename(temporary, self.cache_file)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
@@ -24,7 +24,13 @@ alignak-backend-import command line interface::
 
     Usage:
         {command} [-h] [-v] [-2] [-q] [-d] [-i] [-e] [-f] [-c]
-                  [-b=url] [-u=username] [-p=password] [<cfg_file>...]
+                  [-b=url] [-u=username] [-p=password]
+                  [--batch-size=size] [--workers=count] [--plan]
+                  [--pool-size=size] [--no-keep-alive] [--max-requests=count]
+                  [--connect-timeout=seconds] [--read-timeout=seconds]
+                  [--log-file=file] [--log-levels=levels] [--no-cache]
+                  [--profile=file] [--profile-stats=file] [--requests-report=file]
+                  [--memory-report] [<cfg_file>...]
 
     Options:
         -h, --help                  Show this screen.
@@ -40,6 +46,31 @@ alignak-backend-import command line interface::
         -2, --very-verbose          Run in very verbose mode (more more info displayed ;)
         -q, --quiet                 Run in quiet mode (almost nothing displayed)
         -g, --gps lat,lng           Specify default GPS location [default: 48.858293, 2.294601]
+        --batch-size size           Post the new elements by lists of size elements [default: 1]
+        --workers count             Post the new elements with count concurrent requests
+                                    and run the independent importation phases concurrently
+                                    [default: 1]
+        --plan                      Display the importation plan (phases dependencies and
+                                    critical path)
+        --pool-size size            Keep up to size connections opened with the backend
+                                    [default: 10]
+        --no-keep-alive             Open a new connection for each backend request
+        --max-requests count        Limit the backend requests sent concurrently, 0 for no
+                                    limit [default: 0]
+        --connect-timeout seconds   Backend connection timeout, no timeout if not set
+        --read-timeout seconds      Backend response timeout, no timeout if not set
+        --log-file file             Also write the messages to file
+        --log-levels levels         Messages level of some importation phases, as a
+                                    phase=level list, comma separated (levels: error,
+                                    warning, info, debug, trace)
+        --no-cache                  Load the configuration with Alignak even if it did not
+                                    change since the last importation
+        --profile file              Write the importation timing report (JSON) to file
+        --profile-stats file        Profile the importation and write the profile
+                                    statistics (cProfile) to file
+        --requests-report file      Write the backend requests metrics (JSON) to file
+        --memory-report             Report the memory used by each importation stage and
+                                    phase (allocations traced with Python 3)
 
     Use cases:
         Display help message:
@@ -73,10 +104,16 @@ import os
 import re
 import time
 import json
+import math
+import cProfile
+import threading
 import traceback
 
 from copy import deepcopy
-from logging import getLogger, INFO
+from functools import partial
+from operator import attrgetter, methodcaller
+from multiprocessing.pool import ThreadPool
+from logging import getLogger, DEBUG, INFO, WARNING
 from future.utils import iteritems
 from six import string_types
 
@@ -111,9 +148,22 @@ from alignak_backend.models import serviceescalation
 from alignak_backend.models import user
 from alignak_backend.models import usergroup
 
-from alignak_backend_client.client import Backend, BackendException
+from alignak_backend_client.client import Backend, BackendException, BACKEND_PAGINATION_LIMIT
 
 from alignak_backend_import import __version__
+from alignak_backend_import.cache import ConfigurationCache
+from alignak_backend_import.extractors import Extractor
+from alignak_backend_import.hierarchy import Hierarchy, sort_by_requirements
+from alignak_backend_import.indexes import index_by, copy_use, split_command_call
+from alignak_backend_import.loading import ParsingCapture
+from alignak_backend_import.logs import TRACE, Progress, get_phase_logger, parse_levels
+from alignak_backend_import.logs import setup_logger
+from alignak_backend_import.memory import MemoryTracker
+from alignak_backend_import.pipeline import Pipeline
+from alignak_backend_import.profiling import Profiler
+from alignak_backend_import.registry import ObjectsRegistry
+from alignak_backend_import.scheduler import PhasesScheduler
+from alignak_backend_import.session import setup_session
 
 loggerClient = getLogger('alignak_backend_client.client')
 loggerClient.setLevel(INFO)
@@ -129,19 +179,49 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
     # Store list of errors found
     errors_found = []
 
+    # Fields stored transformed by the backend (hashed password...), only sent on creation
+    transformed_fields = {'user': ['password']}
+
     def __init__(self):
         self.result = True
         self.later = {}
-        self.inserted = {}
-        self.inserted_uuid = {}
+        self.inserted = ObjectsRegistry()
         self.ignored = {}
         self.updated = {}
+        self.unchanged = {}
+
+        # Elements waiting to be posted, for the resource currently imported in each thread
+        self.current = threading.local()
+        self.current.pending = []
+        self.current.resource = None
+        self.current.existing = None
+        self.pool = None
+
+        # Alignak objects properties extractors, by resource name and Alignak class
+        self.extractors = {}
+
+        # Groups and realms hierarchies, by resource name
+        self.hierarchies = {}
+
+        # Timeperiods dateranges by timeperiod name
+        self.dateranges = {}
+
+        # Configuration commands by name and split command calls
+        self.commands_index = None
+        self.command_calls = {}
+
+        # Configuration notification ways by uuid and name, and their users properties
+        self.notificationways_index = None
+        self.notificationways = {}
 
         self.hosts_templates = []
         self.services_templates = []
 
         start = time.time()
 
+        # Importation timing spans
+        self.profiler = Profiler()
+
         # Set information that we are running...
         os.environ['ALIGNAK_BACKEND_IMPORT_RUN'] = '1'
 
@@ -173,50 +253,146 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
         if '--quiet' in args and args['--quiet']:
             self.quiet = True
 
+        # Messages
+        level = INFO
+        if self.quiet:
+            level = WARNING
+        elif self.very_verbose:
+            level = TRACE
+        elif self.verbose:
+            level = DEBUG
+        phases_levels = None
+        try:
+            phases_levels = parse_levels(args.get('--log-levels'))
+        except ValueError as exp:
+            print("Invalid --log-levels: %s" % exp)
+            print("~~~~~~~~~~~~~~~~~~~~~~~~~~")
+            print("Exiting with error code: 64")
+            self.exit(64)
+        self.logger = setup_logger(level, args.get('--log-file'), phases_levels)
+        self.current.logger = self.logger
+
         # Define here the url of the backend
         self.backend = None
         self.backend_url = args['--backend']
-        self.log("Backend URL: %s" % self.backend_url)
-        self.output("Backend URL: %s" % self.backend_url, forced=True)
+        self.log("Backend URL: %s", self.backend_url)
+        self.output("Backend URL: %s", self.backend_url, forced=True)
 
         self.username = args['--username']
         self.password = args['--password']
-        self.log("Backend login with credentials: %s/%s" % (self.username, self.password))
+        self.log("Backend login with credentials: %s/%s", self.username, self.password)
 
         # Dry-run mode?
         self.dry_run = args['--check']
-        self.log("Dry-run mode (check only): %s" % self.dry_run)
-        self.output("Dry-run mode (check only): %s" % self.dry_run, forced=True)
+        self.log("Dry-run mode (check only): %s", self.dry_run)
+        self.output("Dry-run mode (check only): %s", self.dry_run, forced=True)
 
         # Delete all objects in backend ?
         self.destroy_backend_data = args['--delete']
-        self.log("Delete existing backend data: %s" % self.destroy_backend_data)
-        self.output("Delete existing backend data: %s" % self.destroy_backend_data, forced=True)
+        self.log("Delete existing backend data: %s", self.destroy_backend_data)
+        self.output("Delete existing backend data: %s", self.destroy_backend_data, forced=True)
 
         # Update objects in the backend rather than create them
         self.update_backend_data = args['--update']
-        self.log("Updating backend data: %s" % self.update_backend_data)
-        self.output("Updating backend data: %s" % self.update_backend_data, forced=True)
+        self.log("Updating backend data: %s", self.update_backend_data)
+        self.output("Updating backend data: %s", self.update_backend_data, forced=True)
 
         # Allow duplicate objects
         self.allow_duplicates = False
         if '--duplicate' in args:
             self.allow_duplicates = args['--duplicate']
-        self.log("Allowing duplicate objects: %s" % self.allow_duplicates)
-        self.output("Allowing duplicate objects: %s" % self.allow_duplicates, forced=True)
+        self.log("Allowing duplicate objects: %s", self.allow_duplicates)
+        self.output("Allowing duplicate objects: %s", self.allow_duplicates, forced=True)
+
+        # Post elements by batches
+        self.batch_size = 1
+        if '--batch-size' in args and args['--batch-size']:
+            try:
+                self.batch_size = max(1, int(args['--batch-size']))
+            except ValueError:
+                print("Invalid batch size: %s" % args['--batch-size'])
+                print("~~~~~~~~~~~~~~~~~~~~~~~~~~")
+                print("Exiting with error code: 64")
+                self.exit(64)
+        self.log("Posting elements by batches of: %d", self.batch_size)
+        self.output("Posting elements by batches of: %d", self.batch_size, forced=True)
+
+        # Post elements concurrently
+        self.workers = 1
+        if '--workers' in args and args['--workers']:
+            try:
+                self.workers = max(1, int(args['--workers']))
+            except ValueError:
+                print("Invalid workers count: %s" % args['--workers'])
+                print("~~~~~~~~~~~~~~~~~~~~~~~~~~")
+                print("Exiting with error code: 64")
+                self.exit(64)
+        if self.workers > 1:
+            self.pool = ThreadPool(self.workers)
+        self.log("Posting workers: %d", self.workers)
+        self.output("Posting workers: %d", self.workers, forced=True)
+
+        # Display the importation plan
+        self.plan = False
+        if '--plan' in args:
+            self.plan = args['--plan']
+
+        # Backend connections
+        self.connections = None
+        self.session_parameters = {
+            'pool_size': 10, 'keep_alive': True, 'max_in_flight': 0,
+            'connect_timeout': None, 'read_timeout': None
+        }
+        if '--no-keep-alive' in args and args['--no-keep-alive']:
+            self.session_parameters['keep_alive'] = False
+        for option, parameter, cast in [('--pool-size', 'pool_size', int),
+                                        ('--max-requests', 'max_in_flight', int),
+                                        ('--connect-timeout', 'connect_timeout', float),
+                                        ('--read-timeout', 'read_timeout', float)]:
+            if option not in args or args[option] is None:
+                continue
+            try:
+                self.session_parameters[parameter] = max(0, cast(args[option]))
+            except ValueError:
+                print("Invalid %s value: %s" % (option, args[option]))
+                print("~~~~~~~~~~~~~~~~~~~~~~~~~~")
+                print("Exiting with error code: 64")
+                self.exit(64)
+        self.session_parameters['pool_size'] = max(1, self.session_parameters['pool_size'])
+        self.log("Backend connections: %s", self.session_parameters)
+        self.output("Backend connections: %s", self.session_parameters, forced=True)
 
         self.gps = {"type": "Point", "coordinates": [48.858293, 2.294601]}
         if '--gps' in args:
             point = args['--gps'].split(',')
             self.gps.coordinates = point
-        self.log("Default host location: %s" % self.gps)
-        self.output("Default host location: %s" % self.gps, forced=True)
+        self.log("Default host location: %s", self.gps)
+        self.output("Default host location: %s", self.gps, forced=True)
+
+        # Load the configuration from the cache if it did not change
+        self.use_cache = True
+        if '--no-cache' in args and args['--no-cache']:
+            self.use_cache = False
+        self.log("Configuration cache: %s", self.use_cache)
+
+        # Profiling report and statistics
+        self.profile_file = args.get('--profile')
+        self.profile_stats_file = args.get('--profile-stats')
+        self.requests_report_file = args.get('--requests-report')
+        self.memory_report = args.get('--memory-report', False)
+        if self.memory_report:
+            self.profiler.memory = MemoryTracker()
+            self.profiler.memory.start()
+        self.cprofile = None
+        if self.profile_stats_file:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
 
         # Get the configuration files
         cfg = None
         if '<cfg_file>' in args:
             cfg = args['<cfg_file>']
-            self.log("Configuration to load: %s" % cfg)
+            self.log("Configuration to load: %s", cfg)
         else:
             self.log("No configuration specified")
 
@@ -227,76 +403,50 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
             self.exit(2)
 
         if cfg:
-            self.output("Importing configuration: %s" % cfg, forced=True)
+            self.output("Importing configuration: %s", cfg, forced=True)
 
             if not isinstance(cfg, list):
                 cfg = [cfg]
 
+            span = self.profiler.span('load_configuration').start()
+            self.arbiter = None
+            self.alignak_conf = None
             self.raw_conf = None
-            try:
-                # Try old Arbiter signature...
-                # - daemon configuration file
-                # - monitoring configuration files list
-                # - is_daemon
-                # - do_replace
-                # - verify_only
-                # - debug
-                # - debug_file
-                # - arbiter_name
-                # pylint: disable=too-many-function-args
-                self.arbiter = Arbiter(None, cfg, False, False, False, False, '', 'arbiter-master')
-                self.alignak_version = '1'
-            except Exception as exp:
-                self.output("Tried Alignak version 1, but: %s" % str(exp), forced=True)
-                # Using values that are usually provided by the command line parameters
-                args = {
-                    'env_file': '',
-                    'alignak_name': 'alignak-test', 'daemon_name': 'arbiter-master',
-                    'legacy_cfg_files': cfg
-                }
-                self.arbiter = Arbiter(**args)
-                self.alignak_version = '2'
-            self.output("Using Alignak version: %s" % self.alignak_version, forced=True)
-
-            # Configure the logger
-            self.arbiter.log_level = 'ERROR'
-            self.arbiter.setup_alignak_logger()
-
-            # Setup our modules manager
-            self.arbiter.load_modules_manager()
-
-            # Load and initialize the arbiter configuration
-            # This to check that the configuration is correct!
-            self.arbiter.load_monitoring_config_file(clean=False)
-
-            # Raw configuration
-            self.raw_conf = Config()
-            if self.alignak_version == '2':
-                # Read and parse the legacy configuration files
-                self.raw_objects = self.raw_conf.read_config_buf(
-                    self.raw_conf.read_legacy_cfg_files(
-                        cfg, self.arbiter.alignak_env.cfg_files
-                        if self.arbiter.alignak_env else None)
-                )
-                # Create objects for our arbiters and modules
-                self.raw_conf.early_create_objects(self.raw_objects)
-                self.raw_conf.create_objects(self.raw_objects)
-
-                # # Check that an arbiter link exists and create the appropriate relations
-                # # If no arbiter exists, create one with the provided data
-                # self.raw_conf.early_arbiter_linking('arbiter-master',
-                #                                     self.alignak_env.get_alignak_configuration())
+            self.raw_objects = None
+            cache = None
+            cached = None
+            if self.use_cache:
+                cache = ConfigurationCache(cfg, ALIGNAK_VERSION)
+                cached = cache.load()
+            if cached is not None:
+                self.alignak_version = cached['alignak_version']
+                self.alignak_conf = cached['conf']
+                self.raw_conf = cached['raw_conf']
+                self.raw_objects = cached['raw_objects']
+                self.output("Configuration cache: hit, loaded from %s", cache.cache_file,
+                            forced=True)
             else:
-                # Try old Arbiter file parsing...
-                buf = self.raw_conf.read_config(cfg)
-                self.raw_objects = self.raw_conf.read_config_buf(buf)
+                self.load_configuration(cfg)
+                if cache is not None:
+                    self.output("Configuration cache: miss, saved to %s", cache.cache_file,
+                                forced=True)
+                    try:
+                        cache.save({
+                            'alignak_version': self.alignak_version, 'conf': self.alignak_conf,
+                            'raw_conf': self.raw_conf, 'raw_objects': self.raw_objects
+                        })
+                    except Exception as exp:  # pylint: disable=broad-except
+                        self.output("Configuration cache not saved: %s", str(exp), forced=True)
+            span.stop()
 
             end = time.time()
-            self.output("Elapsed time after Arbiter has loaded the configuration: %s"
-                        % (end - start), forced=True)
+            self.output("Elapsed time after Arbiter has loaded the configuration: %s", end - start,
+                        forced=True)
 
         # Authenticate on Backend
+        span = self.profiler.span('bootstrap').start()
         self.authenticate()
+        self.profiler.counter = self.connections
 
         if self.dry_run:
             print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~"
@@ -307,23 +457,23 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                   "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
 
         # Default realm
-        self.inserted['realm'] = {}
+        self.inserted.init('realm')
         self.realm_all = ''
         self.default_realm = ''
         realms = self.backend.get_all('realm')
         for r in realms['_items']:
             if r['name'] == 'All' and r['_level'] == 0:
-                self.inserted['realm'][r['_id']] = 'All'
+                self.inserted.register('realm', r['_id'], 'All')
                 self.realm_all = r['_id']
 
         # Default timeperiods
-        self.inserted['timeperiod'] = {}
+        self.inserted.init('timeperiod')
         self.al_always = None
         self.tp_always = None
         timeperiods = self.backend.get_all('timeperiod')
         for tp in timeperiods['_items']:
             if tp['name'] == '24x7':
-                self.inserted['timeperiod'][tp['_id']] = '24x7'
+                self.inserted.register('timeperiod', tp['_id'], '24x7')
                 self.tp_always = tp['_id']
 
         self.al_none = None
@@ -332,42 +482,44 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
         timeperiods = self.backend.get_all('timeperiod')
         for tp in timeperiods['_items']:
             if tp['name'] == 'Never':
-                self.inserted['timeperiod'][tp['_id']] = 'Never'
+                self.inserted.register('timeperiod', tp['_id'], 'Never')
                 self.tp_never = tp['_id']
 
         # Default user
-        self.inserted['user'] = {}
+        self.inserted.init('user')
         users = self.backend.get_all('user')
         for u in users['_items']:
             if u['name'] == 'admin':
-                self.inserted['user'][u['_id']] = 'admin'
+                self.inserted.register('user', u['_id'], 'admin')
 
         # Default commands
-        self.inserted['command'] = {}
+        self.inserted.init('command')
         self.default_command = ''
         commands = self.backend.get_all('command')
         for c in commands['_items']:
             if c['name'] == '_internal_host_up':
-                self.inserted['command'][c['_id']] = c['name']
+                self.inserted.register('command', c['_id'], c['name'])
                 self.default_command = c['_id']
             if c['name'].startswith('_'):
-                self.inserted['command'][c['_id']] = c['name']
+                self.inserted.register('command', c['_id'], c['name'])
 
         # Default dummy host
-        self.inserted['host'] = {}
+        self.inserted.init('host')
         self.dummy_host = ''
         hosts = self.backend.get_all('host')
         for h in hosts['_items']:
             if h['name'] == '_dummy':
-                self.inserted['host'][h['_id']] = h['name']
+                self.inserted.register('host', h['_id'], h['name'])
                 self.dummy_host = h['_id']
+        span.stop()
 
         if cfg:
             # Build templates lists from raw Arbiter objects
-            self.build_templates()
+            with self.profiler.span('build_templates'):
+                self.build_templates()
             self.output("-----")
-            self.output("Found %d hosts templates" % len(self.hosts_templates))
-            self.output("Found %d services templates" % len(self.services_templates))
+            self.output("Found %d hosts templates", len(self.hosts_templates))
+            self.output("Found %d services templates", len(self.services_templates))
 
             if not self.dummy_host:
                 self.output("**********")
@@ -376,24 +528,31 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                 self.output("**********")
 
             end = time.time()
-            self.output("Elapsed time after templates are built: %s" % (end - start))
+            self.output("Elapsed time after templates are built: %s", end - start)
 
             # Rebuild the date ranges in the raw Arbiter objects (raw objects are modified!)
-            self.recompose_dateranges()
+            with self.profiler.span('recompose_dateranges'):
+                self.recompose_dateranges()
 
         # Delete data in backend if asked in arguments
         if self.destroy_backend_data:
-            self.delete_data()
+            with self.profiler.span('delete_data'):
+                self.delete_data()
 
         end = time.time()
-        self.output("Elapsed time after backend cleaning: %s" % (end - start))
+        self.output("Elapsed time after backend cleaning: %s", end - start)
 
         if cfg:
             # Import the objects in the backend
-            self.import_objects()
+            with self.profiler.span('import_objects'):
+                self.import_objects()
+
+            if self.pool is not None:
+                self.pool.close()
+                self.pool.join()
 
             end = time.time()
-            self.output("Elapsed time after importation: %s" % (end - start))
+            self.output("Elapsed time after importation: %s", end - start)
 
         if self.errors_found:
             print('############################# errors report ##################################')
@@ -402,6 +561,107 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
             print('##############################################################################')
         self.result = len(self.errors_found) == 0
 
+        if self.memory_report:
+            self.profiler.memory.stop()
+            self.output("Memory report:", forced=True)
+            for line in self.profiler.memory.get_lines():
+                self.output(line, forced=True)
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.profile_stats_file)
+            self.output("Profile statistics written to %s", self.profile_stats_file, forced=True)
+        if self.profile_file:
+            try:
+                self.profiler.write_report(self.profile_file)
+                self.output("Timing report written to %s", self.profile_file, forced=True)
+            except IOError as exp:
+                print("Timing report not written: %s" % exp)
+
+    def load_configuration(self, cfg):
+        """
+        Load the configuration with the Alignak Arbiter, and get the raw objects it parsed
+
+        :param cfg: main configuration files
+        :type cfg: list
+        :return: None
+        """
+        try:
+            # Try old Arbiter signature...
+            # - daemon configuration file
+            # - monitoring configuration files list
+            # - is_daemon
+            # - do_replace
+            # - verify_only
+            # - debug
+            # - debug_file
+            # - arbiter_name
+            # pylint: disable=too-many-function-args
+            self.arbiter = Arbiter(None, cfg, False, False, False, False, '', 'arbiter-master')
+            self.alignak_version = '1'
+        except Exception as exp:
+            self.output("Tried Alignak version 1, but: %s", str(exp), forced=True)
+            # Using values that are usually provided by the command line parameters
+            args = {
+                'env_file': '',
+                'alignak_name': 'alignak-test', 'daemon_name': 'arbiter-master',
+                'legacy_cfg_files': cfg
+            }
+            self.arbiter = Arbiter(**args)
+            self.alignak_version = '2'
+        self.output("Using Alignak version: %s", self.alignak_version, forced=True)
+
+        # Configure the logger
+        self.arbiter.log_level = 'ERROR'
+        self.arbiter.setup_alignak_logger()
+
+        # Setup our modules manager
+        self.arbiter.load_modules_manager()
+
+        # Load and initialize the arbiter configuration
+        # This to check that the configuration is correct!
+        # The raw objects parsed by the Arbiter are captured to get the templates
+        loading_start = time.time()
+        with ParsingCapture(Config) as parsing:
+            self.arbiter.load_monitoring_config_file(clean=False)
+        loading_end = time.time()
+
+        # Raw configuration
+        self.raw_conf = Config()
+        if self.alignak_version == '2':
+            self.raw_objects = parsing.raw_objects
+            if self.raw_objects is None:
+                self.output("The Arbiter parsed objects were not captured, "
+                            "parsing the configuration again", forced=True)
+                # Read and parse the legacy configuration files
+                self.raw_objects = self.raw_conf.read_config_buf(
+                    self.raw_conf.read_legacy_cfg_files(
+                        cfg, self.arbiter.alignak_env.cfg_files
+                        if self.arbiter.alignak_env else None)
+                )
+            # Only the contacts, hosts and services templates are used from the raw
+            # configuration, do not create the other objects again
+            for o_type in ['contact', 'host', 'service']:
+                self.raw_conf.create_objects_for_type(self.raw_objects, o_type)
+
+            # # Check that an arbiter link exists and create the appropriate relations
+            # # If no arbiter exists, create one with the provided data
+            # self.raw_conf.early_arbiter_linking('arbiter-master',
+            #                                     self.alignak_env.get_alignak_configuration())
+        else:
+            # Try old Arbiter file parsing...
+            buf = self.raw_conf.read_config(cfg)
+            self.raw_objects = self.raw_conf.read_config_buf(buf)
+
+        self.output("Configuration loading: reading files %.2fs, parsing %.2fs, "
+                    "Arbiter objects and checks %.2fs, raw templates %.2fs",
+                    parsing.durations['read_legacy_cfg_files'],
+                    parsing.durations['read_config_buf'],
+                    loading_end - loading_start - sum(parsing.durations.values()),
+                    time.time() - loading_end, forced=True)
+
+        # Alignak objects
+        self.alignak_conf = self.arbiter.conf
+
     def exit(self, code):
         """
         Exit the script
@@ -410,7 +670,7 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
         """
 
         # Delete environment variable
-        del os.environ['ALIGNAK_BACKEND_IMPORT_RUN']
+        os.environ.pop('ALIGNAK_BACKEND_IMPORT_RUN', None)
 
         exit(code)
 
@@ -426,6 +686,7 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
             # headers = {'Content-Type': 'application/json'}
             # payload = {'username': self.username, 'password': self.password, 'action': 'generate'}
             self.backend = Backend(self.backend_url)
+            self.connections = setup_session(self.backend, **self.session_parameters)
             self.backend.login(self.username, self.password)
         except BackendException as e:
             print("Backend exception: %s" % str(e))
@@ -442,111 +703,37 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
         """
         Delete data in the backend
 
+        The resources are deleted level by level: the backend creates again some default
+        elements (realm All, timeperiods, commands, admin user...) when a resource is deleted,
+        and these default elements are linked to the elements of the previous levels. The
+        resources of a same level are deleted concurrently if several workers are used.
+
         :return: None
         """
+        levels = [
+            [('realm', "realms")],
+            [('command', "commands"), ('timeperiod', "timeperiods")],
+            [('user', "users and templates"), ('usergroup', "usergroups"),
+             ('host', "hosts and templates"), ('hostdependency', "hostdependencys"),
+             ('hostgroup', "hostgroups"), ('hostescalation', "hostescalations"),
+             ('service', "services and templates"), ('servicedependency', "servicedependencys"),
+             ('servicegroup', "servicegroups"), ('serviceescalation', "serviceescalations"),
+             ('livesynthesis', "livesynthesis"), ('actionacknowledge', "actions acknowledge"),
+             ('actiondowntime', "actions downtime"), ('actionforcecheck', "actions re-check")],
+            [('userrestrictrole', "userrestrictroles")]
+        ]
         try:
-            headers = {'Content-Type': 'application/json'}
             self.output("~~~~~~~~~~~~~~~~~~~~~~~~ "
                         "Deleting existing backend data ~~~~~~~~~~~~~~~~~~~~~~")
-            self.output("Deleting realms")
-            # Get realms in _level reverse order to be able to delete them ...
-            elements = self.backend.get_all('realm', params={'sort': '-_level'})
-            if not self.dry_run:
-                self.backend.delete('realm', headers)
-            elements = self.backend.get_all('realm')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting commands")
-            if not self.dry_run:
-                self.backend.delete('command', headers)
-            elements = self.backend.get_all('command')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting timeperiods")
-            if not self.dry_run:
-                self.backend.delete('timeperiod', headers)
-            elements = self.backend.get_all('timeperiod')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting users and templates")
-            if not self.dry_run:
-                self.backend.delete('user', headers)
-            elements = self.backend.get_all('user')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting usergroups")
-            if not self.dry_run:
-                self.backend.delete('usergroup', headers)
-            elements = self.backend.get_all('usergroup')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting hosts and templates")
-            if not self.dry_run:
-                self.backend.delete('host', headers)
-            elements = self.backend.get_all('host')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting hostdependencys")
-            if not self.dry_run:
-                self.backend.delete('hostdependency', headers)
-            elements = self.backend.get_all('hostdependency')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting hostgroups")
-            if not self.dry_run:
-                self.backend.delete('hostgroup', headers)
-            elements = self.backend.get_all('hostgroup')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting hostescalations")
-            if not self.dry_run:
-                self.backend.delete('hostescalation', headers)
-            elements = self.backend.get_all('hostescalation')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting services and templates")
-            if not self.dry_run:
-                self.backend.delete('service', headers)
-            elements = self.backend.get_all('service')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting servicedependencys")
-            if not self.dry_run:
-                self.backend.delete('servicedependency', headers)
-            elements = self.backend.get_all('servicedependency')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting servicegroups")
-            if not self.dry_run:
-                self.backend.delete('servicegroup', headers)
-            elements = self.backend.get_all('servicegroup')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting serviceescalations")
-            if not self.dry_run:
-                self.backend.delete('serviceescalation', headers)
-            elements = self.backend.get_all('serviceescalation')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting userrestrictroles")
-            if not self.dry_run:
-                self.backend.delete('userrestrictrole', headers)
-            elements = self.backend.get_all('userrestrictrole')
-            self.output(" -> remaining: %d elements" % len(elements['_items']))
-
-            self.output("Deleting livesynthesis")
-            if not self.dry_run:
-                self.backend.delete('livesynthesis', headers)
-
-            self.output("Deleting actions acknowledge")
-            if not self.dry_run:
-                self.backend.delete('actionacknowledge', headers)
-            self.output("Deleting actions downtime")
-            if not self.dry_run:
-                self.backend.delete('actiondowntime', headers)
-            self.output("Deleting actions re-check")
-            if not self.dry_run:
-                self.backend.delete('actionforcecheck', headers)
+            for level in levels:
+                resources = [resource for resource, dummy in level]
+                if self.pool is not None and len(resources) > 1:
+                    remaining = self.pool.map(self.delete_resource, resources)
+                else:
+                    remaining = [self.delete_resource(resource) for resource in resources]
+                for (dummy, title), count in zip(level, remaining):
+                    self.output("Deleted %s", title)
+                    self.output(" -> remaining: %d elements", count)
 
             self.output("~~~~~~~~~~~~~~~~~~~~~~~~ "
                         "Existing backend data destroyed ~~~~~~~~~~~~~~~~~~~~~")
@@ -562,10 +749,26 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
         try:
             self.output("Deleting Alignak retention data")
             if not self.dry_run:
-                self.backend.delete('alignakretention', headers)
+                self.backend.delete('alignakretention', {'Content-Type': 'application/json'})
         except BackendException as e:
             print("Alignak retention does not exist.")
 
+    def delete_resource(self, resource):
+        """
+        Delete all the elements of a resource in the backend
+
+        :param resource: resource name (command, user, host...)
+        :type resource: str
+        :return: remaining elements count
+        :rtype: int
+        """
+        headers = {'Content-Type': 'application/json'}
+        if not self.dry_run:
+            self.backend.delete(resource, headers)
+        # Only get the elements count, not the elements
+        response = self.backend.get(resource, params={'max_results': 1})
+        return response['_meta']['total']
+
     def build_templates(self):  # pylint:disable=too-many-locals
         """
         Get the templates from the raw objects and build templates lists
@@ -605,12 +808,10 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
         self.users_templates = []
         self.log("Alignak users templates:")
         users = getattr(self.raw_conf, 'contacts')
-        for tmp_user in users:
-            for conf_user in getattr(self.arbiter.conf, 'contacts'):
-                if conf_user.contact_name == tmp_user.contact_name:
-                    # print("User: %s" % tmp_user.__dict__)
-                    if getattr(tmp_user, 'use', None):
-                        setattr(conf_user, 'store_use', tmp_user.use)
+        conf_users = index_by(getattr(self.alignak_conf, 'contacts'),
+                              attrgetter('contact_name'))
+        copy_use(users, conf_users, attrgetter('contact_name'), only_defined=True)
+        names = set()
         for tpl_uuid in users.templates:
             name = getattr(users.templates[tpl_uuid], 'name', None)
             if name is None:
@@ -619,32 +820,27 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
             for c in forbidden:
                 name = name.replace(c, '_')
             setattr(users.templates[tpl_uuid], 'name', name)
-            self.log("- %s (from %s) - use: %s"
-                     % (name, tpl_uuid, getattr(users.templates[tpl_uuid], 'use', '')))
-            found = False
-            for template in self.users_templates:
-                if getattr(template, 'name', '') == name:
-                    found = True
-                    break
-            if not found:
+            self.log("- %s (from %s) - use: %s", name, tpl_uuid,
+                     getattr(users.templates[tpl_uuid], 'use', ''))
+            if name not in names:
+                names.add(name)
                 self.users_templates.append(users.templates[tpl_uuid])
 
+        self.users_templates = self.sort_templates('user', self.users_templates)
+
         # Dump users templates
         self.output("Users templates:")
         for template in self.users_templates:
-            for conf_user in getattr(self.arbiter.conf, 'contacts'):
-                if conf_user.contact_name == template.name:
-                    setattr(conf_user, 'store_use', getattr(template, 'use', []))
-            self.output("- %s" % getattr(template, 'name'))
-        users = getattr(self.arbiter.conf, 'contacts')
+            for conf_user in conf_users.get(template.name, []):
+                setattr(conf_user, 'store_use', getattr(template, 'use', []))
+            self.output("- %s", getattr(template, 'name'))
 
         self.hosts_templates = []
         self.log("Alignak hosts templates:")
         hosts = getattr(self.raw_conf, 'hosts')
-        for tmp_host in hosts:
-            for conf_host in getattr(self.arbiter.conf, 'hosts'):
-                if conf_host.host_name == tmp_host.host_name:
-                    setattr(conf_host, 'store_use', tmp_host.use)
+        conf_hosts = index_by(getattr(self.alignak_conf, 'hosts'), attrgetter('host_name'))
+        copy_use(hosts, conf_hosts, attrgetter('host_name'))
+        names = set()
         for tpl_uuid in hosts.templates:
             name = getattr(hosts.templates[tpl_uuid], 'name', None)
             if name is None:
@@ -653,41 +849,38 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
             for c in forbidden:
                 name = name.replace(c, '_')
             setattr(hosts.templates[tpl_uuid], 'name', name)
-            self.log("- %s (from %s) - use: %s"
-                     % (name, tpl_uuid, getattr(hosts.templates[tpl_uuid], 'use', '')))
-            found = False
-            for template in self.hosts_templates:
-                if getattr(template, 'name', '') == name:
-                    found = True
-                    break
-            if not found:
+            self.log("- %s (from %s) - use: %s", name, tpl_uuid,
+                     getattr(hosts.templates[tpl_uuid], 'use', ''))
+            if name not in names:
+                names.add(name)
                 self.hosts_templates.append(hosts.templates[tpl_uuid])
 
+        self.hosts_templates = self.sort_templates('host', self.hosts_templates)
+
         # Dump hosts templates
         self.output("Hosts templates:")
+        hosts_templates = {}
         for template in self.hosts_templates:
-            for conf_host in getattr(self.arbiter.conf, 'hosts'):
-                if conf_host.host_name == template.name:
-                    setattr(conf_host, 'store_use', getattr(template, 'use', []))
-            self.output("- %s" % getattr(template, 'name'))
+            for conf_host in conf_hosts.get(template.name, []):
+                setattr(conf_host, 'store_use', getattr(template, 'use', []))
+            hosts_templates.setdefault(template.get_name(), template)
+            self.output("- %s", getattr(template, 'name'))
 
         self.services_templates = []
         self.log("Alignak services templates:")
         services = getattr(self.raw_conf, 'services')
-        for tmp_service in services:
-            for conf_service in getattr(self.arbiter.conf, 'services'):
-                if conf_service.service_description == tmp_service.service_description:
-                    if conf_service.host == tmp_service.host:
-                        setattr(conf_service, 'store_use', tmp_service.use)
+        service_key = attrgetter('service_description', 'host')
+        conf_services = index_by(getattr(self.alignak_conf, 'services'), service_key)
+        copy_use(services, conf_services, service_key)
+        names = set()
         for tpl_uuid in services.templates:
             name = getattr(services.templates[tpl_uuid], 'name', None)
             if name is None:
                 continue
             service_description = getattr(services.templates[tpl_uuid],
                                           'service_description', '')
-            self.log("- %s / %s (from %s) - use: %s"
-                     % (name, service_description, tpl_uuid,
-                        getattr(services.templates[tpl_uuid], 'use', '')))
+            self.log("- %s / %s (from %s) - use: %s", name, service_description, tpl_uuid,
+                     getattr(services.templates[tpl_uuid], 'use', ''))
             # Set name as template name and service description
             if service_description:
                 name = "%s_%s" % (name, service_description)
@@ -698,7 +891,7 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
             for c in forbidden:
                 name = name.replace(c, '_')
             setattr(services.templates[tpl_uuid], 'name', name)
-            self.log("Service template: %s (from %s)" % (name, service_description))
+            self.log("Service template: %s (from %s)", name, service_description)
 
             host_name = getattr(services.templates[tpl_uuid], 'host_name', None)
             if not host_name:
@@ -707,7 +900,7 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                 host_name = "_dummy"
                 setattr(services.templates[tpl_uuid], 'host_name', "_dummy")
             else:
-                self.log("  attached host: %s" % (host_name))
+                self.log("  attached host: %s", host_name)
 
             # Only the service templates that are declared host_name... service template
             # that may be related to an host template
@@ -719,20 +912,19 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
             # Define a service template for each host and define a link from the service
             # template to the corresponding host template
             for host_name in host_names:
-                self.output("  linked to host: %s" % (host_name))
-                for host_template in self.hosts_templates:
-                    if host_name == host_template.get_name():
-                        # self.log(" -> found host: %s" % (host_name))
-                        if not hasattr(host_template, 'linked_services_templates'):
-                            setattr(host_template, 'linked_services_templates', [tpl_uuid])
-                        host_template.linked_services_templates.append(tpl_uuid)
-
-                        if not hasattr(services.templates[tpl_uuid], 'linked_hosts_templates'):
-                            setattr(services.templates[tpl_uuid],
-                                    'linked_hosts_templates',
-                                    [host_name])
-                        services.templates[tpl_uuid].linked_hosts_templates.append(host_name)
-                        break
+                self.output("  linked to host: %s", host_name)
+                host_template = hosts_templates.get(host_name)
+                if host_template is not None:
+                    # self.log(" -> found host: %s" % (host_name))
+                    if not hasattr(host_template, 'linked_services_templates'):
+                        setattr(host_template, 'linked_services_templates', [tpl_uuid])
+                    host_template.linked_services_templates.append(tpl_uuid)
+
+                    if not hasattr(services.templates[tpl_uuid], 'linked_hosts_templates'):
+                        setattr(services.templates[tpl_uuid],
+                                'linked_hosts_templates',
+                                [host_name])
+                    services.templates[tpl_uuid].linked_hosts_templates.append(host_name)
                 # self.log(" -> linked host: %s" % (linked_host))
                 if hasattr(services.templates[tpl_uuid], 'linked_hosts_templates'):
                     services.templates[tpl_uuid].linked_hosts_templates = \
@@ -740,32 +932,89 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                 setattr(services.templates[tpl_uuid], 'host_name', host_name.strip())
 
                 # Add a service template in our list
-                found = False
-                for template in self.services_templates:
-                    if getattr(template, 'name', '') == name:
-                        found = True
-                        break
-                if not found:
+                if name not in names:
+                    names.add(name)
                     self.services_templates.append(services.templates[tpl_uuid])
 
+        self.services_templates = self.sort_templates('service', self.services_templates)
+
         # Dump services templates
         self.output("Services templates and relations:")
         for template in self.services_templates:
-            for conf_service in getattr(self.arbiter.conf, 'services'):
-                if conf_service.service_description == getattr(template, 'service_description', ''):
-                    if conf_service.host == template.host:
-                        setattr(conf_service, 'store_use', getattr(template, 'use', []))
-            self.output("- %s (host: %s) (linked hosts: %s)"
-                        % (getattr(template, 'name'),
-                           getattr(template, 'host_name'),
-                           getattr(template, 'linked_hosts_templates', 'none')))
+            key = (getattr(template, 'service_description', ''), getattr(template, 'host', None))
+            for conf_service in conf_services.get(key, []):
+                setattr(conf_service, 'store_use', getattr(template, 'use', []))
+            self.output("- %s (host: %s) (linked hosts: %s)", getattr(template, 'name'),
+                        getattr(template, 'host_name'),
+                        getattr(template, 'linked_hosts_templates', 'none'))
+
+    def sort_templates(self, r_name, templates):
+        """
+        Sort the templates so that each template is imported after the templates it uses
+
+        The templates that use each other can not be sorted, they are reported and imported
+        after the other templates; their used templates will be set later.
+
+        :param r_name: resource name
+        :type r_name: str
+        :param templates: templates list
+        :type templates: list
+        :return: sorted templates list
+        :rtype: list
+        """
+        ordered, cyclic = sort_by_requirements(templates, attrgetter('name'),
+                                               lambda template: getattr(template, 'use', []))
+        if cyclic:
+            self.output("Cyclic use of %s templates, their templates will be set later: %s", r_name,
+                        ', '.join([template.name for template in cyclic]), forced=True)
+        return ordered + cyclic
+
+    def sort_parents_first(self, r_name, elements):
+        """
+        Sort the hosts, groups or realms so that each element is imported after its parents
+
+        The links to the parents are then resolved when the elements are created, rather than
+        with a late update of each element. The hosts are sorted by level in the network tree
+        to avoid posting the current batch for each host having a parent in this batch.
+
+        The elements in a parents cycle can not be sorted, they are reported and imported
+        after the other elements; their parents will be set later.
+
+        :param r_name: resource name
+        :type r_name: str
+        :param elements: Alignak elements
+        :return: sorted elements list
+        :rtype: list
+        """
+        if r_name in self.hierarchies:
+            ordered, cyclic = self.hierarchies[r_name].get_order()
+        else:
+            # The hosts parents are the parents uuid or name
+            names = dict((host.uuid, host.get_name()) for host in elements)
+
+            def get_parents(host):
+                """Get the names of the parents of a host"""
+                parents = getattr(host, 'parents', None) or []
+                if isinstance(parents, string_types):
+                    parents = parents.split(',')
+                return [names.get(parent.strip(), parent.strip()) for parent in parents]
+
+            ordered, cyclic = sort_by_requirements(elements, methodcaller('get_name'),
+                                                   get_parents, levels=True)
+        if cyclic:
+            self.output("Cyclic parents of %s, their parents will be set later: %s", r_name,
+                        ', '.join([element.get_name() for element in cyclic]), forced=True)
+        return ordered + cyclic
 
     def recompose_dateranges(self):
         """
         For each timeperiod, recompose daterange in backend format
 
+        The dateranges are stored in self.dateranges, by timeperiod name.
+
         :return: None
         """
+        self.dateranges = {}
         # modify dateranges of timeperiods
         fields = ['imported_from', 'use', 'name', 'definition_order', 'register',
                   'timeperiod_name', 'alias', 'dateranges', 'exclude', 'is_active']
@@ -791,12 +1040,17 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                                 dateranges.append({explode_dr[0]: explode_dr[-1].strip()})
                             else:
                                 dateranges.append({propti: times})
-            ti['dr'] = dateranges
+            if ti.get('timeperiod_name'):
+                self.dateranges[ti['timeperiod_name'][0]] = dateranges
 
     def recompose_commands(self, commands):
         """
         Rebuild command (or commands) property
 
+        The configuration commands are indexed by name on the first call and the command
+        calls strings are split only once. The index is only shared once it is complete, thus a
+        concurrent call never gets an incomplete index.
+
         Returns a list of tuples containing:
         - command uuid
         - command name
@@ -820,22 +1074,67 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                 commands_list.append((cmd_in_list.uuid, c_command, c_params))
             else:
                 # Explode command name as command / args
-                c_call = cmd_in_list.replace(r'\!', '___PROTECT_EXCLAMATION___')
-                tab = c_call.split('!')
-                c_command = tab[0].strip()
-                c_params = [s.replace('___PROTECT_EXCLAMATION___', '!') for s in tab[1:]]
-
-                commands = getattr(self.arbiter.conf, 'commands')
-                for cmd in commands:
-                    if cmd.command_name == c_command:
-                        self.output("-> Replaced command name with command id for: %s" % (
-                            cmd.command_name
-                        ))
-                        commands_list.append((cmd.uuid, c_command, c_params))
-                        break
+                c_command, c_params = split_command_call(cmd_in_list, self.command_calls)
+
+                commands_index = self.commands_index
+                if commands_index is None:
+                    commands_index = {}
+                    for cmd in getattr(self.alignak_conf, 'commands'):
+                        commands_index.setdefault(cmd.command_name, cmd)
+                    self.commands_index = commands_index
+                cmd = commands_index.get(c_command)
+                if cmd is not None:
+                    self.output("-> Replaced command name with command id for: %s",
+                                cmd.command_name)
+                    commands_list.append((cmd.uuid, c_command, c_params))
 
         return commands_list
 
+    def get_notification_way(self, name):
+        """
+        Get a notification way from its uuid or its name
+
+        The notification ways are indexed by uuid and name on the first call and the user
+        properties of each notification way are stored in self.notificationways:
+        notifications enabled, periods (backend timeperiods), options and minimum business
+        impact. Both tables are only shared once they are complete, thus a concurrent call
+        never gets an incomplete table.
+
+        :param name: notification way uuid or name
+        :type name: str
+        :return: notification way or None if it does not exist
+        """
+        notificationways_index = self.notificationways_index
+        if notificationways_index is None:
+            notificationways_index = {}
+            notificationways = {}
+            for nw in getattr(self.alignak_conf, 'notificationways'):
+                notificationways_index.setdefault(nw.uuid, nw)
+                notificationways_index.setdefault(nw.get_name(), nw)
+
+                properties = {
+                    'host_notifications_enabled': nw.host_notifications_enabled,
+                    'service_notifications_enabled': nw.service_notifications_enabled,
+                    'host_notification_options': nw.host_notification_options,
+                    'service_notification_options': nw.service_notification_options,
+                    'min_business_impact': nw.min_business_impact
+                }
+                for period in ['host_notification_period', 'service_notification_period']:
+                    properties[period] = getattr(nw, period)
+                    if getattr(nw, period) == self.al_always:
+                        properties[period] = self.tp_always
+                    elif getattr(nw, period) in [self.al_none, self.al_never]:
+                        properties[period] = self.tp_never
+                notificationways[nw.uuid] = properties
+            # The properties before the index: the index users then read the properties
+            self.notificationways = notificationways
+            self.notificationways_index = notificationways_index
+
+        try:
+            return notificationways_index.get(name)
+        except TypeError:
+            return None
+
     def convert_objects(self, source):
         """
         Convert objects in name of this object
@@ -852,43 +1151,22 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
         for prop in source:
             # Notification ways
             if prop == 'notificationways':
-                self.output("  The user has some NWs: %s" % (source[prop]))
+                self.output("  The user has some NWs: %s", source[prop])
                 if 'host_notification_commands' in source:
                     self.output("  The user has some host notification commands:")
                     for c in source['host_notification_commands']:
-                        self.output("  - %s" % c.get_name())
+                        self.output("  - %s", c.get_name())
                 if 'service_notification_commands' in source:
                     self.output("  The user has some service notification commands:")
                     for c in source['service_notification_commands']:
-                        self.output("  - %s" % c.get_name())
-                nws = getattr(self.arbiter.conf, 'notificationways')
+                        self.output("  - %s", c.get_name())
                 for user_nw in source[prop]:
-                    for nw in nws:
-                        if user_nw not in [nw.uuid, nw.get_name()]:
-                            continue
-                        self.output("  - found a matching NW: %s" % (nw.get_name()))
+                    nw = self.get_notification_way(user_nw)
+                    if nw is not None:
+                        self.output("  - found a matching NW: %s", nw.get_name())
 
                         # Update user information with the notification way properties
-                        addprop['host_notifications_enabled'] = nw.host_notifications_enabled
-                        addprop['service_notifications_enabled'] = nw.service_notifications_enabled
-                        if nw.host_notification_period == self.al_always:
-                            addprop['host_notification_period'] = self.tp_always
-                        elif nw.host_notification_period == self.al_none:
-                            addprop['host_notification_period'] = self.tp_never
-                        elif nw.host_notification_period == self.al_never:
-                            addprop['host_notification_period'] = self.tp_never
-                        else:
-                            addprop['host_notification_period'] = nw.host_notification_period
-                        if nw.service_notification_period == self.al_always:
-                            addprop['service_notification_period'] = self.tp_always
-                        elif nw.service_notification_period == self.al_none:
-                            addprop['service_notification_period'] = self.tp_never
-                        elif nw.service_notification_period == self.al_never:
-                            addprop['service_notification_period'] = self.tp_never
-                        else:
-                            addprop['service_notification_period'] = nw.service_notification_period
-                        addprop['host_notification_options'] = nw.host_notification_options
-                        addprop['service_notification_options'] = nw.service_notification_options
+                        addprop.update(self.notificationways[nw.uuid])
                         if 'host_notification_commands' in source:
                             addprop['host_notification_commands'] = \
                                 source['host_notification_commands']
@@ -904,11 +1182,8 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                         else:
                             addprop['service_notification_commands'] = \
                                 nw.service_notification_commands
-                        addprop['min_business_impact'] = nw.min_business_impact
 
-                        self.output("  updating user notifications with NW data: %s" % addprop)
-                        # And then ignore other defined NW
-                        break
+                        self.output("  updating user notifications with NW data: %s", addprop)
         source.update(addprop)
 
         # Second iteration after update of notification ways (#19)
@@ -925,7 +1200,7 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                 if is_commands_list:
                     source[prop] = []
                 for c_id, c_name, c_args in new_commands:
-                    self.output("- new command %s: %s - %s - %s" % (prop, c_id, c_name, c_args))
+                    self.output("- new command %s: %s - %s - %s", prop, c_id, c_name, c_args)
                     if is_commands_list:
                         source[prop].append(c_name)
                     else:
@@ -933,7 +1208,7 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                     # Only manage arguments for check_command
                     if prop in ['check_command'] and c_args:
                         addprop['%s_args' % prop] = c_args
-                        self.output("-> Added %s_args: %s" % (prop, addprop['%s_args' % prop]))
+                        self.output("-> Added %s_args: %s", prop, addprop['%s_args' % prop])
                     if not is_commands_list:
                         break
                 addprop[prop] = source[prop]
@@ -946,40 +1221,39 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                 if is_commands_list:
                     source[prop] = []
                 for c_id, c_name, c_args in new_commands:
-                    self.output("- new command %s: %s - %s - %s" % (prop, c_id, c_name, c_args))
+                    self.output("- new command %s: %s - %s - %s", prop, c_id, c_name, c_args)
                     if is_commands_list:
                         source[prop].append(c_name)
                     else:
                         source[prop] = c_name
                     if c_args:
                         addprop['%s_args' % prop] = c_args
-                        self.output("-> Added %s_args: %s" % (prop, addprop['%s_args' % prop]))
+                        self.output("-> Added %s_args: %s", prop, addprop['%s_args' % prop])
                     if not is_commands_list:
                         break
                 addprop[prop] = source[prop]
 
             if prop == 'dateranges':
-                for ti in self.raw_objects['timeperiod']:
-                    if ti['timeperiod_name'][0] == source['timeperiod_name']:
-                        source[prop] = ti['dr']
+                if source['timeperiod_name'] in self.dateranges:
+                    source[prop] = self.dateranges[source['timeperiod_name']]
             elif isinstance(source[prop], list) and source[prop] and isinstance(source[prop][0],
                                                                                 Item):
                 elements = []
                 for element in source[prop]:
                     for name in names:
                         if hasattr(element, name):
-                            self.log('Found %s in prop %s' % (name, prop))
+                            self.log('Found %s in prop %s', name, prop)
                             elements.append(getattr(element, name))
                             break
                 source[prop] = elements
             elif isinstance(source[prop], Item):
                 for name in names:
                     if hasattr(source[prop], name):
-                        self.log('Found %s in prop %s' % (name, prop))
+                        self.log('Found %s in prop %s', name, prop)
                         source[prop] = getattr(source[prop], name)
                         break
             elif isinstance(source[prop], object):
-                self.log("%s = %s" % (prop, source[prop]))
+                self.log("%s = %s", prop, source[prop])
 
             # Rename contact as user ...
             if prop == 'contacts':
@@ -1001,89 +1275,98 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                 source.pop('contactgroups')
 
         source.update(addprop)
-        self.log("Converted: %s" % source)
+        self.log("Converted: %s", source)
         return source
 
-    def update_later(self, resource, field):
+    def get_later_value(self, resource, index, field, item):
         """
-        Update field of resource having a link with other resources (objectid in backend)
+        Get the value of a field of resource having a link with other resources
 
         :param resource: resource name (command, user, host...)
         :type resource: str
+        :param index: element _id
+        :type index: str
         :param field: field of resource to update
         :type field: str
+        :param item: link to update (type, resource, value)
+        :type item: dict
+        :return: linked element _id (simple) or _ids list (list)
+        """
+        if item['type'] == 'simple':
+            value = []
+            val = item['value']
+            _id = self.inserted.resolve(item['resource'], val)
+            if _id is None:
+                self.errors_found.append("# Unknown %s: %s for %s" % (item['resource'],
+                                                                      val, resource))
+                self.log("Late update for: %s/%s -> %s / %s", resource, index, item, field)
+                self.log("Resource: %s", self.inserted.get_name(resource, index))
+            else:
+                value = _id
+            self.output("Late update simple for: %s/%s -> %s", resource, index, value)
+            return value
+
+        value = []
+        if isinstance(item['value'], string_types):
+            item['value'] = item['value'].split(',')
+        for val in item['value']:
+            val = val.strip()
+            if not val:
+                continue
+            _id = self.inserted.resolve(item['resource'], val)
+            if _id is None:
+                if field == '_templates':
+                    self.log("Late update for: %s/%s -> %s / %s", resource, index, item, field)
+                    self.log("Resource: %s", self.inserted.get_name(resource, index))
+                    continue
+                self.errors_found.append("# Unknown %s: %s for %s" % (item['resource'],
+                                                                      val, resource))
+                self.log("Late update for: %s/%s -> %s / %s", resource, index, item, field)
+                self.log("Resource: %s", self.inserted.get_name(resource, index))
+            else:
+                value.append(_id)
+        self.output("Late update list for: %s/%s -> %s", resource, index, value)
+        return value
+
+    def update_later(self, resource, fields):
+        """
+        Update fields of resource having a link with other resources (objectid in backend)
+
+        All the fields to update of an element are merged to patch the element only once.
+        The elements are patched with the _etag tracked since their creation, thus no request
+        is needed to get their current _etag, except if they were modified in the meantime.
+
+        The updated links are removed from the links to update later.
+
+        :param resource: resource name (command, user, host...)
+        :type resource: str
+        :param fields: fields of resource to update
+        :type fields: list
         :return: None
         """
         headers = {'Content-Type': 'application/json'}
-        for (index, item) in iteritems(self.later[resource][field]):
-            self.output("Late update for: %s/%s -> %s, field: %s" % (resource, index, item, field))
-            if item['type'] == 'simple':
-                data = {field: []}
-                val = item['value']
-                if val not in self.inserted[item['resource']] and \
-                   val not in self.inserted[item['resource']].values() and \
-                   val not in self.inserted_uuid[item['resource']].values():
-                    self.errors_found.append("# Unknown %s: %s for %s" % (item['resource'],
-                                                                          val, resource))
-                    self.log("Late update for: %s/%s -> %s / %s" % (resource, index, item, field))
-                    self.log("Resource: %s" % (self.inserted[item['resource']][index]))
-                    self.log("Inserted: %s" % self.inserted[item['resource']])
-                    self.log("Inserted: %s" % self.inserted[item['resource']].values())
-                    self.log("Inserted: %s" % self.inserted_uuid[item['resource']].values())
-                else:
-                    if val in self.inserted[item['resource']]:
-                        data[field] = self.inserted[item['resource']][val]
-                    elif val in self.inserted[item['resource']].values():
-                        idx = list(self.inserted[item['resource']].values()).index(val)
-                        data[field] = list(self.inserted[item['resource']].keys())[idx]
-                    elif val in self.inserted_uuid[item['resource']].values():
-                        idx = list(self.inserted_uuid[item['resource']].values()).index(val)
-                        data[field] = list(self.inserted_uuid[item['resource']].keys())[idx]
-                self.output("Late update simple for: %s/%s -> %s" % (resource, index, data))
-            elif item['type'] == 'list':
-                data = {field: []}
-                if isinstance(item['value'], string_types):
-                    item['value'] = item['value'].split(',')
-                for val in item['value']:
-                    val = val.strip()
-                    if not val:
-                        continue
-                    if val not in self.inserted[item['resource']] and \
-                       val not in self.inserted[item['resource']].values() and \
-                       val not in self.inserted_uuid[item['resource']].values():
-                        if field == '_templates':
-                            self.log("Late update for: %s/%s -> %s / %s"
-                                     % (resource, index, item, field))
-                            self.log("Resource: %s"
-                                     % (self.inserted[item['resource']][index]))
-                            continue
-                        self.errors_found.append("# Unknown %s: %s for %s" % (item['resource'],
-                                                                              val, resource))
-                        self.log("Late update for: %s/%s -> %s / %s"
-                                 % (resource, index, item, field))
-                        self.log("Resource: %s" % (self.inserted[item['resource']][index]))
-                        self.log("Inserted: %s" % self.inserted[item['resource']])
-                        self.log("Inserted: %s" % self.inserted[item['resource']].values())
-                        self.log("Inserted: %s" % self.inserted_uuid[item['resource']].values())
-                    else:
-                        if val in self.inserted[item['resource']]:
-                            data[field].append(self.inserted[item['resource']][val])
-                        elif val in self.inserted[item['resource']].values():
-                            idx = list(self.inserted[item['resource']].values()).index(val)
-                            data[field].append(
-                                list(self.inserted[item['resource']].keys())[idx])
-                        elif val in self.inserted_uuid[item['resource']].values():
-                            idx = list(self.inserted_uuid[item['resource']].values()).index(val)
-                            data[field].append(
-                                list(self.inserted_uuid[item['resource']].keys())[idx])
-                self.output("Late update list for: %s/%s -> %s" % (resource, index, data))
-
+        documents = {}
+        links = 0
+        for field in fields:
+            for (index, item) in iteritems(self.later[resource].get(field, {})):
+                self.output("Late update for: %s/%s -> %s, field: %s", resource, index, item, field)
+                if index not in documents:
+                    documents[index] = {'data': {}, '_etag': item['_etag']}
+                documents[index]['data'][field] = self.get_later_value(resource, index,
+                                                                       field, item)
+                links += 1
+
+        for (index, document) in iteritems(documents):
+            data = document['data']
             endpoint = ''.join([resource, '/', index])
             try:
-                self.output("Late update, before_patch: %s : %s:" % (endpoint, data))
+                self.output("Late update, before_patch: %s : %s:", endpoint, data)
                 if not self.dry_run:
-                    to_patch = self.backend.get(endpoint)
-                    headers['If-Match'] = to_patch['_etag']
+                    # Use the tracked _etag, the backend client gets the current _etag
+                    # and patches again only if the element changed since (412 error)
+                    if document['_etag'] is None:
+                        document['_etag'] = self.backend.get(endpoint)['_etag']
+                    headers['If-Match'] = document['_etag']
                     resp = self.backend.patch(endpoint, data, headers, True)
                 else:
                     resp = {'_status': 'OK', '_etag': '_fake'}
@@ -1104,40 +1387,23 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
                             if index in self.later[resource][ind]:
                                 self.later[resource][ind][index]['_etag'] = resp['_etag']
 
-    def manage_resource(self, r_name, data_later, id_name, schema, template=False):
-        # pylint: disable=protected-access, too-many-arguments
-        # pylint: disable=too-many-locals
-        """
-        Array of data to include in internal cache or to update with internal objects cache:
-        data_later = [
-            {
-                'field': 'use', 'type': 'simple|list', 'resource': 'command', 'now': True
-            }
-        ]
-        field: field name in the current managed element
-        type: object type (list, ...)
-        resource: object backend element type
-        now: tries to update immediatly or store for a future update (update_later)
+            for field in data:
+                del self.later[resource][field][index]
 
+        if documents:
+            self.output("Late updates for %s: %d links updated with %d patches, %d patches saved",
+                        resource, links, len(documents), links - len(documents), forced=True)
+
+    @staticmethod
+    def get_alignak_resource(r_name):
+        """
+        Get the Alignak configuration objects list name of a backend resource
 
-        :param template:
         :param r_name: resource name
         :type r_name: str
-        :param data_later:
-        :param id_name:
-        :param schema:
-        :return:
+        :return: Alignak objects list name
+        :rtype: str
         """
-        if r_name not in self.inserted:
-            self.inserted[r_name] = {}
-        if r_name not in self.inserted_uuid:
-            self.inserted_uuid[r_name] = {}
-        if r_name not in self.later:
-            self.later[r_name] = {}
-        for dummy, values in enumerate(data_later):
-            if values['field'] not in self.later[r_name]:
-                self.later[r_name][values['field']] = {}
-
         alignak_resource = r_name + 's'
         if re.search('y$', r_name):
             alignak_resource = re.sub('y$', 'ies', r_name)
@@ -1149,1601 +1415,2396 @@ class CfgToBackend(object):  # pylint: disable=useless-object-inheritance
             alignak_resource = 'contacts'
         elif r_name == 'usergroup':
             alignak_resource = 'contactgroups'
+        return alignak_resource
 
-        # Alignak defined timeperiods
-        timeperiods = getattr(self.arbiter.conf, 'timeperiods')
-
-        elements = None
-        # Alignak defined hostgroups
-        if r_name == 'hostgroup':
-            hgs = getattr(self.arbiter.conf, 'hostgroups')
-            for hg in hgs:
-                hg._parent = None
-
-            for hg in hgs:
-                for child in sorted(hg.get_hostgroup_members()):
-                    if not child:
-                        continue
-                    # Search child group...
-                    self.output("Found child: %s for %s" % (
-                        child, hg.hostgroup_name
-                    ))
-                    for group in hgs:
-                        if group.get_name() == child:
-                            self.output("Found parent: %s (%s) for %s" % (
-                                hg.uuid, hg.hostgroup_name, group
-                            ))
-                            group._parent = hg.uuid
-                            break
-            for hg in hgs:
-                self.output("HG: %s (%s) - %s" % (
-                    hg.uuid, hg.hostgroup_name, hg._parent
-                ))
-                hg.properties['_parent'] = hg._parent
-            elements = hgs
-        # Alignak defined servicegroups
-        elif r_name == 'servicegroup':
-            sgs = getattr(self.arbiter.conf, 'servicegroups')
-            for sg in sgs:
-                sg._parent = None
-
-            for sg in sgs:
-                for child in sorted(sg.get_servicegroup_members()):
-                    if not child:
-                        continue
-                    # Search child group...
-                    self.output("Found child: %s for %s" % (
-                        child, sg.servicegroup_name
-                    ))
-                    for group in sgs:
-                        if group.get_name() == child:
-                            self.output("Found parent: %s (%s) for %s" % (
-                                sg.uuid, sg.servicegroup_name, group
-                            ))
-                            group._parent = sg.uuid
-                            break
-            for sg in sgs:
-                self.output("SG: %s (%s) - %s" % (
-                    sg.uuid, sg.servicegroup_name, sg._parent
-                ))
-                sg.properties['_parent'] = sg._parent
-            elements = sgs
-        # Alignak defined usergroups
-        elif r_name == 'usergroup':
-            ugs = getattr(self.arbiter.conf, 'contactgroups')
-            for ug in ugs:
-                ug._parent = None
-
-            for ug in ugs:
-                for child in sorted(ug.get_contactgroup_members()):
-                    if not child:
-                        continue
-                    # Search child group...
-                    self.output("Found child: %s for %s" % (
-                        child, ug.contactgroup_name
-                    ))
-                    for group in ugs:
-                        if group.get_name() == child:
-                            self.output("Found parent: %s (%s) for %s" % (
-                                ug.uuid, ug.contactgroup_name, group
-                            ))
-                            group._parent = ug.uuid
-                            break
-            for ug in ugs:
-                self.output("UG: %s (%s) - %s" % (
-                    ug.uuid, ug.contactgroup_name, ug._parent
-                ))
-                ug.properties['_parent'] = ug._parent
-            elements = ugs
-        elif r_name == 'realm':
-            # Create a parent relation between the realms (this relation does not exist anymore...)
-            realms = getattr(self.arbiter.conf, 'realms')
-            for _realm in realms:
-                # Create a parent relation between the realms
-                # (this relation does not exist anymore...)
-                for pp_realm in getattr(self.arbiter.conf, 'realms'):
-                    if pp_realm.realm_members and _realm.get_name() in pp_realm.realm_members:
-                        _realm.higher_realms = [pp_realm.get_name()]
-                        break
-            elements = realms
-        else:
-            elements = getattr(self.arbiter.conf, alignak_resource)
-        self.log("Alignak (conf = %s): %s" % (self.arbiter.conf, elements))
-
-        # Alignak defined realms
-        if not self.default_realm:
-            realms = getattr(self.arbiter.conf, 'realms')
-            default_realm = realms.get_default()
-            # print("Realm: %s" % default_realm.__dict__)
-            self.output("Realms: %s, default: %s" % (realms, default_realm))
-            self.default_realm = default_realm.uuid
-            self.output("*** Alignak default realm: %s (%s)" % (
-                self.default_realm, default_realm.get_name()
-            ))
-
-        # Build templates list to replace Alignak elements
-        if template:
-            self.inserted['%s_template' % r_name] = {}
-            if r_name == 'user':
-                elements = self.users_templates
+    def get_extractor(self, r_name, item_obj, id_name, schema):
+        """
+        Get the extractor of the properties of an Alignak object
 
-            if r_name == 'host':
-                elements = self.hosts_templates
+        The extractor only reads the Alignak properties that are fields of the backend
+        resource schema, or that are converted to backend fields. It is built once for each
+        resource and Alignak objects class.
 
-            if r_name == 'service':
-                elements = self.services_templates
+        :param r_name: resource name
+        :type r_name: str
+        :param item_obj: Alignak object
+        :param id_name: Alignak property of the object name
+        :type id_name: str
+        :param schema: backend resource schema
+        :type schema: dict
+        :return: properties extractor
+        :rtype: Extractor
+        """
+        key = (r_name, item_obj.__class__)
+        if key not in self.extractors:
+            fields = None
+            if not schema.get('allow_unknown'):
+                fields = schema['schema']
+            self.extractors[key] = Extractor(list(item_obj.properties.keys()) + ['store_use'],
+                                             fields, keep=[id_name])
+            self.log("Extracted %s properties: %s", r_name, ', '.join(self.extractors[key].names))
+        return self.extractors[key]
+
+    def get_pipeline(self, r_name, data_later, id_name, schema, template=False):
+        # pylint: disable=too-many-arguments
+        """
+        Compile the transformation of the Alignak elements of a resource to backend elements
 
-        count = 1
-        for item_obj in elements:
-            if not item_obj:
-                continue
-            item = {}
+        The transformation steps that apply to the resource are selected once, including the
+        resolution of each link of data_later. Each element is then transformed by running
+        these steps (see Pipeline).
 
-            self.log("...................................")
-            self.log("Manage %s: %s (%s)" % (r_name, item_obj.uuid, item_obj.get_name()))
-            self.log("...................................")
-            if template:
-                item['name'] = getattr(item_obj, 'name')
-                self.output("- importing %s template #%d: %s"
-                            % (r_name, count, item_obj.get_name()), forced=True)
+        :param r_name: resource name
+        :type r_name: str
+        :param data_later: links of the resource elements
+        :type data_later: list
+        :param id_name: Alignak property of the element name
+        :type id_name: str
+        :param schema: backend resource schema
+        :type schema: dict
+        :param template: the elements are templates
+        :type template: bool
+        :return: transformation pipeline
+        :rtype: Pipeline
+        """
+        allow_unknown = schema.get('allow_unknown')
+
+        steps = [('retain', self.transform_retain)]
+        if r_name in ['timeperiod', 'realm', 'hostgroup', 'servicegroup', 'usergroup',
+                      'command']:
+            steps.append(('ignore', partial(self.transform_ignore, r_name, id_name)))
+
+        # Special case of timeperiods (except maintenance_period and snapshot_period)
+        tp_names = [tp_name for tp_name in ['host_notification_period',
+                                            'service_notification_period', 'check_period',
+                                            'notification_period', 'escalation_period',
+                                            'dependency_period']
+                    if allow_unknown or tp_name in schema['schema']]
+        if tp_names:
+            steps.append(('timeperiods', partial(self.transform_timeperiods, tp_names,
+                                                 getattr(self.alignak_conf, 'timeperiods'))))
+
+        steps.append(('convert', self.transform_convert))
+        if r_name == 'realm':
+            steps.append(('realm', partial(self.transform_realm, id_name)))
+        else:
+            steps.append(('realm', partial(self.transform_element_realm, r_name)))
+
+        # Only import element custom variables if schema allows unknown fields ...
+        # ... not the best solution. They should be imported in 'customs' defined array field!
+        if 'customs' in schema['schema']:
+            steps.append(('customs', self.transform_customs))
+        elif allow_unknown:
+            steps.append(('customs', self.transform_customs_fields))
+
+        specific = {
+            'hostdependency': self.transform_hostdependency,
+            'hostescalation': partial(self.transform_hostescalation, id_name),
+            'servicedependency': self.transform_servicedependency,
+            'serviceescalation': partial(self.transform_serviceescalation, id_name),
+            'hostgroup': self.transform_hostgroup,
+            'host': partial(self.transform_host, r_name, template),
+            'servicegroup': self.transform_servicegroup,
+            'service': partial(self.transform_service, r_name, id_name, template),
+            'usergroup': self.transform_usergroup,
+            'user': partial(self.transform_user, id_name, template)
+        }
+        if r_name in specific:
+            steps.append((r_name, specific[r_name]))
+        if r_name in ['host', 'service']:
+            steps.append(('periods', self.transform_periods))
+        steps.append(('command_args', self.transform_command_args))
+        if r_name == 'hostdependency':
+            steps.append(('dependency_name', self.transform_hostdependency_name))
+        if r_name == 'servicedependency':
+            steps.append(('dependency_name', self.transform_servicedependency_name))
+        steps.append(('templates', partial(self.transform_templates, r_name)))
+
+        # Links to the parents (or children) resolved when the elements are created
+        for values in data_later:
+            parent = values['resource'] == r_name and values['field'] != '_templates'
+            if values['type'] == 'simple':
+                step = partial(self.link_simple, values, parent)
+            elif values['now']:
+                step = partial(self.link_list, values, parent)
             else:
-                if r_name == 'service':
-                    service_host_name = item_obj.host_name
-                    if item_obj.host_name in self.inserted['host']:
-                        service_host_name = self.inserted['host'][item_obj.host_name]
-                    self.output("- importing %s #%d: %s/%s"
-                                % (r_name, count, service_host_name,
-                                   item_obj.get_name()), forced=True)
-                else:
-                    self.output("- importing %s #%d: %s"
-                                % (r_name, count, item_obj.get_name()), forced=True)
-            count += 1
-
-            # Only deal with properties and our own added property,
-            for prop in list(item_obj.properties.keys()) + ['store_use']:
-                if not hasattr(item_obj, prop):
-                    continue
-                item[prop] = getattr(item_obj, prop)
-            # As of it, ignore attributes (use, name, definition_order and register) !
+                step = partial(self.link_later, values)
+            steps.append(('link %s' % values['field'], step))
 
-            # Remove unused attributes...
-            # ------------------------------------------------------------
-            #  - retain_nonstatus_information / retain_status_information
-            if 'retain_status_information' in item:
-                # self.output("-> remove retain_status_information.")
-                item.pop('retain_status_information')
-            if 'retain_nonstatus_information' in item:
-                # self.output("-> remove retain_nonstatus_information.")
-                item.pop('retain_nonstatus_information')
-
-            # Ignore specific items ...
-            # ------------------------------------------------------------
-            #  - admin user (managed later...)
-
-            #  - default timeperiod
-            if r_name == 'timeperiod' and item[id_name].lower() in ["24x7", "always"]:
-                self.output("-> do not change anything for default timeperiod.")
-                self.al_always = item_obj.uuid
-                continue
+        steps.append(('name', partial(self.transform_name, r_name, id_name)))
+        return Pipeline(steps)
 
-            if r_name == 'timeperiod' and item[id_name].lower() in ["none", "never"]:
-                self.al_never = item_obj.uuid
-                self.output("-> do not change anything for default timeperiod.")
-                continue
+    def transform_retain(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Remove the retention properties
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        # Remove unused attributes...
+        # ------------------------------------------------------------
+        #  - retain_nonstatus_information / retain_status_information
+        if 'retain_status_information' in item:
+            # self.output("-> remove retain_status_information.")
+            item.pop('retain_status_information')
+        if 'retain_nonstatus_information' in item:
+            # self.output("-> remove retain_nonstatus_information.")
+            item.pop('retain_nonstatus_information')
+        return item
+
+    def transform_ignore(self, r_name, id_name, item, item_obj, later_tmp):
+        # pylint: disable=too-many-arguments, unused-argument
+        """
+        Ignore the default elements (timeperiods, realm, groups) and the specific
+        commands
 
-            #  - default realm
-            if r_name == 'realm' and item[id_name] == "All":
-                self.output("-> do not change anything for default realm: %s." % self.realm_all)
+        :param r_name: resource name
+        :type r_name: str
+        :param id_name: Alignak property of the element name
+        :type id_name: str
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        # Ignore specific items ...
+        # ------------------------------------------------------------
+        #  - admin user (managed later...)
+
+        #  - default timeperiod
+        if r_name == 'timeperiod' and item[id_name].lower() in ["24x7", "always"]:
+            self.output("-> do not change anything for default timeperiod.")
+            self.al_always = item_obj.uuid
+            return None
+
+        if r_name == 'timeperiod' and item[id_name].lower() in ["none", "never"]:
+            self.al_never = item_obj.uuid
+            self.output("-> do not change anything for default timeperiod.")
+            return None
+
+        #  - default realm
+        if r_name == 'realm' and item[id_name] == "All":
+            self.output("-> do not change anything for default realm: %s.", self.realm_all)
+            return None
+
+        #  - default hostgroup
+        if r_name == 'hostgroup' and item[id_name] == "All":
+            self.output("-> do not change anything for default hostgroup.")
+            return None
+
+        #  - default servicegroup
+        if r_name == 'servicegroup' and item[id_name] == "All":
+            self.output("-> do not change anything for default servicegroup.")
+            return None
+
+        #  - default usergroup
+        if r_name == 'usergroup' and item['contactgroup_name'] == "All":
+            self.output("-> do not change anything for default usergroup.")
+            return None
+
+        #  - specific commands
+        if r_name == 'command' and item[id_name] in ['bp_rule', '_internal_host_up',
+                                                     '_echo', '_set_state']:
+            self.output("-> do not import this command.")
+            return None
+        return item
+
+    def transform_timeperiods(self, tp_names, timeperiods, item, item_obj, later_tmp):
+        # pylint: disable=too-many-arguments, unused-argument
+        """
+        Replace the default timeperiods with the backend timeperiods
+
+        :param tp_names: timeperiods fields of the resource
+        :type tp_names: list
+        :param timeperiods: Alignak timeperiods
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        for tp_name in tp_names:
+            if tp_name not in item:
                 continue
 
-            #  - default hostgroup
-            if r_name == 'hostgroup' and item[id_name] == "All":
-                self.output("-> do not change anything for default hostgroup.")
+            if not item[tp_name]:
+                # Default is always
+                item[tp_name] = self.tp_always
                 continue
 
-            #  - default servicegroup
-            if r_name == 'servicegroup' and item[id_name] == "All":
-                self.output("-> do not change anything for default servicegroup.")
+            if item[tp_name].lower() == '24x7':
+                item[tp_name] = self.tp_always
                 continue
 
-            #  - default usergroup
-            if r_name == 'usergroup' and item['contactgroup_name'] == "All":
-                self.output("-> do not change anything for default usergroup.")
+            if item[tp_name].lower() == 'never' or item[tp_name].lower() == 'none':
+                item[tp_name] = self.tp_never
                 continue
 
-            #  - specific commands
-            if r_name == 'command' and item[id_name] in ['bp_rule', '_internal_host_up',
-                                                         '_echo', '_set_state']:
-                self.output("-> do not import this command.")
-                continue
+            if item[tp_name] in timeperiods and \
+               timeperiods[item[tp_name]] and \
+               timeperiods[item[tp_name]].timeperiod_name.lower() == '24x7':
+                item[tp_name] = self.tp_always
+        return item
 
-            # Update specific values for timeperiods...
-            # ------------------------------------------------------------
-            # Special case of timeperiods (except maintenance_period and snapshot_period)
-            for tp_name in ['host_notification_period', 'service_notification_period',
-                            'check_period', 'notification_period', 'escalation_period',
-                            'dependency_period']:
-                if tp_name not in item:
-                    continue
+    def transform_convert(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Convert the linked objects and remove the unused properties
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        # Convert objects
+        # ------------------------------------------------------------
+        item = self.convert_objects(item)
+        # Remove properties
+        prop_to_del = []
+        for prop in item:
+            if item[prop] is None:
+                prop_to_del.append(prop)
+            elif prop == 'register':
+                prop_to_del.append(prop)
+            elif prop == '_id':
+                prop_to_del.append(prop)
+            elif prop == 'imported_from':
+                prop_to_del.append(prop)
+            elif prop == 'invalid_entries':
+                prop_to_del.append(prop)
+            elif prop == 'activated_once':
+                prop_to_del.append(prop)
+            elif prop == 'unresolved':
+                prop_to_del.append(prop)
+
+            # case we have [''], rewrite it to []
+            elif isinstance(item[prop], list) and len(item[prop]) == 1 and item[prop][0] == '':
+                del item[prop][0]
+        for prop in prop_to_del:
+            self.log("Delete %s property", prop)
+            del item[prop]
+        return item
+
+    def transform_realm(self, id_name, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Set the parent of a realm
+
+        :param id_name: Alignak property of the element name
+        :type id_name: str
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        self.output(" --> realm: %s - %s", id_name, item)
 
-                if not item[tp_name]:
-                    # Default is always
-                    item[tp_name] = self.tp_always
-                    continue
+        if 'members' in item:
+            # Remove this field
+            item.pop('members')
 
-                if item[tp_name].lower() == '24x7':
-                    item[tp_name] = self.tp_always
-                    continue
+        if 'group_members' in item:
+            # Remove this field
+            item.pop('group_members')
 
-                if item[tp_name].lower() == 'never' or item[tp_name].lower() == 'none':
-                    item[tp_name] = self.tp_never
-                    continue
+        if 'passively_checked_hosts' in item:
+            # Remove this field
+            item.pop('passively_checked_hosts')
 
-                if item[tp_name] in timeperiods and \
-                   timeperiods[item[tp_name]] and \
-                   timeperiods[item[tp_name]].timeperiod_name.lower() == '24x7':
-                    item[tp_name] = self.tp_always
-
-            # Convert objects
-            # ------------------------------------------------------------
-            item = self.convert_objects(item)
-            # Remove properties
-            prop_to_del = []
-            for prop in item:
-                if item[prop] is None:
-                    prop_to_del.append(prop)
-                elif prop == 'register':
-                    prop_to_del.append(prop)
-                elif prop == '_id':
-                    prop_to_del.append(prop)
-                elif prop == 'imported_from':
-                    prop_to_del.append(prop)
-                elif prop == 'invalid_entries':
-                    prop_to_del.append(prop)
-                elif prop == 'activated_once':
-                    prop_to_del.append(prop)
-                elif prop == 'unresolved':
-                    prop_to_del.append(prop)
-
-                # case we have [''], rewrite it to []
-                elif isinstance(item[prop], list) and len(item[prop]) == 1 and item[prop][0] == '':
-                    del item[prop][0]
-            for prop in prop_to_del:
-                self.log("Delete %s property" % prop)
-                del item[prop]
+        if 'actively_checked_hosts' in item:
+            # Remove this field
+            item.pop('actively_checked_hosts')
 
-            later_tmp = {}
+        if 'definition_order' in item:
+            # Remove this field
+            item.pop('definition_order')
 
-            # Special process for realms
-            if r_name == 'realm':
-                self.output(" --> realm: %s - %s" % (id_name, item))
-
-                if 'members' in item:
-                    # Remove this field
-                    item.pop('members')
-
-                if 'group_members' in item:
-                    # Remove this field
-                    item.pop('group_members')
-
-                if 'passively_checked_hosts' in item:
-                    # Remove this field
-                    item.pop('passively_checked_hosts')
-
-                if 'actively_checked_hosts' in item:
-                    # Remove this field
-                    item.pop('actively_checked_hosts')
-
-                if 'definition_order' in item:
-                    # Remove this field
-                    item.pop('definition_order')
-
-                if item['name'] == 'All' or item['name'] == 'Default':
-                    # Default Alignak realm is same as our All realm
-                    self.default_realm = item['uuid']
-
-                if 'realm_members' in item:
-                    self.output(" --> Drop realm members for %s: %s" % (
-                        item[id_name], item['realm_members']
-                    ))
-                    item.pop('realm_members')
-
-                if 'higher_realms' in item:
-                    self.output(" --> Higher realms for %s: %s" % (
-                        item[id_name], item['higher_realms']
-                    ))
-                    if not item['higher_realms']:
-                        # Link to default All backend realm
-                        item['_parent'] = self.realm_all
-                    else:
-                        # Link to first higher realm
-                        item['_parent'] = item['higher_realms'][0]
-                    item.pop('higher_realms')
+        if item['name'] == 'All' or item['name'] == 'Default':
+            # Default Alignak realm is same as our All realm
+            self.default_realm = item['uuid']
 
-                if item['_parent'] == self.default_realm:
-                    item['_parent'] = self.realm_all
+        if 'realm_members' in item:
+            self.output(" --> Drop realm members for %s: %s", item[id_name], item['realm_members'])
+            item.pop('realm_members')
 
-                if 'broker_complete_links' in item:
-                    item.pop('broker_complete_links')
-                self.output(" --> realm(modified): %s" % item)
+        if 'higher_realms' in item:
+            self.output(" --> Higher realms for %s: %s", item[id_name], item['higher_realms'])
+            if not item['higher_realms']:
+                # Link to default All backend realm
+                item['_parent'] = self.realm_all
             else:
-                # Default is to set element in the default realm
-                item['_realm'] = self.realm_all
+                # Link to first higher realm
+                item['_parent'] = item['higher_realms'][0]
+            item.pop('higher_realms')
 
-                # Realms related to other elements...
-                if 'realm' in item:
-                    if r_name in ['hostgroup', 'host']:
-                        self.output(" --> %s, realm: %s" % (r_name, item['realm']))
+        if item['_parent'] == self.default_realm:
+            item['_parent'] = self.realm_all
 
-                        if item['realm'] == self.default_realm or not item['realm']:
-                            item['_realm'] = self.realm_all
-                        else:
-                            item['_realm'] = item['realm']
+        if 'broker_complete_links' in item:
+            item.pop('broker_complete_links')
+        self.output(" --> realm(modified): %s", item)
+        return item
 
-                    if r_name in ['servicegroup', 'service']:
-                        self.output(" --> %s, realm: %s" % (r_name, item['realm']))
+    def transform_element_realm(self, r_name, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Set the realm of an element
 
-                        if item['realm'] == self.default_realm or not item['realm']:
-                            item['_realm'] = self.realm_all
-                        else:
-                            item['_realm'] = item['realm']
-                    item.pop('realm', None)
-
-                if item['_realm'] == self.realm_all and r_name not in ['host', 'hostgroup',
-                                                                       'service', 'servicegroup']:
-                    item['_sub_realm'] = True
-
-            # Special process for custom variables
-            # Only import element custom variables if schema allows unknown fields ...
-            # ... not the best solution. They should be imported in 'customs' defined array field!
-            if 'customs' in schema['schema']:
-                item['customs'] = item_obj.customs
-            elif 'allow_unknown' in schema and schema['allow_unknown']:
-                for prop in list(item_obj.customs.keys()):
-                    item[prop] = item_obj.customs[prop]
-
-            # Special case of hostdependency
-            if r_name == 'hostdependency':
-                if 'host_name' in item:
-                    item['hosts'] = item['host_name']
-                    item.pop('host_name')
-                if 'dependent_host_name' in item:
-                    item['dependent_hosts'] = item['dependent_host_name']
-                    item.pop('dependent_host_name')
-                if 'hostgroup_name' in item:
-                    item['hostgroups'] = item['hostgroup_name']
-                    item.pop('hostgroup_name')
-                if 'dependent_hostgroup_name' in item:
-                    item['dependent_hostgroups'] = item['dependent_hostgroup_name']
-                    item.pop('dependent_hostgroup_name')
-
-                if 'dependency_period' not in item or not item['dependency_period']:
-                    item['dependency_period'] = self.tp_always
-
-            # Special case of hostescalation
-            if r_name == 'hostescalation':
-                # should not but the backend do not have default values!
-                item['first_notification'] = 0
-                item['last_notification'] = 0
-
-                if 'host_name' in item:
-                    item['hosts'] = item['host_name']
-                    item.pop('host_name')
-                else:
-                    item['hosts'] = []
-                if 'hostgroup_name' in item:
-                    item['hostgroups'] = item['hostgroup_name']
-                    item.pop('hostgroup_name')
-                else:
-                    item['hostgroups'] = []
-
-                if 'usergroup_name' not in item:
-                    item['usergroups'] = []
-                if 'contact_name' not in item:
-                    item['users'] = []
-
-                # Define a name if it does not exist
-                if id_name not in item or not item[id_name]:
-                    hostgroup_name = ''
-                    if 'hostgroups' in item and item['hostgroups']:
-                        hostgroup_name = item['hostgroups']
-                    host_name = ''
-                    if 'hosts' in item and item['hosts']:
-                        host_name = item['hosts']
-                    if host_name:
-                        item[id_name] = "he_%s" % (host_name)
-                    elif hostgroup_name:
-                        item[id_name] = "hehg_%s" % (hostgroup_name)
-                    self.output("  -> renamed as: %s" % item[id_name], forced=True)
-
-                if 'escalation_period' not in item or not item['escalation_period']:
-                    item['escalation_period'] = self.tp_always
-
-            # Special case of servicedependency
-            if r_name == 'servicedependency':
-                # Not useful to store this property into the backend
-                if 'explode_hostgroup' in item:
-                    item.pop('explode_hostgroup')
-
-                if 'host_name' in item:
-                    item['hosts'] = item['host_name']
-                    item.pop('host_name')
-                if 'service_description' in item:
-                    item['services'] = item['service_description']
-                    item.pop('service_description')
-                if 'dependent_host_name' in item:
-                    item['dependent_hosts'] = item['dependent_host_name']
-                    item.pop('dependent_host_name')
-                if 'dependent_service_description' in item:
-                    item['dependent_services'] = item['dependent_service_description']
-                    item.pop('dependent_service_description')
-                if 'hostgroup_name' in item:
-                    item['hostgroups'] = item['hostgroup_name']
-                    item.pop('hostgroup_name')
-                if 'dependent_hostgroup_name' in item:
-                    item['dependent_hostgroups'] = item['dependent_hostgroup_name']
-                    item.pop('dependent_hostgroup_name')
-                # Not useful to store this property into the backend: not managed by Alignak!
-                if 'servicegroup_name' in item:
-                    # item['servicegroups'] = item['servicegroup_name']
-                    item.pop('servicegroup_name')
-                # Not useful to store this property into the backend: not managed by Alignak!
-                if 'dependent_servicegroup_name' in item:
-                    # item['dependent_servicegroups'] = item['dependent_servicegroup_name']
-                    item.pop('dependent_servicegroup_name')
-
-                if 'dependency_period' not in item or not item['dependency_period']:
-                    item['dependency_period'] = self.tp_always
-
-            # Special case of serviceescalation
-            if r_name == 'serviceescalation':
-                if 'service_description' in item:
-                    item['services'] = item['service_description']
-                    item.pop('service_description')
-                else:
-                    item['services'] = []
-                if 'host_name' in item:
-                    item['hosts'] = item['host_name']
-                    item.pop('host_name')
+        :param r_name: resource name
+        :type r_name: str
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        # Default is to set element in the default realm
+        item['_realm'] = self.realm_all
+
+        # Realms related to other elements...
+        if 'realm' in item:
+            if r_name in ['hostgroup', 'host']:
+                self.output(" --> %s, realm: %s", r_name, item['realm'])
+
+                if item['realm'] == self.default_realm or not item['realm']:
+                    item['_realm'] = self.realm_all
                 else:
-                    item['hosts'] = []
-                if 'hostgroup_name' in item:
-                    item['hostgroups'] = item['hostgroup_name']
-                    item.pop('hostgroup_name')
+                    item['_realm'] = item['realm']
+
+            if r_name in ['servicegroup', 'service']:
+                self.output(" --> %s, realm: %s", r_name, item['realm'])
+
+                if item['realm'] == self.default_realm or not item['realm']:
+                    item['_realm'] = self.realm_all
                 else:
-                    item['hostgroups'] = []
-
-                # Define a name if it does not exist
-                if id_name not in item or not item[id_name]:
-                    hostgroup_name = ''
-                    if 'hostgroups' in item and item['hostgroups']:
-                        hostgroup_name = item['hostgroups']
-                    host_name = ''
-                    if 'hosts' in item and item['hosts']:
-                        host_name = item['hosts']
-                    service_name = ''
-                    if 'services' in item and item['services']:
-                        service_name = item['services']
-                    if host_name:
-                        item[id_name] = "se_%s_%s" % (host_name, service_name)
-                    elif hostgroup_name:
-                        item[id_name] = "sehg_%s_%s" % (hostgroup_name, service_name)
-                    self.output("  -> renamed as: %s" % item[id_name], forced=True)
-
-                if 'escalation_period' not in item or not item['escalation_period']:
-                    item['escalation_period'] = self.tp_always
-
-            # Special case of hostgroups
-            if r_name == 'hostgroup':
-                if 'members' in item:
-                    item['hosts'] = item['members']
-                    item.pop('members')
-                if 'hostgroup_members' in item:
-                    item['hostgroups'] = item['hostgroup_members']
-                    item.pop('hostgroup_members')
-
-            # Special case of hosts
+                    item['_realm'] = item['realm']
+            item.pop('realm', None)
+
+        if item['_realm'] == self.realm_all and r_name not in ['host', 'hostgroup',
+                                                               'service', 'servicegroup']:
+            item['_sub_realm'] = True
+        return item
+
+    def transform_customs(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Import the custom variables
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        item['customs'] = item_obj.customs
+        return item
+
+    def transform_customs_fields(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Import the custom variables as fields, for the resources which schema allows unknown
+        fields but has no customs field
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        for prop in list(item_obj.customs.keys()):
+            item[prop] = item_obj.customs[prop]
+        return item
+
+    def transform_hostdependency(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Transform a hosts dependency
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if 'host_name' in item:
+            item['hosts'] = item['host_name']
+            item.pop('host_name')
+        if 'dependent_host_name' in item:
+            item['dependent_hosts'] = item['dependent_host_name']
+            item.pop('dependent_host_name')
+        if 'hostgroup_name' in item:
+            item['hostgroups'] = item['hostgroup_name']
+            item.pop('hostgroup_name')
+        if 'dependent_hostgroup_name' in item:
+            item['dependent_hostgroups'] = item['dependent_hostgroup_name']
+            item.pop('dependent_hostgroup_name')
+
+        if 'dependency_period' not in item or not item['dependency_period']:
+            item['dependency_period'] = self.tp_always
+        return item
+
+    def transform_hostescalation(self, id_name, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Transform a hosts escalation
+
+        :param id_name: Alignak property of the element name
+        :type id_name: str
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        item['first_notification'] = 0
+        item['last_notification'] = 0
+
+        if 'host_name' in item:
+            item['hosts'] = item['host_name']
+            item.pop('host_name')
+        else:
+            item['hosts'] = []
+        if 'hostgroup_name' in item:
+            item['hostgroups'] = item['hostgroup_name']
+            item.pop('hostgroup_name')
+        else:
+            item['hostgroups'] = []
+
+        if 'usergroup_name' not in item:
+            item['usergroups'] = []
+        if 'contact_name' not in item:
+            item['users'] = []
+
+        # Define a name if it does not exist
+        if id_name not in item or not item[id_name]:
+            hostgroup_name = ''
+            if 'hostgroups' in item and item['hostgroups']:
+                hostgroup_name = item['hostgroups']
+            host_name = ''
+            if 'hosts' in item and item['hosts']:
+                host_name = item['hosts']
+            if host_name:
+                item[id_name] = "he_%s" % (host_name)
+            elif hostgroup_name:
+                item[id_name] = "hehg_%s" % (hostgroup_name)
+            self.output("  -> renamed as: %s", item[id_name], forced=True)
+
+        if 'escalation_period' not in item or not item['escalation_period']:
+            item['escalation_period'] = self.tp_always
+        return item
+
+    def transform_servicedependency(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Transform a services dependency
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if 'explode_hostgroup' in item:
+            item.pop('explode_hostgroup')
+
+        if 'host_name' in item:
+            item['hosts'] = item['host_name']
+            item.pop('host_name')
+        if 'service_description' in item:
+            item['services'] = item['service_description']
+            item.pop('service_description')
+        if 'dependent_host_name' in item:
+            item['dependent_hosts'] = item['dependent_host_name']
+            item.pop('dependent_host_name')
+        if 'dependent_service_description' in item:
+            item['dependent_services'] = item['dependent_service_description']
+            item.pop('dependent_service_description')
+        if 'hostgroup_name' in item:
+            item['hostgroups'] = item['hostgroup_name']
+            item.pop('hostgroup_name')
+        if 'dependent_hostgroup_name' in item:
+            item['dependent_hostgroups'] = item['dependent_hostgroup_name']
+            item.pop('dependent_hostgroup_name')
+        # Not useful to store this property into the backend: not managed by Alignak!
+        if 'servicegroup_name' in item:
+            # item['servicegroups'] = item['servicegroup_name']
+            item.pop('servicegroup_name')
+        # Not useful to store this property into the backend: not managed by Alignak!
+        if 'dependent_servicegroup_name' in item:
+            # item['dependent_servicegroups'] = item['dependent_servicegroup_name']
+            item.pop('dependent_servicegroup_name')
+
+        if 'dependency_period' not in item or not item['dependency_period']:
+            item['dependency_period'] = self.tp_always
+        return item
+
+    def transform_serviceescalation(self, id_name, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Transform a services escalation
+
+        :param id_name: Alignak property of the element name
+        :type id_name: str
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if 'service_description' in item:
+            item['services'] = item['service_description']
+            item.pop('service_description')
+        else:
+            item['services'] = []
+        if 'host_name' in item:
+            item['hosts'] = item['host_name']
+            item.pop('host_name')
+        else:
+            item['hosts'] = []
+        if 'hostgroup_name' in item:
+            item['hostgroups'] = item['hostgroup_name']
+            item.pop('hostgroup_name')
+        else:
+            item['hostgroups'] = []
+
+        # Define a name if it does not exist
+        if id_name not in item or not item[id_name]:
+            hostgroup_name = ''
+            if 'hostgroups' in item and item['hostgroups']:
+                hostgroup_name = item['hostgroups']
+            host_name = ''
+            if 'hosts' in item and item['hosts']:
+                host_name = item['hosts']
+            service_name = ''
+            if 'services' in item and item['services']:
+                service_name = item['services']
+            if host_name:
+                item[id_name] = "se_%s_%s" % (host_name, service_name)
+            elif hostgroup_name:
+                item[id_name] = "sehg_%s_%s" % (hostgroup_name, service_name)
+            self.output("  -> renamed as: %s", item[id_name], forced=True)
+
+        if 'escalation_period' not in item or not item['escalation_period']:
+            item['escalation_period'] = self.tp_always
+        return item
+
+    def transform_hostgroup(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Transform a hosts group
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if 'members' in item:
+            item['hosts'] = item['members']
+            item.pop('members')
+        if 'hostgroup_members' in item:
+            item['hostgroups'] = item['hostgroup_members']
+            item.pop('hostgroup_members')
+        return item
+
+    def transform_host(self, r_name, template, item, item_obj, later_tmp):
+        # pylint: disable=too-many-arguments, unused-argument
+        """
+        Transform a host
+
+        :param r_name: resource name
+        :type r_name: str
+        :param template: the element is a template
+        :type template: bool
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if 'display_name' in item and item['display_name']:
+            if 'alias' not in item or not item['alias']:
+                item['alias'] = item['display_name']
+
+        deprecated_fields = ['display_name', 'icon_image', 'icon_image_alt', 'icon_set',
+                             'vrml_image', 'statusmap_image', '2d_coords', '3d_coords',
+                             'custom_views']
+        for deprecated_field in deprecated_fields:
+            if deprecated_field in item:
+                if item[deprecated_field]:
+                    item['customs']['_' + deprecated_field.upper()] = item[deprecated_field]
+
+                self.output("  removing '%s = %s' field from the %s '%s'", deprecated_field,
+                            item[deprecated_field], r_name, item['name'])
+                item.pop(deprecated_field)
+
+        if template and item_obj.is_tpl():
+            self.output("Host is a template ...")
+            item['_is_template'] = True
+            item['_sub_realm'] = True
+            if 'check_command' not in item:
+                item['check_command'] = ''
+
+        if 'hostgroups' in item:
+            # Remove hostgroups relations ... still useful?
+            if item['hostgroups']:
+                self.output(" --> remove hostgroups relation: %s", item['hostgroups'])
+            item.pop('hostgroups')
+        # if 'trigger_name' in item:
+        #     item['trigger'] = item['trigger_name']
+        #     item.pop('trigger_name')
+
+        # Define location as default: France circle center ;))
+        item['location'] = deepcopy(self.gps)
+        if item['customs'] and '_LOC_LAT' in item['customs']:
+            item['location']['coordinates'][0] = float(item['customs']['_LOC_LAT'])
+        if 'customs' in item and '_LOC_LNG' in item['customs']:
+            item['location']['coordinates'][1] = float(item['customs']['_LOC_LNG'])
+        return item
+
+    def transform_servicegroup(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Transform a services group
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if 'members' in item:
+            item['services'] = item['members']
+            item.pop('members')
+        if 'servicegroup_members' in item:
+            item['servicegroups'] = item['servicegroup_members']
+            item.pop('servicegroup_members')
+        return item
+
+    def transform_service(self, r_name, id_name, template, item, item_obj, later_tmp):
+        # pylint: disable=too-many-arguments, unused-argument
+        """
+        Transform a service
+
+        :param r_name: resource name
+        :type r_name: str
+        :param id_name: Alignak property of the element name
+        :type id_name: str
+        :param template: the element is a template
+        :type template: bool
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if 'display_name' in item and item['display_name']:
+            if 'alias' not in item or not item['alias']:
+                item['alias'] = item['display_name']
+
+        deprecated_fields = ['display_name', 'icon_image', 'icon_image_alt', 'icon_set',
+                             'custom_views']
+        for deprecated_field in deprecated_fields:
+            if deprecated_field in item:
+                if item[deprecated_field]:
+                    item['customs']['_' + deprecated_field.upper()] = item[deprecated_field]
+
+                self.output("  removing '%s = %s' field from the %s '%s'", deprecated_field,
+                            item[deprecated_field], r_name, item['name'])
+                item.pop(deprecated_field)
+
+        if template and item_obj.is_tpl():
+            self.output("Service is a template ...")
+            item['_is_template'] = True
+            if 'check_command' not in item:
+                item['check_command'] = ''
+            if 'service_description' in item:
+                item.pop('service_description')
+            # if 'service_description' not in item or not item['service_description']:
+            #     self.output("Set service_description as name...")
+            #     item['service_description'] = item['name']
+            if getattr(item_obj, 'linked_hosts_templates', []):
+                self.output("This service template is linked to hosts templates: %s",
+                            getattr(item_obj, 'linked_hosts_templates', None))
+            item['host'] = getattr(item_obj, 'linked_hosts_templates', '')
+
+        if 'servicegroups' in item:
+            # Remove servicegroups relations ... still useful?
+            if item['servicegroups']:
+                self.output(" --> %s, servicegroups: %s", item[id_name], item['servicegroups'])
+            item.pop('servicegroups')
+        # if 'trigger_name' in item:
+        #     item['trigger'] = item['trigger_name']
+        #     item.pop('trigger_name')
+        if 'merge_host_contacts' in item:
+            item.pop('merge_host_contacts')
+
+        if 'host_name' in item:
+            item['host'] = item['host_name']
+            item.pop('host_name')
+        else:
+            item['host'] = self.dummy_host
+        # self.output("Service host/description: %s/%s"
+        #             % (item['host'], item['service_description']))
+
+        if 'hostgroup_name' in item:
+            item['hostgroups'] = item['hostgroup_name']
+            item.pop('hostgroup_name')
+        return item
+
+    def transform_usergroup(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Transform a users group
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if 'members' in item:
+            item['users'] = item['members']
+            item.pop('members')
+        if 'contactgroup_name' in item:
+            # Remove contactgroup_name, replaced with name...
+            item.pop('contactgroup_name')
+        if 'contactgroup_members' in item:
+            item['usergroups'] = item['contactgroup_members']
+            item.pop('contactgroup_members')
+        return item
+
+    def transform_user(self, id_name, template, item, item_obj, later_tmp):
+        # pylint: disable=too-many-arguments, unused-argument
+        """
+        Transform a user
+
+        :param id_name: Alignak property of the element name
+        :type id_name: str
+        :param template: the element is a template
+        :type template: bool
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if template and item_obj.is_tpl():
+            self.output("User is a template ...")
+            item['_is_template'] = True
+
+        item['ui_preferences'] = {}
+        if 'usergroups' in item:
+            item.pop('usergroups')
+        if 'expert' in item:
+            item.pop('expert')
+            # Make commands a unique list
+        item['host_notification_commands'] = \
+            list(set(item['host_notification_commands']))
+        item['service_notification_commands'] = \
+            list(set(item['service_notification_commands']))
+
+        self.output("  User host notification commands: %s", item['host_notification_commands'],
+                    forced=True)
+        self.output("  User service notification commands: %s",
+                    item['service_notification_commands'], forced=True)
+        # Waiting for manage the notification ways in the backend
+        if 'notificationways' in item:
+            # Delete (temporarily...) this property
+            item.pop('notificationways')
+
+        if 'contact_name' in item:
+            item['name'] = item[id_name]
+            if item['contact_name'] == 'admin':
+                self.output("-> import user 'admin' renamed as 'imported_admin'.")
+                item['name'] = 'imported_admin'
+
+            # Remove contact_name, replaced with name...
+            item.pop('contact_name')
+
+        if 'host_notification_period' not in item or \
+           not item['host_notification_period']:
+            item['host_notification_period'] = self.tp_always
+
+        if 'service_notification_period' not in item or \
+           not item['service_notification_period']:
+            item['service_notification_period'] = self.tp_always
+
+        if 'address6' in item:
+            realm_id = self.inserted.resolve('realm', item['address6'])
+            if realm_id is not None:
+                item['_realm'] = realm_id
+                self.output("-> import user '%s' in realm '%s'.", item['name'], item['address6'])
+        return item
+
+    def transform_periods(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Always define the timeperiods of the hosts and services
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        # Always define timeperiods if they do not exist
+        # Always check and notify...
+        if 'check_period' not in item or \
+           not item['check_period']:
+            item['check_period'] = self.tp_always
+
+        if 'notification_period' not in item or \
+           not item['notification_period']:
+            item['notification_period'] = self.tp_always
+
+        # Never maintenance and snapshot...
+        if 'maintenance_period' not in item or \
+           not item['maintenance_period']:
+            item['maintenance_period'] = self.tp_never
+
+        if 'snapshot_period' not in item or \
+           not item['snapshot_period']:
+            item['snapshot_period'] = self.tp_never
+        return item
+
+    def transform_command_args(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Join the check command arguments
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        # Hack for check_command_args
+        if 'check_command_args' in item and isinstance(item['check_command_args'], list):
+            item['check_command_args'] = '!'.join(item['check_command_args'])
+        return item
+
+    def transform_hostdependency_name(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Name a hosts dependency once its relations are resolved
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if 'name' not in item or not item['name']:
+            host_name = ''
+            if 'hosts' in item and item['hosts']:
+                host_name = item['hosts']
+                if isinstance(item['hosts'], list):
+                    host_name = item['hosts'][0]
+                host_name = self.inserted.get_name('host', host_name, host_name)
+            dependent_host_name = ''
+            if 'dependent_hosts' in item and item['dependent_hosts']:
+                dependent_host_name = item['dependent_hosts']
+                if isinstance(item['dependent_hosts'], list):
+                    host_name = item['dependent_hosts'][0]
+                dependent_host_name = self.inserted.get_name('host', dependent_host_name,
+                                                             dependent_host_name)
+            item['name'] = "%s -> %s" % (host_name, dependent_host_name)
+            self.output("  -> renamed as: %s", item['name'])
+        return item
+
+    def transform_servicedependency_name(self, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Name a services dependency once its relations are resolved
+
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        if 'name' not in item or not item['name']:
+            host_name = ''
+            if 'hosts' in item and item['hosts']:
+                host_name = item['hosts']
+                if isinstance(item['hosts'], list):
+                    host_name = item['hosts'][0]
+                host_name = self.inserted.get_name('host', host_name, host_name)
+            dependent_host_name = ''
+            if 'dependent_hosts' in item and item['dependent_hosts']:
+                dependent_host_name = item['dependent_hosts']
+                if isinstance(item['dependent_hosts'], list):
+                    host_name = item['dependent_hosts'][0]
+                dependent_host_name = self.inserted.get_name('host', dependent_host_name,
+                                                             dependent_host_name)
+
+            service_name = ''
+            if 'services' in item and item['services']:
+                service_name = item['services']
+                if isinstance(item['services'], list):
+                    service_name = item['services'][0]
+                service_name = self.inserted.get_name('service', service_name,
+                                                      service_name)
+            dependent_service = ''
+            if 'dependent_services' in item and item['dependent_services']:
+                dependent_service = item['dependent_services']
+                if isinstance(item['dependent_services'], list):
+                    dependent_service = item['dependent_services'][0]
+                dependent_service = self.inserted.get_name('service', dependent_service,
+                                                           dependent_service)
+
+            item['name'] = "%s/%s -> %s/%s" % (
+                host_name, service_name, dependent_host_name, dependent_service
+            )
+            self.output("  -> renamed as: %s", item['name'])
+        return item
+
+    def transform_templates(self, r_name, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Set the templates used by an element
+
+        :param r_name: resource name
+        :type r_name: str
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        # Remove unused fields
+        # ------------------------------------------------------------
+        # - Template link...
+        if 'use' in item or 'store_use' in item:
+            if 'use' in item:
+                item['store_use'] = item['use']
+                item.pop('use')
+            # Set 'used' templates as templates...
+            if item['store_use'] and r_name in ['host', 'service', 'user']:
+                item['_templates'] = item['store_use']
+            self.log("removed 'store_use' field from: %s : %s:", r_name, item)
+            item.pop('store_use')
+        else:
+            if r_name in ['host', 'service', 'user']:
+                item['_templates'] = []
+        return item
+
+    def transform_name(self, r_name, id_name, item, item_obj, later_tmp):
+        # pylint: disable=too-many-arguments, unused-argument
+        """
+        Remove the Alignak fields and name the element
+
+        :param r_name: resource name
+        :type r_name: str
+        :param id_name: Alignak property of the element name
+        :type id_name: str
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element, None if it must not be imported
+        :rtype: dict
+        """
+        # - Item alias...
+        if 'alias' in item and isinstance(item['alias'], tuple):
+            # This may happen... strange but true!
+            item['alias'] = ' '.join(item['alias'])
+
+        # - Alignak uuid...
+        if 'uuid' in item:
+            # Commented because too verbose !
+            # self.log("removed 'uuid' field from: %s : %s:" % (r_name, item))
+            item.pop('uuid')
+
+        # - 'unknown_members'
+        if 'unknown_members' in item:
+            self.log("removed 'unknown_members' field from: %s : %s:", r_name, item)
+            item.pop('unknown_members')
+
+        # Elements common fields
+        # ------------------------------------------------------------
+        # - 'imported_from' with this script ...
+        item['imported_from'] = 'alignak-backend-import'
+
+        if id_name != 'name':
+            self.output(" --> id_name: %s", id_name)
+            if id_name not in item and 'name' not in item:
+                self.output(" --> not named item: %s", item)
+                self.exit(6)
+            # if 'name' not in item or not item[id_name]:
+            item['name'] = item[id_name]
+            item.pop(id_name)
+            self.output(" --> replaced name for %s: %s", r_name, item['name'])
+            if '$' in item['name']:
+                item['name'] = item['name'].replace('$', '_')
+                self.output(" --> replaced name for %s: %s", r_name, item['name'])
+        return item
+
+    def link_simple(self, link, parent, item, item_obj, later_tmp):
+        # pylint: disable=too-many-arguments, unused-argument
+        """
+        Resolve the link of an element with another element
+
+        :param link: link field, type, resource (see data_later in get_import_phases)
+        :type link: dict
+        :param parent: the link is a link to the parent of the element
+        :type parent: bool
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element
+        :rtype: dict
+        """
+        field = link['field']
+        if field not in item:
+            return item
+
+        _id = self.resolve_link(link['resource'], item[field], by_id=link['now'])
+        if _id is not None:
+            item[field] = _id
+            if parent:
+                self.current.linked += 1
+            self.log("***Found %s for %s = %s", link['resource'], field, item[field])
+            self.log("*** Object found for %s = %s", field, item[field])
+        else:
+            later_tmp[field] = item[field]
+            self.output("*** Object not found for %s = %s", field, item[field])
+            del item[field]
+        return item
+
+    def link_list(self, link, parent, item, item_obj, later_tmp):
+        # pylint: disable=too-many-arguments, unused-argument
+        """
+        Resolve the links of an element with a list of other elements
+
+        If one of the linked elements is not found, the links are updated later.
+
+        The services linked with their name are searched for on the element hosts first, if
+        the link has an hosts field (host_field) and these hosts are already resolved: a same
+        service name exists on many hosts.
+
+        :param link: link field, type, resource (see data_later in get_import_phases)
+        :type link: dict
+        :param parent: the links are links to the parents (or children) of the element
+        :type parent: bool
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element
+        :rtype: dict
+        """
+        field = link['field']
+        if field not in item:
+            return item
+
+        add = True
+        objectsid = []
+
+        self.output("- %s '%s'", link['resource'], item[field])
+        if isinstance(item[field], string_types):
+            item[field] = item[field].split()
+
+        hosts = []
+        if 'host_field' in link and isinstance(item.get(link['host_field']), list):
+            hosts = item[link['host_field']]
+
+        for dummy, vallist in enumerate(item[field]):
+            if not vallist:
+                continue
+            if hasattr(vallist, 'strip'):
+                vallist = vallist.strip()
+
+            _id = None
+            for host_id in hosts:
+                _id = self.inserted.get_by_host(link['resource'], host_id, vallist)
+                if _id is not None:
+                    break
+            if _id is None:
+                _id = self.resolve_link(link['resource'], vallist)
+            if _id is not None:
+                objectsid.append(_id)
+            else:
+                add = False
+        if add:
+            item[field] = objectsid
+            if parent:
+                self.current.linked += 1
+            self.log("*** Object list found for %s = %s", field, item[field])
+        else:
+            later_tmp[field] = item[field]
+            self.output("*** Object list not found (now) for %s = %s", field, item[field])
+            del item[field]
+        return item
+
+    def link_later(self, link, item, item_obj, later_tmp):
+        # pylint: disable=unused-argument
+        """
+        Keep the links of an element with a list of other elements to update them later
+
+        :param link: link field, type, resource (see data_later in get_import_phases)
+        :type link: dict
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :return: element
+        :rtype: dict
+        """
+        field = link['field']
+        if field in item:
+            self.output("*** Object list not found (not now) for %s = %s", field, item[field])
+            later_tmp[field] = item[field]
+            del item[field]
+        return item
+
+    def manage_resource(self, r_name, data_later, id_name, schema, template=False):
+        # pylint: disable=protected-access, too-many-arguments
+        # pylint: disable=too-many-locals
+        """
+        Array of data to include in internal cache or to update with internal objects cache:
+        data_later = [
+            {
+                'field': 'use', 'type': 'simple|list', 'resource': 'command', 'now': True
+            }
+        ]
+        field: field name in the current managed element
+        type: object type (list, ...)
+        resource: object backend element type
+        now: tries to update immediatly or store for a future update (update_later)
+        host_field: optional, field of the hosts of the linked services (see link_list)
+
+
+        :param template:
+        :param r_name: resource name
+        :type r_name: str
+        :param data_later:
+        :param id_name:
+        :param schema:
+        :return:
+        """
+        if r_name not in self.inserted:
+            self.inserted.init(r_name)
+        self.current.pending = []
+        self.current.resource = (r_name, data_later, template)
+        self.current.existing = None
+        if self.update_backend_data:
+            # Get the existing elements once, without their live state
+            self.current.existing = self.get_existing(
+                r_name, dict((field, 0) for field in schema['schema'] if field.startswith('ls_')))
+        elif self.allow_duplicates:
+            # Get the existing elements names once
+            self.current.existing = self.get_existing(r_name, {'name': 1, 'host': 1})
+        if r_name not in self.later:
+            self.later[r_name] = {}
+        for dummy, values in enumerate(data_later):
+            if values['field'] not in self.later[r_name]:
+                self.later[r_name][values['field']] = {}
+
+        alignak_resource = self.get_alignak_resource(r_name)
+
+        elements = None
+        # Alignak defined hosts, services and users groups
+        if r_name in ['hostgroup', 'servicegroup', 'usergroup']:
+            elements = getattr(self.alignak_conf, alignak_resource)
+            get_members = methodcaller({'hostgroup': 'get_hostgroup_members',
+                                        'servicegroup': 'get_servicegroup_members',
+                                        'usergroup': 'get_contactgroup_members'}[r_name])
+            hierarchy = Hierarchy(elements, methodcaller('get_name'), get_members)
+            self.hierarchies[r_name] = hierarchy
+            for group, parent in hierarchy:
+                group._parent = None if parent is None else parent.uuid
+                self.output("%s: %s (%s) - %s", r_name, group.uuid, group.get_name(), group._parent)
+                group.properties['_parent'] = group._parent
+        elif r_name == 'realm':
+            # Create a parent relation between the realms (this relation does not exist anymore...)
+            elements = getattr(self.alignak_conf, 'realms')
+            hierarchy = Hierarchy(elements, methodcaller('get_name'),
+                                  attrgetter('realm_members'), first_parent=True)
+            self.hierarchies[r_name] = hierarchy
+            for _realm, parent in hierarchy:
+                if parent is not None:
+                    _realm.higher_realms = [parent.get_name()]
+        else:
+            elements = getattr(self.alignak_conf, alignak_resource)
+        self.log("Alignak (conf = %s): %s", self.alignak_conf, elements)
+
+        # Alignak defined realms
+        if not self.default_realm:
+            realms = getattr(self.alignak_conf, 'realms')
+            default_realm = realms.get_default()
+            # print("Realm: %s" % default_realm.__dict__)
+            self.output("Realms: %s, default: %s", realms, default_realm)
+            self.default_realm = default_realm.uuid
+            self.output("*** Alignak default realm: %s (%s)", self.default_realm,
+                        default_realm.get_name())
+
+        # Build templates list to replace Alignak elements
+        if template:
+            self.inserted.init('%s_template' % r_name)
+            if r_name == 'user':
+                elements = self.users_templates
+
             if r_name == 'host':
-                if 'display_name' in item and item['display_name']:
-                    if 'alias' not in item or not item['alias']:
-                        item['alias'] = item['display_name']
-
-                deprecated_fields = ['display_name', 'icon_image', 'icon_image_alt', 'icon_set',
-                                     'vrml_image', 'statusmap_image', '2d_coords', '3d_coords',
-                                     'custom_views']
-                for deprecated_field in deprecated_fields:
-                    if deprecated_field in item:
-                        if item[deprecated_field]:
-                            item['customs']['_' + deprecated_field.upper()] = item[deprecated_field]
-
-                        self.output("  removing '%s = %s' field from the %s '%s'"
-                                    % (deprecated_field, item[deprecated_field],
-                                       r_name, item['name']))
-                        item.pop(deprecated_field)
-
-                if template and item_obj.is_tpl():
-                    self.output("Host is a template ...")
-                    item['_is_template'] = True
-                    item['_sub_realm'] = True
-                    if 'check_command' not in item:
-                        item['check_command'] = ''
-
-                if 'hostgroups' in item:
-                    # Remove hostgroups relations ... still useful?
-                    if item['hostgroups']:
-                        self.output(" --> remove hostgroups relation: %s" % (item['hostgroups']))
-                    item.pop('hostgroups')
-                # if 'trigger_name' in item:
-                #     item['trigger'] = item['trigger_name']
-                #     item.pop('trigger_name')
-
-                # Define location as default: France circle center ;))
-                item['location'] = deepcopy(self.gps)
-                if item['customs'] and '_LOC_LAT' in item['customs']:
-                    item['location']['coordinates'][0] = float(item['customs']['_LOC_LAT'])
-                if 'customs' in item and '_LOC_LNG' in item['customs']:
-                    item['location']['coordinates'][1] = float(item['customs']['_LOC_LNG'])
-
-            # Special case of servicegroups
-            if r_name == 'servicegroup':
-                if 'members' in item:
-                    item['services'] = item['members']
-                    item.pop('members')
-                if 'servicegroup_members' in item:
-                    item['servicegroups'] = item['servicegroup_members']
-                    item.pop('servicegroup_members')
-
-            # Special case of services
+                elements = self.hosts_templates
+
             if r_name == 'service':
-                if 'display_name' in item and item['display_name']:
-                    if 'alias' not in item or not item['alias']:
-                        item['alias'] = item['display_name']
-
-                deprecated_fields = ['display_name', 'icon_image', 'icon_image_alt', 'icon_set',
-                                     'custom_views']
-                for deprecated_field in deprecated_fields:
-                    if deprecated_field in item:
-                        if item[deprecated_field]:
-                            item['customs']['_' + deprecated_field.upper()] = item[deprecated_field]
-
-                        self.output("  removing '%s = %s' field from the %s '%s'"
-                                    % (deprecated_field, item[deprecated_field],
-                                       r_name, item['name']))
-                        item.pop(deprecated_field)
-
-                if template and item_obj.is_tpl():
-                    self.output("Service is a template ...")
-                    item['_is_template'] = True
-                    if 'check_command' not in item:
-                        item['check_command'] = ''
-                    if 'service_description' in item:
-                        item.pop('service_description')
-                    # if 'service_description' not in item or not item['service_description']:
-                    #     self.output("Set service_description as name...")
-                    #     item['service_description'] = item['name']
-                    if getattr(item_obj, 'linked_hosts_templates', []):
-                        self.output("This service template is linked to hosts templates: %s" %
-                                    getattr(item_obj, 'linked_hosts_templates', None))
-                    item['host'] = getattr(item_obj, 'linked_hosts_templates', '')
-
-                if 'servicegroups' in item:
-                    # Remove servicegroups relations ... still useful?
-                    if item['servicegroups']:
-                        self.output(" --> %s, servicegroups: %s" % (
-                            item[id_name], item['servicegroups']
-                        ))
-                    item.pop('servicegroups')
-                # if 'trigger_name' in item:
-                #     item['trigger'] = item['trigger_name']
-                #     item.pop('trigger_name')
-                if 'merge_host_contacts' in item:
-                    item.pop('merge_host_contacts')
-
-                if 'host_name' in item:
-                    item['host'] = item['host_name']
-                    item.pop('host_name')
-                else:
-                    item['host'] = self.dummy_host
-                # self.output("Service host/description: %s/%s"
-                #             % (item['host'], item['service_description']))
-
-                if 'hostgroup_name' in item:
-                    item['hostgroups'] = item['hostgroup_name']
-                    item.pop('hostgroup_name')
-
-            # Special case of usergroups
-            if r_name == 'usergroup':
-                if 'members' in item:
-                    item['users'] = item['members']
-                    item.pop('members')
-                if 'contactgroup_name' in item:
-                    # Remove contactgroup_name, replaced with name...
-                    item.pop('contactgroup_name')
-                if 'contactgroup_members' in item:
-                    item['usergroups'] = item['contactgroup_members']
-                    item.pop('contactgroup_members')
-
-            # Special case of users
-            if r_name == 'user':
-                if template and item_obj.is_tpl():
-                    self.output("User is a template ...")
-                    item['_is_template'] = True
-
-                item['ui_preferences'] = {}
-                if 'usergroups' in item:
-                    item.pop('usergroups')
-                if 'expert' in item:
-                    item.pop('expert')
-                    # Make commands a unique list
-                item['host_notification_commands'] = \
-                    list(set(item['host_notification_commands']))
-                item['service_notification_commands'] = \
-                    list(set(item['service_notification_commands']))
-
-                self.output("  User host notification commands: %s"
-                            % item['host_notification_commands'], forced=True)
-                self.output("  User service notification commands: %s"
-                            % item['service_notification_commands'], forced=True)
-                # Waiting for manage the notification ways in the backend
-                if 'notificationways' in item:
-                    # Delete (temporarily...) this property
-                    item.pop('notificationways')
-
-                if 'contact_name' in item:
-                    item['name'] = item[id_name]
-                    if item['contact_name'] == 'admin':
-                        self.output("-> import user 'admin' renamed as 'imported_admin'.")
-                        item['name'] = 'imported_admin'
-
-                    # Remove contact_name, replaced with name...
-                    item.pop('contact_name')
-
-                if 'host_notification_period' not in item or \
-                   not item['host_notification_period']:
-                    item['host_notification_period'] = self.tp_always
-
-                if 'service_notification_period' not in item or \
-                   not item['service_notification_period']:
-                    item['service_notification_period'] = self.tp_always
-
-                if 'address6' in item:
-                    if item['address6'] in self.inserted['realm']:
-                        item['_realm'] = self.inserted['realm'][item['address6']]
-                        self.output("-> import user '%s' in realm '%s'." % (
-                            item['name'], item['address6']
-                        ))
-                    if item['address6'] in self.inserted['realm'].values():
-                        index = list(self.inserted['realm'].values()).index(item['address6'])
-                        item['_realm'] = list(self.inserted['realm'].keys())[index]
-                        self.output("-> import user '%s' in realm '%s'." % (
-                            item['name'], item['address6']
-                        ))
-
-            # Special case of timeperiods for hosts and services
-            # Always define timeperiods if they do not exist
-            if r_name in ('host', 'service'):
-                # Always check and notify...
-                if 'check_period' not in item or \
-                   not item['check_period']:
-                    item['check_period'] = self.tp_always
-
-                if 'notification_period' not in item or \
-                   not item['notification_period']:
-                    item['notification_period'] = self.tp_always
-
-                # Never maintenance and snapshot...
-                if 'maintenance_period' not in item or \
-                   not item['maintenance_period']:
-                    item['maintenance_period'] = self.tp_never
-
-                if 'snapshot_period' not in item or \
-                   not item['snapshot_period']:
-                    item['snapshot_period'] = self.tp_never
-
-            # Hack for check_command_args
-            if 'check_command_args' in item and isinstance(item['check_command_args'], list):
-                item['check_command_args'] = '!'.join(item['check_command_args'])
-
-            # hostdependency - set name once relations are resolved
-            if r_name == 'hostdependency':
-                if 'name' not in item or not item['name']:
-                    host_name = ''
-                    if 'hosts' in item and item['hosts']:
-                        host_name = item['hosts']
-                        if isinstance(item['hosts'], list):
-                            host_name = item['hosts'][0]
-                        if host_name in self.inserted['host']:
-                            host_name = self.inserted['host'][host_name]
-                    dependent_host_name = ''
-                    if 'dependent_hosts' in item and item['dependent_hosts']:
-                        dependent_host_name = item['dependent_hosts']
-                        if isinstance(item['dependent_hosts'], list):
-                            host_name = item['dependent_hosts'][0]
-                        if dependent_host_name in self.inserted['host']:
-                            dependent_host_name = self.inserted['host'][dependent_host_name]
-                    item['name'] = "%s -> %s" % (host_name, dependent_host_name)
-                    self.output("  -> renamed as: %s" % item['name'])
-
-            if r_name == 'servicedependency':
-                if 'name' not in item or not item['name']:
-                    host_name = ''
-                    if 'hosts' in item and item['hosts']:
-                        host_name = item['hosts']
-                        if isinstance(item['hosts'], list):
-                            host_name = item['hosts'][0]
-                        if host_name in self.inserted['host']:
-                            host_name = self.inserted['host'][host_name]
-                    dependent_host_name = ''
-                    if 'dependent_hosts' in item and item['dependent_hosts']:
-                        dependent_host_name = item['dependent_hosts']
-                        if isinstance(item['dependent_hosts'], list):
-                            host_name = item['dependent_hosts'][0]
-                        if dependent_host_name in self.inserted['host']:
-                            dependent_host_name = self.inserted['host'][dependent_host_name]
-
-                    service_name = ''
-                    if 'services' in item and item['services']:
-                        service_name = item['services']
-                        if isinstance(item['services'], list):
-                            service_name = item['services'][0]
-                        if service_name in self.inserted['service']:
-                            service_name = self.inserted['service'][service_name]
-                    dependent_service = ''
-                    if 'dependent_services' in item and item['dependent_services']:
-                        dependent_service = item['dependent_services']
-                        if isinstance(item['dependent_services'], list):
-                            dependent_service = item['dependent_services'][0]
-                        if dependent_service in self.inserted['service']:
-                            dependent_service = self.inserted['service'][dependent_service]
-
-                    item['name'] = "%s/%s -> %s/%s" % (
-                        host_name, service_name, dependent_host_name, dependent_service
-                    )
-                    self.output("  -> renamed as: %s" % item['name'])
-
-            # Remove unused fields
-            # ------------------------------------------------------------
-            # - Template link...
-            if 'use' in item or 'store_use' in item:
-                if 'use' in item:
-                    item['store_use'] = item['use']
-                    item.pop('use')
-                # Set 'used' templates as templates...
-                if item['store_use'] and r_name in ['host', 'service', 'user']:
-                    item['_templates'] = item['store_use']
-                self.log("removed 'store_use' field from: %s : %s:" % (r_name, item))
-                item.pop('store_use')
-            else:
-                if r_name in ['host', 'service', 'user']:
-                    item['_templates'] = []
-
-            self.output("Creating links with other objects (data_later)")
-            for dummy, values in enumerate(data_later):
-
-                if values['field'] in item \
-                        and values['type'] == 'simple':
-                    if values['now'] and \
-                       values['resource'] in self.inserted and \
-                       item[values['field']] in self.inserted[values['resource']]:
-                        # Link is still existing and should be valid... do nothing, except logging.
-                        self.log("***Found %s for %s = %s" % (
-                            values['resource'], values['field'], item[values['field']]
-                        ))
-
-                    elif item[values['field']] in self.inserted[values['resource']].values():
-                        index = list(self.inserted[values['resource']].values()).index(
-                            item[values['field']]
-                        )
-                        item[values['field']] = \
-                            list(self.inserted[values['resource']].keys())[index]
-                        self.log("***Found %s for %s = %s" % (
-                            values['resource'], values['field'], item[values['field']]
-                        ))
-
-                    elif item[values['field']] in self.inserted_uuid[values['resource']].values():
-                        idx = list(self.inserted_uuid[values['resource']].values()).index(
-                            item[values['field']]
-                        )
-                        item[values['field']] = \
-                            list(self.inserted_uuid[values['resource']].keys())[idx]
+                elements = self.services_templates
+        elif r_name in ['host', 'hostgroup', 'servicegroup', 'usergroup', 'realm']:
+            elements = self.sort_parents_first(r_name, elements)
+        # Transformation of the elements to backend elements
+        pipeline = self.get_pipeline(r_name, data_later, id_name, schema, template)
+        # Links to the parents (or children) resolved when the elements are created
+        self.current.linked = 0
+
+        progress = Progress(getattr(self.current, 'logger', self.logger),
+                            '%s_template' % r_name if template else r_name,
+                            self.count_elements(r_name, template))
+        count = 1
+        for item_obj in elements:
+            if not item_obj:
+                continue
+            progress.update()
+            item = {}
 
-                    else:
-                        later_tmp[values['field']] = item[values['field']]
-                        self.output("*** Object not found for %s = %s"
-                                    % (values['field'], item[values['field']]))
-                        del item[values['field']]
-
-                    if values['field'] in item:
-                        self.log("*** Object found for %s = %s"
-                                 % (values['field'], item[values['field']]))
-
-                elif values['field'] in item \
-                        and values['type'] == 'list' \
-                        and values['now']:
-                    add = True
-                    objectsid = []
-
-                    self.output("- %s '%s'" % (values['resource'], item[values['field']]))
-                    if isinstance(item[values['field']], string_types):
-                        item[values['field']] = item[values['field']].split()
-
-                    for dummy, vallist in enumerate(item[values['field']]):
-                        if not vallist:
-                            continue
-                        if hasattr(vallist, 'strip'):
-                            vallist = vallist.strip()
-
-                        if values['resource'] in self.inserted and \
-                                vallist in self.inserted[values['resource']]:
-                            objectsid.append(vallist)
-                        elif values['resource'] in self.inserted and \
-                                vallist in self.inserted[values['resource']].values():
-                            idx = \
-                                list(self.inserted[values['resource']].values()).index(vallist)
-                            objectsid.append(
-                                list(self.inserted[values['resource']].keys())[idx])
-                        elif values['resource'] in self.inserted_uuid and \
-                                vallist in self.inserted_uuid[values['resource']].values():
-                            idx = \
-                                list(self.inserted_uuid[values['resource']].values()).index(vallist)
-                            objectsid.append(
-                                list(self.inserted_uuid[values['resource']].keys())[idx])
-                        else:
-                            add = False
-                    if add:
-                        item[values['field']] = objectsid
-                        self.log("*** Object list found for %s = %s"
-                                 % (values['field'], item[values['field']]))
-                    else:
-                        later_tmp[values['field']] = item[values['field']]
-                        self.output("*** Object list not found (now) for %s = %s"
-                                    % (values['field'], item[values['field']]))
-                        del item[values['field']]
-
-                elif values['field'] in item \
-                        and values['type'] == 'list' \
-                        and not values['now']:
-                    self.output("*** Object list not found (not now) for %s = %s"
-                                % (values['field'], item[values['field']]))
-                    later_tmp[values['field']] = item[values['field']]
-                    del item[values['field']]
-
-            # - Item alias...
-            if 'alias' in item and isinstance(item['alias'], tuple):
-                # This may happen... strange but true!
-                item['alias'] = ' '.join(item['alias'])
-
-            # - Alignak uuid...
-            if 'uuid' in item:
-                # Commented because too verbose !
-                # self.log("removed 'uuid' field from: %s : %s:" % (r_name, item))
-                item.pop('uuid')
-
-            # - 'unknown_members'
-            if 'unknown_members' in item:
-                self.log("removed 'unknown_members' field from: %s : %s:" % (r_name, item))
-                item.pop('unknown_members')
-
-            # Elements common fields
-            # ------------------------------------------------------------
-            # - 'imported_from' with this script ...
-            item['imported_from'] = 'alignak-backend-import'
-
-            if id_name != 'name':
-                self.output(" --> id_name: %s" % (id_name))
-                if id_name not in item and 'name' not in item:
-                    self.output(" --> not named item: %s" % (item))
-                    self.exit(6)
-                # if 'name' not in item or not item[id_name]:
-                item['name'] = item[id_name]
-                item.pop(id_name)
-                self.output(" --> replaced name for %s: %s" % (r_name, item['name']))
-                if '$' in item['name']:
-                    item['name'] = item['name'].replace('$', '_')
-                    self.output(" --> replaced name for %s: %s" % (r_name, item['name']))
-
-            self.log("before_post: %s : %s:" % (r_name, item))
-            if self.allow_duplicates:
-                # Check if element still exists in the backend
-                params = {'where': json.dumps({'name': item['name']})}
+            self.log("...................................")
+            self.log("Manage %s: %s (%s)", r_name, item_obj.uuid, item_obj.get_name())
+            self.log("...................................")
+            if template:
+                item['name'] = getattr(item_obj, 'name')
+                self.output("- importing %s template #%d: %s", r_name, count, item_obj.get_name())
+            else:
                 if r_name == 'service':
-                    if 'host' in item:
-                        params = {'where': json.dumps({
-                            'name': item['name'],
-                            'host': item['host']
-                        })}
-                    self.output("Checking element existence for %s: %s/%s" % (
-                        r_name, item['host'], item['name']
-                    ))
+                    service_host_name = self.inserted.get_name('host', item_obj.host_name,
+                                                               item_obj.host_name)
+                    self.output("- importing %s #%d: %s/%s", r_name, count, service_host_name,
+                                item_obj.get_name())
                 else:
-                    self.output("Checking element existence for %s: %s" % (
-                        r_name, item['name']
-                    ))
-                response = self.backend.get(r_name, params=params)
-                if response['_items']:
-                    # Still exists in the backend, log and continue...
-                    if r_name not in self.ignored:
-                        self.ignored[r_name] = {}
-                    self.ignored[r_name][item['name']] = item
-
-                    # Make it as inserted for further search...
-                    exist = response['_items'][0]
-                    self.output(" -> exists: %s" % (exist))
-                    if template:
-                        self.inserted['%s_template' % r_name][exist['_id']] = item['name']
-                    self.inserted[r_name][exist['_id']] = item['name']
-                    self.inserted_uuid[r_name][exist['_id']] = item_obj.uuid
-                    continue
+                    self.output("- importing %s #%d: %s", r_name, count, item_obj.get_name())
+            count += 1
 
-            try:
-                # Special case for templates ... some have check_command some do not have!
-                if template and r_name in ['host', 'service']:
-                    if 'check_command' not in item:
-                        item['check_command'] = ''
-
-                if self.update_backend_data:
-                    self.output("Updating %s: %s" % (r_name, item['name']))
-                    params = {'where': json.dumps({'name': item['name']})}
-                    if r_name == 'service':
-                        params = {'where': json.dumps({
-                            'name': item['name'],
-                            'host': item['host']
-                        })}
-                    response = self.backend.get(r_name, params=params)
-                    if response['_items']:
-                        response = response['_items'][0]
-
-                        # Exists in the backend, we can update...
-                        if not self.dry_run:
-                            headers = {
-                                'Content-Type': 'application/json',
-                                'If-Match': response['_etag']
-                            }
-                            self.backend.patch(
-                                r_name + '/' + response['_id'], item,
-                                headers=headers, inception=True
-                            )
-                        self.output("Updated %s: %s" % (r_name, item['name']))
-
-                        # Add to updated list
-                        if r_name not in self.updated:
-                            self.updated[r_name] = {}
-                        self.updated[r_name][item['name']] = item
-
-                        # Make it as inserted for further search...
-                        if template:
-                            self.inserted['%s_template' % r_name][response['_id']] = item['name']
-                        self.inserted[r_name][response['_id']] = item['name']
-                        self.inserted_uuid[r_name][response['_id']] = item_obj.uuid
-                        continue
-                    else:
-                        self.output("-> %s not existing, cannot be updated: %s" %
-                                    (r_name, item['name']))
-                        response = None
+            # Only deal with the properties sent to the backend and our own added property,
+            item.update(self.get_extractor(r_name, item_obj, id_name, schema)(item_obj))
+            # As of it, ignore attributes (use, name, definition_order and register) !
+
+            later_tmp = {}
+            item = pipeline.run(item, item_obj, later_tmp)
+            if item is None:
+                continue
+
+            self.import_element(r_name, item, item_obj, later_tmp, template)
+
+        # Post the remaining elements of the last batch
+        self.flush_pending()
+        progress.done()
+
+        stats = [stat for stat in pipeline.get_stats() if stat[1]]
+        if stats:
+            self.output("Transformation of %s%s: %s", r_name, '_template' if template else '',
+                        ', '.join(["%s %.3fs (%d)" % (name, duration, calls)
+                                   for name, calls, duration in stats]), forced=True)
+            # All the elements run the first step
+            self.profiler.add({
+                'name': '%s%s.transformation' % (r_name, '_template' if template else ''),
+                'kind': 'step', 'resource': r_name,
+                'objects': pipeline.calls[pipeline.steps[0][0]],
+                'wall_time': sum([stat[2] for stat in stats]), 'cpu_time': None, 'requests': 0
+            })
+
+        if self.current.linked:
+            self.output("Parents first for %s: %d links set at creation, late updates avoided",
+                        r_name, self.current.linked, forced=True)
+
+    def import_element(self, r_name, item, item_obj, later_tmp, template=False):
+        # pylint: disable=too-many-arguments
+        """
+        Import a transformed element: ignore it if it exists and duplicates are allowed,
+        update it if it exists and the backend is updated, else add it to the current batch
+
+        :param r_name: resource name
+        :type r_name: str
+        :param item: element
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links to update later
+        :type later_tmp: dict
+        :param template: the element is a template
+        :type template: bool
+        :return: None
+        """
+        self.log("before_post: %s : %s:", r_name, item)
+        if self.allow_duplicates:
+            # Check if element still exists in the backend
+            if r_name == 'service':
+                self.output("Checking element existence for %s: %s/%s", r_name, item['host'],
+                            item['name'])
+            else:
+                self.output("Checking element existence for %s: %s", r_name, item['name'])
+            exist = self.find_existing(r_name, item)
+            if exist is not None:
+                # Still exists in the backend, log and continue...
+                if r_name not in self.ignored:
+                    self.ignored[r_name] = {}
+                self.ignored[r_name][item['name']] = item
+
+                # Make it as inserted for further search...
+                self.output(" -> exists: %s", exist)
+                self.register_inserted(r_name, exist['_id'], item, item_obj, template)
+                return
+
+        try:
+            # Special case for templates ... some have check_command some do not have!
+            if template and r_name in ['host', 'service']:
+                if 'check_command' not in item:
+                    item['check_command'] = ''
+
+            existing = None
+            if self.update_backend_data:
+                existing = self.find_existing(r_name, item)
+            if existing is not None:
+                # Exists in the backend, update the modified fields only...
+                data = dict((field, item[field]) for field in item
+                            if field not in existing or existing[field] != item[field])
+                for field in self.transformed_fields.get(r_name, []):
+                    data.pop(field, None)
+                if not data:
+                    self.output("Unchanged %s: %s", r_name, item['name'])
+                    self.unchanged[r_name] = self.unchanged.get(r_name, 0) + 1
                 else:
-                    # With headers=None, the post method manages correctly the posted data ...
+                    self.output("Updating %s: %s, fields: %s", r_name, item['name'],
+                                ', '.join(sorted(data)))
                     if not self.dry_run:
-                        response = self.backend.post(r_name, item, headers=None)
-                    else:
-                        response = {'_id': '_fake', '_etag': '_fake'}
+                        headers = {
+                            'Content-Type': 'application/json',
+                            'If-Match': existing['_etag']
+                        }
+                        self.backend.patch(
+                            r_name + '/' + existing['_id'], data,
+                            headers=headers, inception=True
+                        )
+                    self.output("Updated %s: %s", r_name, item['name'])
 
-                    if '_is_template' in item and item['_is_template']:
-                        self.output("-> Created a new: %s template: %s (%s)" % (
-                            r_name, item['name'], response['_id']
-                        ))
-                        self.output("-> %s" % (item))
-                    else:
-                        self.output("-> Created a new: %s : %s (%s) (%s)" % (
-                            r_name, item['name'], response['_id'], item_obj.uuid
-                        ))
-                        self.output("-> %s" % (item))
-            except BackendException as e:
-                print("# Post/patch error for: %s : %s" % (r_name, item))
-                print("***** Exception: %s" % str(e))
-                print("***** %s", traceback.format_exc())
-                print("***** response: %s" % e.response)
-                print("~~~~~~~~~~~~~~~~~~~~~~~~~~")
-                print("Exiting with error code: 5")
-                # Response is formed as a dictionary: {
-                # u'_status': u'ERR',
-                # u'_issues': {
-                #   u'notification_options': u"unallowed values [u'n']"
-                # },
-                # u'_error': {
-                #   u'message': u'Insertion failure: 1 document(s) contain(s) error(s)',
-                #   u'code': 422
-                # }
-                # }
-                self.exit(5)
+                    # Add to updated list
+                    if r_name not in self.updated:
+                        self.updated[r_name] = {}
+                    self.updated[r_name][item['name']] = data
+
+                # Make it as inserted for further search...
+                self.register_inserted(r_name, existing['_id'], item, item_obj, template)
+                return
+
+            if self.update_backend_data:
+                self.output("-> %s not existing, it will be created: %s", r_name, item['name'])
+
+            # Post with the other elements of the current batch
+            self.current.pending.append((item, item_obj, later_tmp))
+            if len(self.current.pending) >= self.batch_size * self.workers:
+                self.flush_pending()
+        except BackendException as e:
+            print("# Post/patch error for: %s : %s" % (r_name, item))
+            print("***** Exception: %s" % str(e))
+            print("***** %s", traceback.format_exc())
+            print("***** response: %s" % e.response)
+            print("~~~~~~~~~~~~~~~~~~~~~~~~~~")
+            print("Exiting with error code: 5")
+            # Response is formed as a dictionary: {
+            # u'_status': u'ERR',
+            # u'_issues': {
+            #   u'notification_options': u"unallowed values [u'n']"
+            # },
+            # u'_error': {
+            #   u'message': u'Insertion failure: 1 document(s) contain(s) error(s)',
+            #   u'code': 422
+            # }
+            # }
+            self.exit(5)
+
+    def get_existing(self, r_name, projection=None):
+        """
+        Get all the existing elements of a resource in the backend
+
+        The first page gives the elements count, the other pages are then got concurrently
+        if several workers are used.
+
+        The elements are indexed by name or, for the elements attached to an host
+        (eg. services), by (host, name) only: a same service name exists on many hosts. When
+        several elements have the same key, the first one is indexed.
+
+        :param r_name: resource name
+        :type r_name: str
+        :param projection: fields to get (or not) from the backend
+        :type projection: dict
+        :return: existing elements
+        :rtype: dict
+        """
+        params = {'sort': '_id', 'max_results': BACKEND_PAGINATION_LIMIT}
+        if projection:
+            params['projection'] = json.dumps(projection)
+
+        def get_page(page):
+            """Get the elements of a page"""
+            page_params = dict(params)
+            page_params['page'] = page
+            return self.backend.get(r_name, params=page_params)['_items']
+
+        response = self.backend.get(r_name, params=params)
+        elements = list(response['_items'])
+        total = float(response['_meta']['total'])
+        pages = int(math.ceil(total / response['_meta']['max_results']))
+        if pages > 1:
+            if self.pool is not None:
+                results = self.pool.map(get_page, range(2, pages + 1))
             else:
-                if not response:
-                    continue
-                self.log("Element insertion response : %s:" % response)
-                if template:
-                    self.inserted['%s_template' % r_name][response['_id']] = item['name']
-                self.inserted[r_name][response['_id']] = item['name']
-                self.inserted_uuid[r_name][response['_id']] = item_obj.uuid
-
-                for dummy, values in enumerate(data_later):
-                    if values['field'] in later_tmp:
-                        self.output("***Update later: %s/%s, with %s = %s" % (
-                            r_name, response['_id'], values['field'], later_tmp[values['field']]
-                        ))
-                        self.later[r_name][values['field']][response['_id']] = {
-                            'type': values['type'],
-                            'resource': values['resource'],
-                            'value': later_tmp[values['field']],
-                            '_etag': response['_etag']
-                        }
+                results = [get_page(page) for page in range(2, pages + 1)]
+            for items in results:
+                elements.extend(items)
+
+        existing = {}
+        for element in elements:
+            if 'host' in element:
+                existing.setdefault((element['host'], element['name']), element)
+            else:
+                existing.setdefault(element['name'], element)
+        self.output("Existing %s(s) in the backend: %d", r_name, len(elements), forced=True)
+        return existing
 
-                # Special case of users - create user restriction roles in the backend
-                if r_name == 'user':
-                    try:
-                        # Default is to allow read on all elements of the user's realm
-                        user_role = {
-                            'user': response['_id'],
-                            'realm': item['_realm'],
-                            'sub_realm': True,
-                            'resource': '*',
-                            'crud': ['read']
-                        }
-                        if not self.dry_run:
-                            response = self.backend.post(
-                                'userrestrictrole', user_role, headers=None
-                            )
-                        self.output("-> Created a new user_role: %s : %s (%s)" % (
-                            r_name, user_role, response['_id']
-                        ))
-                    except BackendException as e:
-                        print("# Post error for user_role: %s : %s" % (r_name, item))
-                        print("***** Exception: %s" % str(e))
-                        print("***** %s", traceback.format_exc())
-                        print("***** response: %s" % e.response)
-                        print("~~~~~~~~~~~~~~~~~~~~~~~~~~")
-                        print("Exiting with error code: 5")
-                        self.exit(5)
+    def find_existing(self, r_name, item):
+        """
+        Find an element in the existing elements of the current resource
 
-    def import_objects(self):
+        :param r_name: resource name
+        :type r_name: str
+        :param item: element data
+        :type item: dict
+        :return: existing element or None
+        :rtype: dict
         """
-        Import objects in the backend
+        if r_name == 'service':
+            # Only the service of the same host, never a same named service of another host
+            try:
+                return self.current.existing.get((item.get('host'), item['name']))
+            except TypeError:
+                # Unhashable host (list of hosts templates...)
+                return None
+        return self.current.existing.get(item['name'])
+
+    def element_inserted(self, r_name, data_later, response, item, item_obj, later_tmp,
+                         template=False):
+        # pylint: disable=too-many-arguments
+        """
+        Manage an element newly created in the backend: register the element and store
+        its links that will be updated later
+
+        :param r_name: resource name
+        :type r_name: str
+        :param data_later: links of the resource elements
+        :type data_later: list
+        :param response: backend response for the element creation
+        :type response: dict
+        :param item: element data as sent to the backend
+        :type item: dict
+        :param item_obj: Alignak object
+        :param later_tmp: links that could not be resolved when the element was created
+        :type later_tmp: dict
+        :param template: the element is a template
+        :type template: bool
+        :return: None
+        """
+        if '_is_template' in item and item['_is_template']:
+            self.output("-> Created a new: %s template: %s (%s)", r_name, item['name'],
+                        response['_id'])
+            self.output("-> %s", item)
+        else:
+            self.output("-> Created a new: %s : %s (%s) (%s)", r_name, item['name'],
+                        response['_id'], item_obj.uuid)
+            self.output("-> %s", item)
+
+        self.log("Element insertion response : %s:", response)
+        self.register_inserted(r_name, response['_id'], item, item_obj, template)
+
+        for dummy, values in enumerate(data_later):
+            if values['field'] in later_tmp:
+                self.output("***Update later: %s/%s, with %s = %s", r_name, response['_id'],
+                            values['field'], later_tmp[values['field']])
+                self.later[r_name][values['field']][response['_id']] = {
+                    'type': values['type'],
+                    'resource': values['resource'],
+                    'value': later_tmp[values['field']],
+                    '_etag': response['_etag']
+                }
+
+    def flush_pending(self):
+        """
+        Post the elements waiting in the current batch
+
+        The waiting elements are split in lists of batch size elements. When several workers
+        are used, the lists are posted concurrently, else they are posted one after the other.
+        The responses are then managed in the elements order, whatever the posting order.
+
+        :return: None
+        """
+        if not self.current.pending:
+            return
+        r_name = self.current.resource[0]
+        pending = self.current.pending
+        self.current.pending = []
+
+        batches = [pending[idx:idx + self.batch_size]
+                   for idx in range(0, len(pending), self.batch_size)]
+        if self.pool is not None and len(batches) > 1:
+            results = self.pool.map(partial(self.send_batch, r_name), batches)
+        else:
+            results = [self.send_batch(r_name, batch) for batch in batches]
+
+        errors = []
+        for batch, result in zip(batches, results):
+            errors.extend(self.batch_sent(batch, result))
+
+        if errors:
+            for title, exp in errors:
+                print(title)
+                print("***** Exception: %s" % str(exp))
+                print("***** response: %s" % exp.response)
+            print("~~~~~~~~~~~~~~~~~~~~~~~~~~")
+            print("Exiting with error code: 5")
+            self.exit(5)
+
+    def send_batch(self, r_name, batch):
+        """
+        Post a list of elements with a single request, and the user restriction roles of
+        the posted users
+
+        This function may run in a worker thread: it only sends the requests and it returns
+        the backend responses without changing the importation state.
+
+        Returns a tuple containing:
+        - the elements creation responses
+        - the user roles creation responses
+        - an error tuple (title, BackendException) or None
+
+        :param r_name: resource name
+        :type r_name: str
+        :param batch: list of (item, Alignak object, links to update later) tuples
+        :type batch: list
+        :return: (responses, roles responses, error)
+        :rtype: tuple
+        """
+        items = [item for (item, dummy, dummy) in batch]
+        try:
+            if not self.dry_run:
+                # With headers=None, the post method manages correctly the posted data ...
+                # A list of one element gets a single element response
+                response = self.backend.post(r_name, items if len(items) > 1 else items[0],
+                                             headers=None)
+                responses = response['_items'] if '_items' in response else [response]
+            else:
+                responses = [{'_id': '_fake', '_etag': '_fake'} for dummy in batch]
+        except BackendException as e:
+            return (None, None, ("# Post/patch error for: %s : %s" % (r_name, items), e))
+
+        # Special case of users - create user restriction roles in the backend
+        roles = []
+        if r_name == 'user':
+            for item, response in zip(items, responses):
+                # Default is to allow read on all elements of the user's realm
+                user_role = {
+                    'user': response['_id'],
+                    'realm': item['_realm'],
+                    'sub_realm': True,
+                    'resource': '*',
+                    'crud': ['read']
+                }
+                try:
+                    if not self.dry_run:
+                        self.backend.post('userrestrictrole', user_role, headers=None)
+                except BackendException as e:
+                    return (responses, roles,
+                            ("# Post error for user_role: %s : %s" % (r_name, item), e))
+                roles.append(user_role)
+
+        return (responses, roles, None)
+
+    def batch_sent(self, batch, result):
+        """
+        Manage the result of a posted list of elements
+
+        A list rejected by the backend (422) because one of its elements is not valid is split
+        in two halves that are posted again until the faulty element is isolated.
+
+        :param batch: list of (item, Alignak object, links to update later) tuples
+        :type batch: list
+        :param result: send_batch result
+        :type result: tuple
+        :return: list of the errors (title, BackendException) tuples
+        :rtype: list
+        """
+        r_name, data_later, template = self.current.resource
+        responses, roles, error = result
+
+        if error is not None and responses is None:
+            if error[1].code == 422 and len(batch) > 1:
+                self.output("-> %s batch of %d elements rejected, splitting the batch", r_name,
+                            len(batch))
+                middle = len(batch) // 2
+                return \
+                    self.batch_sent(batch[:middle], self.send_batch(r_name, batch[:middle])) + \
+                    self.batch_sent(batch[middle:], self.send_batch(r_name, batch[middle:]))
+            return [error]
+
+        self.log("Batch insertion response : %s:", responses)
+        for (item, item_obj, later_tmp), response in zip(batch, responses):
+            self.element_inserted(r_name, data_later, response, item, item_obj, later_tmp,
+                                  template)
+        for user_role in roles:
+            self.output("-> Created a new user_role: %s : %s", r_name, user_role)
+
+        return [error] if error is not None else []
+
+    def resolve_link(self, resource, value, by_id=True):
+        """
+        Get the backend _id of a linked element
+
+        If the element is not yet known, it may be waiting in the current batch. If an element
+        of the current batch has this name or uuid, the batch is posted before searching again.
+
+        :param resource: linked resource name
+        :type resource: str
+        :param value: element _id, name or Alignak uuid
+        :type value: str
+        :param by_id: consider the value as a possible backend _id
+        :type by_id: bool
+        :return: backend _id or None if the element does not exist
+        :rtype: str
+        """
+        _id = self.inserted.resolve(resource, value, by_id=by_id)
+        if _id is None and self.current.pending and resource == self.current.resource[0]:
+            if not any(value in (item['name'], item_obj.uuid)
+                       for item, item_obj, dummy in self.current.pending):
+                return None
+            self.flush_pending()
+            _id = self.inserted.resolve(resource, value, by_id=by_id)
+        return _id
+
+    def register_inserted(self, r_name, _id, item, item_obj, template=False):
+        # pylint: disable=too-many-arguments
+        """
+        Register an element existing in the backend for further links resolution
 
+        :param r_name: resource name
+        :type r_name: str
+        :param _id: backend element identifier
+        :type _id: str
+        :param item: element data as sent to the backend
+        :type item: dict
+        :param item_obj: Alignak object
+        :param template: the element is a template
+        :type template: bool
         :return: None
         """
-        self.output("Adding realms...", forced=True)
-        data_later = [
-            {
-                'field': '_parent', 'type': 'simple',
-                'resource': 'realm', 'now': True
-            }
-        ]
-        schema = realm.get_schema()
-        self.manage_resource('realm', data_later, 'realm_name', schema)
-        self.update_later('realm', '_parent')
-
-        self.output("Adding commands...", forced=True)
-        data_later = []
-        schema = command.get_schema()
-        self.manage_resource('command', data_later, 'command_name', schema)
-
-        self.output("Adding timeperiods...", forced=True)
-        data_later = []
-        schema = timeperiod.get_schema()
-        self.manage_resource('timeperiod', data_later, 'timeperiod_name', schema)
-
-        # ------------------------------
-        # User part
-        # ------------------------------
-        self.output("Adding user templates...", forced=True)
-        data_later = [
-            {
-                'field': '_templates', 'type': 'list',
-                'resource': 'user', 'now': False
-            },
-            {
-                'field': 'host_notification_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'service_notification_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'host_notification_commands', 'type': 'list',
-                'resource': 'command', 'now': True
-            },
-            {
-                'field': 'service_notification_commands', 'type': 'list',
-                'resource': 'command', 'now': True
-            }
-        ]
-        schema = user.get_schema()
-        self.manage_resource('user', data_later, 'name', schema, template=True)
-        self.update_later('user', '_templates')
-
-        self.output("Adding users...", forced=True)
-        data_later = [
-            {
-                'field': '_templates', 'type': 'list',
-                'resource': 'user', 'now': True
-            },
-            {
-                'field': 'host_notification_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'service_notification_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'host_notification_commands', 'type': 'list',
-                'resource': 'command', 'now': True
-            },
-            {
-                'field': 'service_notification_commands', 'type': 'list',
-                'resource': 'command', 'now': True
-            }
-        ]
-        schema = user.get_schema()
-        self.manage_resource('user', data_later, 'name', schema)
-        # self.update_later('user', '_templates')
-
-        self.output("Adding users groups...", forced=True)
-        data_later = [
-            {
-                'field': '_parent', 'type': 'simple',
-                'resource': 'usergroup', 'now': False
-            },
-            {
-                'field': 'usergroups', 'type': 'list',
-                'resource': 'usergroup', 'now': False
-            },
-            {
-                'field': 'users', 'type': 'list',
-                'resource': 'user', 'now': True
-            }
-        ]
-        schema = usergroup.get_schema()
-        self.manage_resource('usergroup', data_later, 'name', schema)
-        self.update_later('usergroup', '_parent')
-        self.update_later('usergroup', 'usergroups')
-
-        # ------------------------------
-        # Host part
-        # ------------------------------
-        self.output("Adding hosts templates...", forced=True)
-        data_later = [
-            {
-                'field': '_templates', 'type': 'list',
-                'resource': 'host', 'now': False
-            },
-            {
-                'field': 'parents', 'type': 'list',
-                'resource': 'host', 'now': False
-            },
-            {
-                'field': '_realm', 'type': 'simple',
-                'resource': 'realm', 'now': True
-            },
-            {
-                'field': 'hostgroups', 'type': 'list',
-                'resource': 'hostgroup', 'now': True
-            },
-            {
-                'field': 'check_command', 'type': 'simple',
-                'resource': 'command', 'now': True
-            },
-            {
-                'field': 'event_handler', 'type': 'simple',
-                'resource': 'command', 'now': True
-            },
-            {
-                'field': 'check_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'users', 'type': 'list',
-                'resource': 'user', 'now': True
-            },
-            {
-                'field': 'usergroups', 'type': 'list',
-                'resource': 'usergroup', 'now': True
-            },
-            {
-                'field': 'notification_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'escalations', 'type': 'list',
-                'resource': 'escalation', 'now': True
-            },
-            {
-                'field': 'maintenance_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'snapshot_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            }
-        ]
-        schema = host.get_schema()
-        # Import hosts templates
-        self.manage_resource('host', data_later, 'name', schema, template=True)
-        self.update_later('host', '_templates')
-        self.update_later('host', 'parents')
+        host = item.get('host') if r_name == 'service' else None
+        if template:
+            self.inserted.register('%s_template' % r_name, _id, item['name'], item_obj.uuid, host)
+        self.inserted.register(r_name, _id, item['name'], item_obj.uuid, host)
 
-        self.output("Adding hosts...", forced=True)
-        data_later = [
-            {
-                'field': '_templates', 'type': 'list',
-                'resource': 'host', 'now': True
-            },
-            {
-                'field': 'parents', 'type': 'list',
-                'resource': 'host', 'now': False
-            },
-            {
-                'field': '_realm', 'type': 'simple',
-                'resource': 'realm', 'now': True
-            },
-            {
-                'field': 'check_command', 'type': 'simple',
-                'resource': 'command', 'now': True
-            },
-            {
-                'field': 'event_handler', 'type': 'simple',
-                'resource': 'command', 'now': True
-            },
-            {
-                'field': 'check_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'users', 'type': 'list',
-                'resource': 'user', 'now': True
-            },
-            {
-                'field': 'usergroups', 'type': 'list',
-                'resource': 'usergroup', 'now': True
-            },
-            {
-                'field': 'notification_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'escalations', 'type': 'list',
-                'resource': 'escalation', 'now': True
-            },
-            {
-                'field': 'maintenance_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'snapshot_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
+    def get_import_phases(self):
+        """
+        Get the importation phases
+
+        Each phase imports the elements of a resource type:
+        - name: phase name
+        - title: message displayed when the phase starts
+        - resource: backend resource name
+        - id_name: Alignak property used as the element name
+        - schema: backend resource model
+        - template: import the templates of the resource
+        - data_later: links with the other elements (see manage_resource)
+        - late: link fields updated once all the phase elements are imported
+        - requires: phases that must be run before, although they are not related with a link
+
+        :return: phases list
+        :rtype: list
+        """
+        return [
+            {
+                'name': 'realm', 'title': "Adding realms...",
+                'resource': 'realm', 'id_name': 'realm_name', 'schema': realm,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': '_parent', 'type': 'simple',
+                        'resource': 'realm', 'now': True
+                    }
+                ],
+                'late': ['_parent']
+            },
+            {
+                'name': 'command', 'title': "Adding commands...",
+                'resource': 'command', 'id_name': 'command_name', 'schema': command,
+                'template': False,
+                'data_later': [],
+                'late': []
+            },
+            {
+                'name': 'timeperiod', 'title': "Adding timeperiods...",
+                'resource': 'timeperiod', 'id_name': 'timeperiod_name', 'schema': timeperiod,
+                'template': False,
+                'data_later': [],
+                'late': []
+            },
+            {
+                'name': 'user_template', 'title': "Adding user templates...",
+                'resource': 'user', 'id_name': 'name', 'schema': user,
+                'template': True,
+                'data_later': [
+                    {
+                        'field': '_templates', 'type': 'list',
+                        'resource': 'user', 'now': True
+                    },
+                    {
+                        'field': 'host_notification_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'service_notification_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'host_notification_commands', 'type': 'list',
+                        'resource': 'command', 'now': True
+                    },
+                    {
+                        'field': 'service_notification_commands', 'type': 'list',
+                        'resource': 'command', 'now': True
+                    }
+                ],
+                'late': ['_templates'],
+                'requires': ['realm']
+            },
+            {
+                'name': 'user', 'title': "Adding users...",
+                'resource': 'user', 'id_name': 'name', 'schema': user,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': '_templates', 'type': 'list',
+                        'resource': 'user', 'now': True
+                    },
+                    {
+                        'field': 'host_notification_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'service_notification_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'host_notification_commands', 'type': 'list',
+                        'resource': 'command', 'now': True
+                    },
+                    {
+                        'field': 'service_notification_commands', 'type': 'list',
+                        'resource': 'command', 'now': True
+                    }
+                ],
+                'late': [],
+                'requires': ['realm']
+            },
+            {
+                'name': 'usergroup', 'title': "Adding users groups...",
+                'resource': 'usergroup', 'id_name': 'name', 'schema': usergroup,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': '_parent', 'type': 'simple',
+                        'resource': 'usergroup', 'now': True
+                    },
+                    {
+                        'field': 'usergroups', 'type': 'list',
+                        'resource': 'usergroup', 'now': True
+                    },
+                    {
+                        'field': 'users', 'type': 'list',
+                        'resource': 'user', 'now': True
+                    }
+                ],
+                'late': ['_parent', 'usergroups']
+            },
+            {
+                'name': 'host_template', 'title': "Adding hosts templates...",
+                'resource': 'host', 'id_name': 'name', 'schema': host,
+                'template': True,
+                'data_later': [
+                    {
+                        'field': '_templates', 'type': 'list',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': 'parents', 'type': 'list',
+                        'resource': 'host', 'now': False
+                    },
+                    {
+                        'field': '_realm', 'type': 'simple',
+                        'resource': 'realm', 'now': True
+                    },
+                    {
+                        'field': 'hostgroups', 'type': 'list',
+                        'resource': 'hostgroup', 'now': True
+                    },
+                    {
+                        'field': 'check_command', 'type': 'simple',
+                        'resource': 'command', 'now': True
+                    },
+                    {
+                        'field': 'event_handler', 'type': 'simple',
+                        'resource': 'command', 'now': True
+                    },
+                    {
+                        'field': 'check_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'users', 'type': 'list',
+                        'resource': 'user', 'now': True
+                    },
+                    {
+                        'field': 'usergroups', 'type': 'list',
+                        'resource': 'usergroup', 'now': True
+                    },
+                    {
+                        'field': 'notification_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'escalations', 'type': 'list',
+                        'resource': 'escalation', 'now': True
+                    },
+                    {
+                        'field': 'maintenance_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'snapshot_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    }
+                ],
+                'late': ['_templates', 'parents']
+            },
+            {
+                'name': 'host', 'title': "Adding hosts...",
+                'resource': 'host', 'id_name': 'host_name', 'schema': host,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': '_templates', 'type': 'list',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': 'parents', 'type': 'list',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': '_realm', 'type': 'simple',
+                        'resource': 'realm', 'now': True
+                    },
+                    {
+                        'field': 'check_command', 'type': 'simple',
+                        'resource': 'command', 'now': True
+                    },
+                    {
+                        'field': 'event_handler', 'type': 'simple',
+                        'resource': 'command', 'now': True
+                    },
+                    {
+                        'field': 'check_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'users', 'type': 'list',
+                        'resource': 'user', 'now': True
+                    },
+                    {
+                        'field': 'usergroups', 'type': 'list',
+                        'resource': 'usergroup', 'now': True
+                    },
+                    {
+                        'field': 'notification_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'escalations', 'type': 'list',
+                        'resource': 'escalation', 'now': True
+                    },
+                    {
+                        'field': 'maintenance_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'snapshot_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    }
+                ],
+                'late': ['parents']
+            },
+            {
+                'name': 'hostdependency', 'title': "Adding hosts dependencies...",
+                'resource': 'hostdependency', 'id_name': 'name', 'schema': hostdependency,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': 'hosts', 'type': 'list',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': 'dependent_hosts', 'type': 'list',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': 'hostgroups', 'type': 'list',
+                        'resource': 'hostgroup', 'now': True
+                    },
+                    {
+                        'field': 'dependent_hostgroups', 'type': 'list',
+                        'resource': 'hostgroup', 'now': True
+                    },
+                    {
+                        'field': 'dependency_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    }
+                ],
+                'late': []
+            },
+            {
+                'name': 'hostgroup', 'title': "Adding hosts groups...",
+                'resource': 'hostgroup', 'id_name': 'hostgroup_name', 'schema': hostgroup,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': '_realm', 'type': 'simple',
+                        'resource': 'realm', 'now': True
+                    },
+                    {
+                        'field': '_parent', 'type': 'simple',
+                        'resource': 'hostgroup', 'now': True
+                    },
+                    {
+                        'field': 'hostgroups', 'type': 'list',
+                        'resource': 'hostgroup', 'now': True
+                    },
+                    {
+                        'field': 'hosts', 'type': 'list',
+                        'resource': 'host', 'now': True
+                    }
+                ],
+                'late': ['_parent', 'hostgroups']
+            },
+            {
+                'name': 'hostescalation', 'title': "Adding hosts escalations...",
+                'resource': 'hostescalation', 'id_name': 'escalation_name',
+                'schema': hostescalation,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': 'hosts', 'type': 'list',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': 'hostgroups', 'type': 'list',
+                        'resource': 'hostgroup', 'now': True
+                    },
+                    {
+                        'field': 'users', 'type': 'list',
+                        'resource': 'user', 'now': True
+                    },
+                    {
+                        'field': 'usergroups', 'type': 'list',
+                        'resource': 'usergroup', 'now': True
+                    },
+                    {
+                        'field': 'escalation_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    }
+                ],
+                'late': []
+            },
+            {
+                'name': 'service_template', 'title': "Adding services templates...",
+                'resource': 'service', 'id_name': 'name', 'schema': service,
+                'template': True,
+                'data_later': [
+                    {
+                        'field': '_templates', 'type': 'list',
+                        'resource': 'service', 'now': True
+                    },
+                    {
+                        'field': 'host', 'type': 'simple',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': '_realm', 'type': 'simple',
+                        'resource': 'realm', 'now': True
+                    },
+                    {
+                        'field': 'servicegroups', 'type': 'list',
+                        'resource': 'servicegroup', 'now': True
+                    },
+                    {
+                        'field': 'check_command', 'type': 'simple',
+                        'resource': 'command', 'now': True
+                    },
+                    {
+                        'field': 'event_handler', 'type': 'simple',
+                        'resource': 'command', 'now': True
+                    },
+                    {
+                        'field': 'check_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'notification_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'users', 'type': 'list',
+                        'resource': 'user', 'now': True
+                    },
+                    {
+                        'field': 'usergroups', 'type': 'list',
+                        'resource': 'usergroup',
+                        'now': True
+                    },
+                    {
+                        'field': 'escalations', 'type': 'list',
+                        'resource': 'escalation', 'now': True
+                    },
+                    {
+                        'field': 'maintenance_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'snapshot_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'service_dependencies', 'type': 'list',
+                        'resource': 'service', 'now': True
+                    }
+                ],
+                'late': ['_templates']
+            },
+            {
+                'name': 'service', 'title': "Adding services...",
+                'resource': 'service', 'id_name': 'service_description', 'schema': service,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': '_templates', 'type': 'list',
+                        'resource': 'service', 'now': True
+                    },
+                    {
+                        'field': 'host', 'type': 'simple',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': '_realm', 'type': 'simple',
+                        'resource': 'realm', 'now': True
+                    },
+                    {
+                        'field': 'servicegroups', 'type': 'list',
+                        'resource': 'servicegroup', 'now': True
+                    },
+                    {
+                        'field': 'hostgroups', 'type': 'list',
+                        'resource': 'hostgroup', 'now': True
+                    },
+                    {
+                        'field': 'check_command', 'type': 'simple',
+                        'resource': 'command', 'now': True
+                    },
+                    {
+                        'field': 'event_handler', 'type': 'simple',
+                        'resource': 'command', 'now': True
+                    },
+                    {
+                        'field': 'check_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'notification_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'users', 'type': 'list',
+                        'resource': 'user', 'now': True
+                    },
+                    {
+                        'field': 'usergroups', 'type': 'list',
+                        'resource': 'usergroup',
+                        'now': True
+                    },
+                    {
+                        'field': 'escalations', 'type': 'list',
+                        'resource': 'escalation', 'now': True
+                    },
+                    {
+                        'field': 'maintenance_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'snapshot_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    },
+                    {
+                        'field': 'service_dependencies', 'type': 'list',
+                        'resource': 'service', 'now': True
+                    }
+                ],
+                'late': []
+            },
+            {
+                'name': 'servicedependency', 'title': "Adding services dependencies...",
+                'resource': 'servicedependency', 'id_name': 'name', 'schema': servicedependency,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': 'hosts', 'type': 'list',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': 'services', 'type': 'list',
+                        'resource': 'service', 'now': True, 'host_field': 'hosts'
+                    },
+                    {
+                        'field': 'dependent_hosts', 'type': 'list',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': 'dependent_services', 'type': 'list',
+                        'resource': 'service', 'now': True, 'host_field': 'dependent_hosts'
+                    },
+                    {
+                        'field': 'hostgroups', 'type': 'list',
+                        'resource': 'hostgroup', 'now': True
+                    },
+                    {
+                        'field': 'dependent_hostgroups', 'type': 'list',
+                        'resource': 'hostgroup', 'now': True
+                    },
+                    {
+                        'field': 'dependency_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    }
+                ],
+                'late': []
+            },
+            {
+                'name': 'servicegroup', 'title': "Adding services groups...",
+                'resource': 'servicegroup', 'id_name': 'servicegroup_name', 'schema': servicegroup,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': '_parent', 'type': 'simple',
+                        'resource': 'servicegroup', 'now': True
+                    },
+                    {
+                        'field': 'servicegroups', 'type': 'list',
+                        'resource': 'servicegroup', 'now': True
+                    },
+                    {
+                        'field': 'services', 'type': 'list',
+                        'resource': 'service', 'now': True
+                    }
+                ],
+                'late': ['_parent', 'servicegroups'],
+                'requires': ['realm']
+            },
+            {
+                'name': 'serviceescalation', 'title': "Adding services escalations...",
+                'resource': 'serviceescalation', 'id_name': 'escalation_name',
+                'schema': serviceescalation,
+                'template': False,
+                'data_later': [
+                    {
+                        'field': 'hosts', 'type': 'list',
+                        'resource': 'host', 'now': True
+                    },
+                    {
+                        'field': 'services', 'type': 'list',
+                        'resource': 'service', 'now': True, 'host_field': 'hosts'
+                    },
+                    {
+                        'field': 'hostgroups', 'type': 'list',
+                        'resource': 'hostgroup', 'now': True
+                    },
+                    {
+                        'field': 'users', 'type': 'list',
+                        'resource': 'user', 'now': True
+                    },
+                    {
+                        'field': 'usergroups', 'type': 'list',
+                        'resource': 'usergroup', 'now': True
+                    },
+                    {
+                        'field': 'escalation_period', 'type': 'simple',
+                        'resource': 'timeperiod', 'now': True
+                    }
+                ],
+                'late': []
             }
         ]
-        schema = host.get_schema()
-        self.manage_resource('host', data_later, 'host_name', schema)
-        # self.update_later('host', '_templates')
-        self.update_later('host', 'parents')
 
-        self.output("Adding hosts dependencies...", forced=True)
-        data_later = [
-            {
-                'field': 'hosts', 'type': 'list',
-                'resource': 'host', 'now': True
-            },
-            {
-                'field': 'dependent_hosts', 'type': 'list',
-                'resource': 'host', 'now': True
-            },
-            {
-                'field': 'hostgroups', 'type': 'list',
-                'resource': 'hostgroup', 'now': True
-            },
-            {
-                'field': 'dependent_hostgroups', 'type': 'list',
-                'resource': 'hostgroup', 'now': True
-            },
-            {
-                'field': 'dependency_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            }
-        ]
-        schema = hostdependency.get_schema()
-        self.manage_resource('hostdependency', data_later, 'name', schema)
+    def count_elements(self, r_name, template=False):
+        """
+        Count the Alignak elements of a resource
 
-        self.output("Adding hosts groups...", forced=True)
-        data_later = [
-            {
-                'field': '_realm', 'type': 'simple',
-                'resource': 'realm', 'now': True
-            },
-            {
-                'field': '_parent', 'type': 'simple',
-                'resource': 'hostgroup', 'now': False
-            },
-            {
-                'field': 'hostgroups', 'type': 'list',
-                'resource': 'hostgroup', 'now': False
-            },
-            {
-                'field': 'hosts', 'type': 'list',
-                'resource': 'host', 'now': True
-            }
-        ]
-        schema = hostgroup.get_schema()
-        self.manage_resource('hostgroup', data_later, 'hostgroup_name', schema)
-        self.update_later('hostgroup', '_parent')
-        self.update_later('hostgroup', 'hostgroups')
+        :param r_name: resource name
+        :type r_name: str
+        :param template: count the templates of the resource
+        :type template: bool
+        :return: elements count
+        :rtype: int
+        """
+        if template:
+            return len(getattr(self, '%ss_templates' % r_name, []))
+        try:
+            return len(getattr(self.alignak_conf, self.get_alignak_resource(r_name), []))
+        except TypeError:
+            return 1
 
-        self.output("Adding hosts escalations...", forced=True)
-        data_later = [
-            {
-                'field': 'hosts', 'type': 'list',
-                'resource': 'host', 'now': True
-            },
-            {
-                'field': 'hostgroups', 'type': 'list',
-                'resource': 'hostgroup', 'now': True
-            },
-            {
-                'field': 'users', 'type': 'list',
-                'resource': 'user', 'now': True
-            },
-            {
-                'field': 'usergroups', 'type': 'list',
-                'resource': 'usergroup', 'now': True
-            },
-            {
-                'field': 'escalation_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            }
-        ]
-        schema = hostescalation.get_schema()
-        self.manage_resource('hostescalation', data_later, 'escalation_name', schema)
+    def import_phase(self, phase):
+        """
+        Import the elements of an importation phase
 
-        # ------------------------------
-        # Service part
-        # ------------------------------
-        self.output("Adding services templates...", forced=True)
-        data_later = [
-            {
-                'field': '_templates', 'type': 'list',
-                'resource': 'service', 'now': False
-            },
-            {
-                'field': 'host', 'type': 'simple',
-                'resource': 'host', 'now': True
-            },
-            {
-                'field': '_realm', 'type': 'simple',
-                'resource': 'realm', 'now': True
-            },
-            {
-                'field': 'servicegroups', 'type': 'list',
-                'resource': 'servicegroup', 'now': True
-            },
-            {
-                'field': 'check_command', 'type': 'simple',
-                'resource': 'command', 'now': True
-            },
-            {
-                'field': 'event_handler', 'type': 'simple',
-                'resource': 'command', 'now': True
-            },
-            {
-                'field': 'check_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'notification_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'users', 'type': 'list',
-                'resource': 'user', 'now': True
-            },
-            {
-                'field': 'usergroups', 'type': 'list',
-                'resource': 'usergroup',
-                'now': True
-            },
-            {
-                'field': 'escalations', 'type': 'list',
-                'resource': 'escalation', 'now': True
-            },
-            {
-                'field': 'maintenance_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'snapshot_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'service_dependencies', 'type': 'list',
-                'resource': 'service', 'now': True
-            }
-        ]
-        schema = service.get_schema()
-        self.manage_resource('service', data_later, 'name', schema, template=True)
-        self.update_later('service', '_templates')
+        :param phase: importation phase (see get_import_phases)
+        :type phase: dict
+        :return: None
+        """
+        self.current.logger = get_phase_logger(phase['name'])
+        try:
+            self.output(phase['title'], forced=True)
+            with self.profiler.span(phase['name'], 'phase', phase['resource'],
+                                    self.count_elements(phase['resource'], phase['template'])):
+                with self.profiler.span('%s.manage_resource' % phase['name'], 'step',
+                                        phase['resource']):
+                    self.manage_resource(phase['resource'], phase['data_later'],
+                                         phase['id_name'], phase['schema'].get_schema(),
+                                         template=phase['template'])
+                if phase['late']:
+                    with self.profiler.span('%s.update_later' % phase['name'], 'step',
+                                            phase['resource']):
+                        self.update_later(phase['resource'], phase['late'])
+        finally:
+            self.current.logger = self.logger
 
-        self.output("Adding services...", forced=True)
-        data_later = [
-            {
-                'field': '_templates', 'type': 'list',
-                'resource': 'service', 'now': True
-            },
-            {
-                'field': 'host', 'type': 'simple',
-                'resource': 'host', 'now': True
-            },
-            {
-                'field': '_realm', 'type': 'simple',
-                'resource': 'realm', 'now': True
-            },
-            {
-                'field': 'servicegroups', 'type': 'list',
-                'resource': 'servicegroup', 'now': True
-            },
-            {
-                'field': 'hostgroups', 'type': 'list',
-                'resource': 'hostgroup', 'now': True
-            },
-            {
-                'field': 'check_command', 'type': 'simple',
-                'resource': 'command', 'now': True
-            },
-            {
-                'field': 'event_handler', 'type': 'simple',
-                'resource': 'command', 'now': True
-            },
-            {
-                'field': 'check_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'notification_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'users', 'type': 'list',
-                'resource': 'user', 'now': True
-            },
-            {
-                'field': 'usergroups', 'type': 'list',
-                'resource': 'usergroup',
-                'now': True
-            },
-            {
-                'field': 'escalations', 'type': 'list',
-                'resource': 'escalation', 'now': True
-            },
-            {
-                'field': 'maintenance_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'snapshot_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            },
-            {
-                'field': 'service_dependencies', 'type': 'list',
-                'resource': 'service', 'now': True
-            }
-        ]
-        schema = service.get_schema()
-        self.manage_resource('service', data_later, 'service_description', schema)
-        # self.update_later('service', '_templates')
+    def import_objects(self):
+        """
+        Import objects in the backend
 
-        self.output("Adding services dependencies...", forced=True)
-        data_later = [
-            {
-                'field': 'hosts', 'type': 'list',
-                'resource': 'host', 'now': True
-            },
-            {
-                'field': 'services', 'type': 'list',
-                'resource': 'service', 'now': True
-            },
-            {
-                'field': 'dependent_hosts', 'type': 'list',
-                'resource': 'host', 'now': True
-            },
-            {
-                'field': 'dependent_services', 'type': 'list',
-                'resource': 'service', 'now': True
-            },
-            {
-                'field': 'hostgroups', 'type': 'list',
-                'resource': 'hostgroup', 'now': True
-            },
-            {
-                'field': 'dependent_hostgroups', 'type': 'list',
-                'resource': 'hostgroup', 'now': True
-            },
-            {
-                'field': 'dependency_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            }
-        ]
-        schema = servicedependency.get_schema()
-        self.manage_resource('servicedependency', data_later, 'name', schema)
+        The importation phases are run in their dependency order. With several workers, the
+        independent phases are run concurrently.
 
-        self.output("Adding services groups...", forced=True)
-        data_later = [
-            {
-                'field': '_parent', 'type': 'simple',
-                'resource': 'servicegroup', 'now': False
-            },
-            {
-                'field': 'servicegroups', 'type': 'list',
-                'resource': 'servicegroup', 'now': False
-            },
-            {
-                'field': 'services', 'type': 'list',
-                'resource': 'service', 'now': True
-            }
-        ]
-        schema = servicegroup.get_schema()
-        self.manage_resource('servicegroup', data_later, 'servicegroup_name', schema)
-        self.update_later('servicegroup', '_parent')
-        self.update_later('servicegroup', 'servicegroups')
+        :return: None
+        """
+        scheduler = PhasesScheduler()
+        for phase in self.get_import_phases():
+            scheduler.add(phase['name'], partial(self.import_phase, phase),
+                          provides=phase['resource'],
+                          uses=[values['resource'] for values in phase['data_later']],
+                          requires=phase.get('requires'),
+                          weight=self.count_elements(phase['resource'], phase['template']))
+
+        if self.plan:
+            self.output("~~~~~~~~~~~~~~~~~~~~~~~~ "
+                        "Importation plan ~~~~~~~~~~~~~~~~~~~~~~~~", forced=True)
+            for line in scheduler.get_plan():
+                self.output(line, forced=True)
 
-        self.output("Adding services escalations...", forced=True)
-        data_later = [
-            {
-                'field': 'services', 'type': 'list',
-                'resource': 'service', 'now': True
-            },
-            {
-                'field': 'hosts', 'type': 'list',
-                'resource': 'host', 'now': True
-            },
-            {
-                'field': 'hostgroups', 'type': 'list',
-                'resource': 'hostgroup', 'now': True
-            },
-            {
-                'field': 'users', 'type': 'list',
-                'resource': 'user', 'now': True
-            },
-            {
-                'field': 'usergroups', 'type': 'list',
-                'resource': 'usergroup', 'now': True
-            },
-            {
-                'field': 'escalation_period', 'type': 'simple',
-                'resource': 'timeperiod', 'now': True
-            }
-        ]
-        schema = serviceescalation.get_schema()
-        self.manage_resource('serviceescalation', data_later, 'escalation_name', schema)
-        # self.update_later('serviceescalation', 'services')
+        scheduler.run(self.workers)
 
-    def log(self, message):
+    def log(self, message, *args):
         """
         Display message if in very verbose mode
 
+        The message is formatted with args only if it is displayed.
+
         :param message: message to display
         :type message: str
         :return: None
         """
-        if self.very_verbose:
-            self.output(message, forced=True)
+        getattr(self.current, 'logger', self.logger).log(TRACE, message, *args)
 
-    def output(self, message, forced=False):
+    def output(self, message, *args, **kwargs):
         """
-        Display message if in verbose mode
+        Display message if in verbose mode, or if forced is set (unless in quiet mode)
+
+        The message is formatted with args only if it is displayed.
 
         :param message: message to display
         :type message: str
+        :param forced: display the message unless in quiet mode
+        :type forced: bool
         :return: None
         """
-        if forced or (not self.quiet and self.verbose):
-            print(message)
+        getattr(self.current, 'logger', self.logger).log(INFO if kwargs.get('forced') else DEBUG,
+                                                         message, *args)
 
 
 def main():
@@ -2775,14 +3836,14 @@ def main():
                 "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~", forced=True)
     if fill.inserted:
         fill.output("alignak-backend-import, inserted elements: ", forced=True)
-        for object_type in sorted(fill.inserted):
-            count = len(fill.inserted[object_type])
+        for object_type in fill.inserted.resources():
+            count = fill.inserted.count(object_type)
             if '%s_template' % object_type in fill.inserted:
-                count = count - len(fill.inserted['%s_template' % object_type])
+                count = count - fill.inserted.count('%s_template' % object_type)
             if count:
-                fill.output(" - %s %s(s)" % (count, object_type), forced=True)
+                fill.output(" - %s %s(s)", count, object_type, forced=True)
             else:
-                fill.output(" - no %s(s)" % object_type, forced=True)
+                fill.output(" - no %s(s)", object_type, forced=True)
         fill.output("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~"
                     "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~", forced=True)
     if fill.ignored:
@@ -2792,12 +3853,11 @@ def main():
             if '%s_template' % object_type in fill.ignored:
                 count = count - len(fill.ignored['%s_template' % object_type])
             if count:
-                fill.output(" - %s %s(s)" % (count, object_type), forced=True)
+                fill.output(" - %s %s(s)", count, object_type, forced=True)
             else:
-                fill.output(" - no %s(s)" % object_type, forced=True)
+                fill.output(" - no %s(s)", object_type, forced=True)
             for elt in sorted(fill.ignored[object_type]):
-                fill.output("   %s: %s" % (object_type, fill.ignored[object_type][elt]),
-                            forced=True)
+                fill.output("   %s: %s", object_type, fill.ignored[object_type][elt])
         fill.output("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~"
                     "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~", forced=True)
     if fill.updated:
@@ -2807,12 +3867,11 @@ def main():
             if '%s_template' % object_type in fill.updated:
                 count = count - len(fill.updated['%s_template' % object_type])
             if count:
-                fill.output(" - %s %s(s)" % (count, object_type), forced=True)
+                fill.output(" - %s %s(s)", count, object_type, forced=True)
             else:
-                fill.output(" - no %s(s)" % object_type, forced=True)
+                fill.output(" - no %s(s)", object_type, forced=True)
             for elt in sorted(fill.updated[object_type]):
-                fill.output("   %s: %s" % (object_type, fill.updated[object_type][elt]),
-                            forced=True)
+                fill.output("   %s: %s", object_type, fill.updated[object_type][elt])
         fill.output("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~"
                     "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~", forced=True)
     else:
@@ -2820,9 +3879,32 @@ def main():
             fill.output("alignak-backend-import, no elements were updated.", forced=True)
             fill.output("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~"
                         "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~", forced=True)
+    if fill.unchanged:
+        fill.output("alignak-backend-import, unchanged elements: ", forced=True)
+        for object_type in sorted(fill.unchanged):
+            fill.output(" - %s %s(s)", fill.unchanged[object_type], object_type, forced=True)
+        fill.output("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~"
+                    "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~", forced=True)
+
+    if fill.connections:
+        stats = fill.connections.get_stats()
+        fill.output("alignak-backend-import, backend requests: %d, new connections: %d, "
+                    "reused connections: %d", stats['requests'], stats['new'], stats['reused'],
+                    forced=True)
+        for line in fill.connections.metrics.get_lines():
+            fill.output(" - %s", line, forced=True)
+        if fill.requests_report_file:
+            try:
+                fill.connections.metrics.write_report(fill.requests_report_file)
+                fill.output("Backend requests metrics written to %s", fill.requests_report_file,
+                            forced=True)
+            except IOError as exp:
+                print("Backend requests metrics not written: %s" % exp)
+        fill.output("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~"
+                    "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~", forced=True)
 
     end = time.time()
-    fill.output("Global configuration import duration: %s" % (end - start), forced=True)
+    fill.output("Global configuration import duration: %s", end - start, forced=True)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Extraction of the Alignak configuration objects properties
+
+Only the properties that are backend fields, or that are converted to backend fields while
+importing, are read from the Alignak objects. The properties to read are computed once for an
+Alignak objects class and a backend resource schema, rather than for each object.
+"""
+from operator import attrgetter
+
+# Alignak properties that are not backend fields but that are converted to backend fields
+# (renamed, moved to the custom variables...) or used to import the objects
+CONVERTED_PROPERTIES = frozenset([
+    'uuid', 'name', 'use', 'store_use',
+    'members', 'hostgroup_members', 'servicegroup_members', 'contactgroup_members',
+    'realm', 'realm_members', 'higher_realms',
+    'contacts', 'contact_groups', 'contactgroups', 'contact_name', 'contactgroup_name',
+    'notificationways', 'host_notification_commands', 'service_notification_commands',
+    'host_name', 'hostgroup_name', 'service_description', 'servicegroup_name',
+    'dependent_host_name', 'dependent_hostgroup_name',
+    'dependent_service_description', 'dependent_servicegroup_name',
+    'check_command', 'event_handler', 'snapshot_command', 'trigger_name',
+    'timeperiod_name', 'dateranges', 'address6',
+    'display_name', 'icon_image', 'icon_image_alt', 'icon_set', 'vrml_image',
+    'statusmap_image', '2d_coords', '3d_coords', 'custom_views'
+])
+
+
+class Extractor(object):  # pylint: disable=useless-object-inheritance
+    """
+    Extract the properties of Alignak objects as a dictionary
+    """
+    def __init__(self, properties, fields=None, keep=None):
+        """
+        Compute the properties to read
+
+        :param properties: Alignak objects properties names
+        :param fields: backend resource fields names, None to read all the properties
+        :param keep: other properties names to read
+        :type keep: list
+        """
+        keep = CONVERTED_PROPERTIES.union(keep or [])
+        self.names = tuple(prop for prop in properties
+                           if fields is None or prop in fields or prop in keep)
+        self.getters = [(name, attrgetter(name)) for name in self.names]
+        self.getter = attrgetter(*self.names) if len(self.names) > 1 else None
+
+    def __call__(self, obj):
+        """
+        Extract the properties of an object
+
+        All the properties are read at once, unless an object did not define all its
+        properties; the properties are then read one by one and the undefined properties
+        are ignored.
+
+        :param obj: Alignak object
+        :return: properties name -> value
+        :rtype: dict
+        """
+        if self.getter is not None:
+            try:
+                return dict(zip(self.names, self.getter(obj)))
+            except AttributeError:
+                # The objects of a class usually define the same properties
+                self.getter = None
+
+        item = {}
+        for name, getter in self.getters:
+            try:
+                item[name] = getter(obj)
+            except AttributeError:
+                continue
+        return item
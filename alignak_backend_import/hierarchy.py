@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Hierarchy of the Alignak configuration groups
+
+The Alignak groups (hosts, services and users groups) and realms declare their members groups,
+whereas the backend stores the parent of each group. This module builds the parent relations
+from the members in a single pass over the members and gives an order of the groups where each
+parent is before its children.
+
+The templates are also sorted so that each template is after the templates it uses, and the
+hosts so that each host is after its parent hosts.
+"""
+import heapq
+
+from six import string_types
+
+
+class Hierarchy(object):  # pylint: disable=useless-object-inheritance
+    """
+    Parent relations of a list of groups, built from their members names
+    """
+    def __init__(self, groups, get_name, get_members, first_parent=False):
+        """
+        Build the parent relations
+
+        When a group is a member of several groups, its parent is the last of these groups
+        in the groups list, or the first one if first_parent is set.
+
+        :param groups: groups list
+        :param get_name: function returning the name of a group
+        :param get_members: function returning the members names of a group
+        :param first_parent: keep the first parent found for a group
+        :type first_parent: bool
+        """
+        self.groups = list(groups)
+        self.parents = [None] * len(self.groups)
+
+        positions = {}
+        for position, group in enumerate(self.groups):
+            positions.setdefault(get_name(group), position)
+
+        for position, group in enumerate(self.groups):
+            for member in get_members(group) or []:
+                try:
+                    child = positions.get(member)
+                except TypeError:
+                    continue
+                if child is None:
+                    continue
+                if first_parent and self.parents[child] is not None:
+                    continue
+                self.parents[child] = position
+
+    def __iter__(self):
+        """
+        Iterate over the groups and their parent group
+
+        :return: (group, parent group or None) tuples iterator
+        """
+        for position, group in enumerate(self.groups):
+            parent = self.parents[position]
+            yield group, None if parent is None else self.groups[parent]
+
+    def get_order(self):
+        """
+        Get the groups ordered so that each parent group is before its children
+
+        The groups are ordered by level in the hierarchy and keep their relative order in a
+        level. The groups that are in a cycle (or children of a group in a cycle) can not be
+        ordered, they are returned apart, in their original order.
+
+        :return: ordered groups list and groups in a cycle list
+        :rtype: tuple
+        """
+        children = [[] for dummy in self.groups]
+        level = []
+        for position, parent in enumerate(self.parents):
+            if parent is None:
+                level.append(position)
+            else:
+                children[parent].append(position)
+
+        ordered = []
+        done = set()
+        while level:
+            ordered.extend(level)
+            done.update(level)
+            level = sorted(child for parent in level for child in children[parent])
+
+        cyclic = [group for position, group in enumerate(self.groups) if position not in done]
+        return [self.groups[position] for position in ordered], cyclic
+
+
+def sort_by_requirements(items, get_name, get_requirements, levels=False):
+    """
+    Sort items so that each item is after the items it requires (eg. templates and the
+    templates they use)
+
+    The items keep their relative order when possible. The required names that are not the
+    name of an item are ignored. The items that are in a cycle (or that require an item in a
+    cycle) can not be sorted, they are returned apart, in their original order.
+
+    If levels is set, the items are sorted by level: the items that do not require any item
+    first, then the items that only require the items of the first level... The items keep
+    their relative order in a level.
+
+    :param items: items list
+    :param get_name: function returning the name of an item
+    :param get_requirements: function returning the names required by an item
+    :param levels: sort the items by level
+    :type levels: bool
+    :return: sorted items list and items in a cycle list
+    :rtype: tuple
+    """
+    items = list(items)
+    positions = {}
+    for position, item in enumerate(items):
+        positions.setdefault(get_name(item), position)
+
+    required_by = [[] for dummy in items]
+    waiting = [0] * len(items)
+    for position, item in enumerate(items):
+        requirements = get_requirements(item) or []
+        if isinstance(requirements, string_types):
+            requirements = requirements.split(',')
+        for required in set(positions.get(name.strip()) for name in requirements):
+            if required is None:
+                continue
+            required_by[required].append(position)
+            waiting[position] += 1
+
+    ready = [position for position in range(len(items)) if not waiting[position]]
+    ordered = []
+    while levels and ready:
+        ordered.extend(ready)
+        level = ready
+        ready = []
+        for position in level:
+            for other in required_by[position]:
+                waiting[other] -= 1
+                if not waiting[other]:
+                    ready.append(other)
+        ready.sort()
+
+    heapq.heapify(ready)
+    while ready:
+        position = heapq.heappop(ready)
+        ordered.append(position)
+        for other in required_by[position]:
+            waiting[other] -= 1
+            if not waiting[other]:
+                heapq.heappush(ready, other)
+
+    done = set(ordered)
+    cyclic = [item for position, item in enumerate(items) if position not in done]
+    return [items[position] for position in ordered], cyclic
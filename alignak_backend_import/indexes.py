@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Indexes of the Alignak configuration objects
+
+The Alignak configuration objects are matched with each other (raw objects with the
+configuration objects, templates with the objects...) through dictionaries rather than
+nested loops over the objects lists.
+"""
+
+
+def index_by(objects, key):
+    """
+    Index objects by a key
+
+    The objects which key can not be computed (missing attribute) or is not hashable
+    are not indexed.
+
+    :param objects: objects list
+    :param key: function returning the key of an object
+    :return: key -> objects list, in the objects order
+    :rtype: dict
+    """
+    index = {}
+    for obj in objects:
+        try:
+            index.setdefault(key(obj), []).append(obj)
+        except (AttributeError, TypeError):
+            continue
+    return index
+
+
+def copy_use(raw_objects, index, key, only_defined=False):
+    """
+    Copy the templates used by the raw objects to the matching configuration objects,
+    as a store_use attribute
+
+    :param raw_objects: raw objects list
+    :param index: configuration objects indexed with the same key (see index_by)
+    :type index: dict
+    :param key: function returning the key of an object
+    :param only_defined: only copy the raw objects use attribute if it is defined
+    :type only_defined: bool
+    :return: None
+    """
+    for raw_object in raw_objects:
+        try:
+            conf_objects = index.get(key(raw_object), [])
+        except (AttributeError, TypeError):
+            continue
+        if not conf_objects:
+            continue
+        if only_defined and not getattr(raw_object, 'use', None):
+            continue
+        for conf_object in conf_objects:
+            setattr(conf_object, 'store_use', raw_object.use)
+
+
+def split_command_call(command_call, cache=None):
+    """
+    Split a command call string (command_name!arg1!arg2) as command name and arguments
+
+    An escaped exclamation mark (\\!) is not an arguments separator, it is kept as an
+    exclamation mark in the argument.
+
+    The same command calls are used by many objects, so the result is stored in the cache
+    dictionary, if it is provided, to split each command call only once.
+
+    :param command_call: command call
+    :type command_call: str
+    :param cache: command call -> split command call
+    :type cache: dict
+    :return: command name and arguments list
+    :rtype: tuple
+    """
+    if cache is not None and command_call in cache:
+        c_command, c_params = cache[command_call]
+        return c_command, list(c_params)
+
+    c_call = command_call.replace(r'\!', '___PROTECT_EXCLAMATION___')
+    tab = c_call.split('!')
+    c_command = tab[0].strip()
+    c_params = [s.replace('___PROTECT_EXCLAMATION___', '!') for s in tab[1:]]
+    if cache is not None:
+        cache[command_call] = (c_command, tuple(c_params))
+    return c_command, c_params
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Loading of the Alignak configuration
+
+The Arbiter reads and parses the configuration files once. The raw objects it parsed (the
+objects properties as they are written in the files, with their `use` templates) are captured
+while it loads the configuration, rather than reading and parsing the files again.
+"""
+from timeit import default_timer
+
+
+class ParsingCapture(object):  # pylint: disable=useless-object-inheritance
+    """
+    Capture the raw objects parsed by a configuration class, and the reading and parsing
+    durations
+
+    The configuration class methods are only replaced in the `with` block.
+    """
+    methods = ['read_legacy_cfg_files', 'read_config_buf']
+
+    def __init__(self, config_class):
+        """
+        :param config_class: configuration class (Alignak Config)
+        :type config_class: type
+        """
+        self.config_class = config_class
+        self.raw_objects = None
+        self.durations = dict((name, 0.0) for name in self.methods)
+        self.originals = {}
+
+    def __enter__(self):
+        for name in self.methods:
+            if name not in vars(self.config_class):
+                continue
+            self.originals[name] = vars(self.config_class)[name]
+            setattr(self.config_class, name, self.get_wrapper(name, self.originals[name]))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for name, original in self.originals.items():
+            setattr(self.config_class, name, original)
+        self.originals = {}
+        return False
+
+    def get_wrapper(self, name, original):
+        """
+        Get a configuration method that measures its duration and keeps the first parsed
+        raw objects
+
+        :param name: method name
+        :type name: str
+        :param original: configuration method
+        :type original: function
+        :return: wrapped method
+        :rtype: function
+        """
+        def wrapper(config, *args, **kwargs):
+            """Call the configuration method"""
+            start = default_timer()
+            result = original(config, *args, **kwargs)
+            self.durations[name] += default_timer() - start
+            if name == 'read_config_buf' and self.raw_objects is None:
+                self.raw_objects = result
+            return result
+        return wrapper
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Messages of the importation
+
+The messages are logged with the standard logging module: a message is only formatted if its
+level is enabled, thus the messages that are not displayed cost almost nothing. Each importation
+phase has its own logger, so that its messages level can be set apart.
+
+The progress of an importation phase is displayed on a line sampled in time, rather than with a
+line for each imported element.
+"""
+import sys
+import logging
+
+from timeit import default_timer
+
+# Very verbose messages
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+LEVELS = {
+    'error': logging.ERROR,
+    'warning': logging.WARNING,
+    'info': logging.INFO,
+    'debug': logging.DEBUG,
+    'trace': TRACE
+}
+
+LOGGER_NAME = 'alignak_backend_import'
+
+
+def parse_levels(levels):
+    """
+    Parse the messages levels of some importation phases
+
+    :param levels: phase=level list, comma separated (eg. host=debug,service=warning)
+    :type levels: str
+    :return: phase name -> logging level
+    :rtype: dict
+    :raise ValueError: if a level is not a known level
+    """
+    result = {}
+    for phase_level in (levels or '').split(','):
+        if not phase_level.strip():
+            continue
+        phase, dummy, level = phase_level.partition('=')
+        if level.strip().lower() not in LEVELS:
+            raise ValueError("unknown level '%s' for the phase '%s'" % (level, phase))
+        result[phase.strip()] = LEVELS[level.strip().lower()]
+    return result
+
+
+def setup_logger(level=logging.INFO, log_file=None, phases_levels=None):
+    """
+    Set up the importation logger
+
+    The messages are displayed on the standard output and, if log_file is set, written to
+    this file with their date and level.
+
+    :param level: messages level
+    :type level: int
+    :param log_file: file to write the messages to
+    :type log_file: str
+    :param phases_levels: messages level of some importation phases (see parse_levels)
+    :type phases_levels: dict
+    :return: importation logger
+    :rtype: logging.Logger
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    if log_file:
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter('[%(asctime)s] %(levelname)s: %(name)s: '
+                                               '%(message)s'))
+        logger.addHandler(handler)
+
+    for phase, phase_level in (phases_levels or {}).items():
+        get_phase_logger(phase).setLevel(phase_level)
+    return logger
+
+
+def get_phase_logger(phase):
+    """
+    Get the logger of an importation phase
+
+    :param phase: importation phase name
+    :type phase: str
+    :return: phase logger
+    :rtype: logging.Logger
+    """
+    return logging.getLogger('%s.%s' % (LOGGER_NAME, phase))
+
+
+class Progress(object):  # pylint: disable=useless-object-inheritance
+    """
+    Progress of the importation of the elements of a resource
+    """
+    def __init__(self, logger, name, total=None, interval=5.0):
+        """
+        :param logger: logger of the progress line
+        :type logger: logging.Logger
+        :param name: name of the imported elements
+        :type name: str
+        :param total: count of the elements to import, if known
+        :type total: int
+        :param interval: minimum duration between two progress lines, in seconds
+        :type interval: float
+        """
+        self.logger = logger
+        self.name = name
+        self.total = total
+        self.interval = interval
+        self.count = 0
+        self.start = default_timer()
+        self.next = self.start + interval
+
+    def update(self, count=1):
+        """
+        Count imported elements, and display the progress line if it was not displayed since
+        the interval
+
+        :param count: count of imported elements
+        :type count: int
+        :return: None
+        """
+        self.count += count
+        now = default_timer()
+        if now >= self.next:
+            self.next = now + self.interval
+            self.log(now)
+
+    def done(self):
+        """
+        Display the final progress line
+
+        :return: None
+        """
+        if self.count:
+            self.log(default_timer())
+
+    def log(self, now):
+        """
+        Display the progress line
+
+        :param now: current time
+        :type now: float
+        :return: None
+        """
+        rate = self.count / max(now - self.start, 0.001)
+        if self.total:
+            self.logger.info("%s: %d/%d elements (%d%%), %.1f elements/s",
+                             self.name, self.count, self.total,
+                             100 * self.count // self.total, rate)
+        else:
+            self.logger.info("%s: %d elements, %.1f elements/s", self.name, self.count, rate)
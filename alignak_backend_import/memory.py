@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Memory usage of the importation
+
+A memory checkpoint is taken at each importation stage or phase end. Each checkpoint reports the
+peak resident memory of the process and, with the tracemalloc module (Python 3), the memory
+allocated since the previous checkpoint (net growth), the peak of the allocated memory and the
+source lines that allocated the most since the previous checkpoint.
+
+Tracing the memory allocations slows down the importation, thus it is only enabled on demand.
+"""
+import sys
+import threading
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover, Python 2
+    tracemalloc = None
+
+try:
+    import resource
+except ImportError:  # pragma: no cover, Windows
+    resource = None
+
+
+def get_peak_rss():
+    """
+    Get the peak resident memory of the process
+
+    :return: peak resident memory in bytes, None if it can not be measured
+    :rtype: int
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes, except on macOS
+    if sys.platform != 'darwin':
+        peak *= 1024
+    return peak
+
+
+def format_size(size):
+    """
+    Format a memory size
+
+    :param size: size in bytes, may be negative
+    :type size: int
+    :return: formatted size (eg. 12.5 MiB)
+    :rtype: str
+    """
+    if size is None:
+        return 'n/a'
+    value = float(size)
+    for unit in ['B', 'KiB', 'MiB']:
+        if abs(value) < 1024:
+            return "%.1f %s" % (value, unit)
+        value /= 1024
+    return "%.1f GiB" % value
+
+
+class MemoryTracker(object):  # pylint: disable=useless-object-inheritance
+    """
+    Memory checkpoints of the importation
+    """
+    def __init__(self, top=5):
+        """
+        :param top: count of the allocation sites reported for each checkpoint
+        :type top: int
+        """
+        self._lock = threading.Lock()
+        self.top = top
+        self.checkpoints = []
+        # Allocated size by source line, at the previous checkpoint
+        self.sizes = {}
+        self.traced = tracemalloc is not None
+
+    def start(self):
+        """
+        Start tracing the memory allocations
+
+        :return: None
+        """
+        if self.traced and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.sizes = self.get_sizes()
+
+    def stop(self):
+        """
+        Stop tracing the memory allocations
+
+        :return: None
+        """
+        if self.traced and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def get_sizes(self):
+        """
+        Get the allocated memory size by source line
+
+        :return: "file:line" -> allocated size in bytes
+        :rtype: dict
+        """
+        if not self.traced or not tracemalloc.is_tracing():
+            return {}
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ])
+        sizes = {}
+        for stat in snapshot.statistics('lineno'):
+            frame = stat.traceback[0]
+            sizes['%s:%d' % (frame.filename, frame.lineno)] = stat.size
+        return sizes
+
+    def checkpoint(self, name):
+        """
+        Take a memory checkpoint
+
+        :param name: name of the stage or phase that ends
+        :type name: str
+        :return: checkpoint: name, peak resident memory, net growth, traced memory peak and
+        top allocation sites (site, size difference) since the previous checkpoint
+        :rtype: dict
+        """
+        with self._lock:
+            checkpoint = {'name': name, 'peak_rss': get_peak_rss(), 'growth': None,
+                          'traced_peak': None, 'top': []}
+            if self.traced and tracemalloc.is_tracing():
+                # The peak before the snapshot, that allocates memory too
+                checkpoint['traced_peak'] = tracemalloc.get_traced_memory()[1]
+                sizes = self.get_sizes()
+                growth = {}
+                for site in set(sizes) | set(self.sizes):
+                    difference = sizes.get(site, 0) - self.sizes.get(site, 0)
+                    if difference:
+                        growth[site] = difference
+                checkpoint['growth'] = sum(growth.values())
+                if hasattr(tracemalloc, 'reset_peak'):
+                    tracemalloc.reset_peak()
+                checkpoint['top'] = sorted(growth.items(),
+                                           key=lambda item: -abs(item[1]))[:self.top]
+                self.sizes = sizes
+            self.checkpoints.append(checkpoint)
+            return checkpoint
+
+    def get_lines(self):
+        """
+        Get the checkpoints as text lines
+
+        :return: lines list
+        :rtype: list
+        """
+        lines = []
+        for checkpoint in self.checkpoints:
+            line = "%s: peak RSS %s" % (checkpoint['name'], format_size(checkpoint['peak_rss']))
+            if checkpoint['growth'] is not None:
+                line += ", net growth %s, traced peak %s" % (
+                    format_size(checkpoint['growth']), format_size(checkpoint['traced_peak']))
+            lines.append(line)
+            for site, size in checkpoint['top']:
+                lines.append("  %s: %s" % (site, format_size(size)))
+        if not self.traced:
+            lines.append("The allocations are not traced (tracemalloc requires Python 3)")
+        return lines
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Backend requests metrics
+
+Each backend request is accounted by HTTP method and backend resource: requests count, errors
+count, bytes sent and received, and the request latency in an histogram. The histogram buckets
+grow exponentially, thus the histogram size does not depend on the requests count and the
+latency percentiles are known with a bounded relative error (less than 10%).
+"""
+import json
+import math
+import threading
+
+# Upper bound of the first bucket (seconds) and buckets growth factor
+FIRST_BUCKET = 0.0005
+GROWTH = 2 ** 0.125
+
+
+class LatencyHistogram(object):  # pylint: disable=useless-object-inheritance
+    """
+    Requests latencies histogram, with exponential buckets
+    """
+    def __init__(self):
+        # bucket index -> latencies count
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    @staticmethod
+    def get_bucket(latency):
+        """
+        Get the bucket of a latency
+
+        :param latency: latency, in seconds
+        :type latency: float
+        :return: bucket index
+        :rtype: int
+        """
+        if latency <= FIRST_BUCKET:
+            return 0
+        return int(math.ceil(math.log(latency / FIRST_BUCKET, GROWTH)))
+
+    @staticmethod
+    def get_bound(bucket):
+        """
+        Get the upper bound of a bucket
+
+        :param bucket: bucket index
+        :type bucket: int
+        :return: latency upper bound, in seconds
+        :rtype: float
+        """
+        return FIRST_BUCKET * GROWTH ** bucket
+
+    def add(self, latency):
+        """
+        Add a latency
+
+        :param latency: latency, in seconds
+        :type latency: float
+        :return: None
+        """
+        bucket = self.get_bucket(latency)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += latency
+        self.maximum = max(self.maximum, latency)
+
+    def get_percentile(self, percent):
+        """
+        Get a latency percentile: the upper bound of the bucket of the percentile latency,
+        but not more than the maximum latency
+
+        :param percent: percentile (eg. 95)
+        :type percent: float
+        :return: latency, in seconds, 0 if there is no latency
+        :rtype: float
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(self.count * percent / 100.0)))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.get_bound(bucket), self.maximum)
+        return self.maximum
+
+    def to_dict(self):
+        """
+        Get the histogram as a dictionary
+
+        :return: latencies count, mean, maximum, percentiles and buckets (upper bound, count)
+        :rtype: dict
+        """
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.maximum,
+            'p50': self.get_percentile(50),
+            'p95': self.get_percentile(95),
+            'p99': self.get_percentile(99),
+            'buckets': [[self.get_bound(bucket), self.buckets[bucket]]
+                        for bucket in sorted(self.buckets)]
+        }
+
+
+class RequestsMetrics(object):  # pylint: disable=useless-object-inheritance
+    """
+    Thread-safe backend requests metrics, by HTTP method and backend resource
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (method, resource) -> counters
+        self.endpoints = {}
+
+    def record(self, method, resource, latency, sent=0, received=0, error=False):
+        # pylint: disable=too-many-arguments
+        """
+        Account a backend request
+
+        :param method: HTTP method
+        :type method: str
+        :param resource: backend resource
+        :type resource: str
+        :param latency: duration of the request, until its response is received, in seconds
+        :type latency: float
+        :param sent: request body size, in bytes
+        :type sent: int
+        :param received: response body size, in bytes
+        :type received: int
+        :param error: the request failed or the backend responded with an error
+        :type error: bool
+        :return: None
+        """
+        with self._lock:
+            endpoint = self.endpoints.get((method, resource))
+            if endpoint is None:
+                endpoint = {'requests': 0, 'errors': 0, 'sent': 0, 'received': 0,
+                            'latency': LatencyHistogram()}
+                self.endpoints[(method, resource)] = endpoint
+            endpoint['requests'] += 1
+            endpoint['errors'] += 1 if error else 0
+            endpoint['sent'] += sent
+            endpoint['received'] += received
+            endpoint['latency'].add(latency)
+
+    def get_report(self):
+        """
+        Get the metrics of each endpoint
+
+        :return: endpoints metrics list, sorted by method and resource
+        :rtype: list
+        """
+        with self._lock:
+            return [{
+                'method': method, 'resource': resource,
+                'requests': endpoint['requests'], 'errors': endpoint['errors'],
+                'sent': endpoint['sent'], 'received': endpoint['received'],
+                'latency': endpoint['latency'].to_dict()
+            } for (method, resource), endpoint in sorted(self.endpoints.items(),
+                                                         key=lambda item: item[0])]
+
+    def get_lines(self):
+        """
+        Get the metrics of each endpoint as text lines
+
+        :return: lines list
+        :rtype: list
+        """
+        return ["%s %s: %d requests, %d errors, sent %d bytes, received %d bytes, "
+                "latency p50 %.1fms, p95 %.1fms, p99 %.1fms, max %.1fms"
+                % (endpoint['method'], endpoint['resource'] or '/', endpoint['requests'],
+                   endpoint['errors'], endpoint['sent'], endpoint['received'],
+                   1000 * endpoint['latency']['p50'], 1000 * endpoint['latency']['p95'],
+                   1000 * endpoint['latency']['p99'], 1000 * endpoint['latency']['max'])
+                for endpoint in self.get_report()]
+
+    def write_report(self, file_name):
+        """
+        Write the metrics to a JSON file
+
+        :param file_name: report file name
+        :type file_name: str
+        :return: None
+        """
+        with open(file_name, 'w') as report_file:
+            json.dump(self.get_report(), report_file, indent=2, sort_keys=True)
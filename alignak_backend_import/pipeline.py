@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Transformation of the Alignak configuration objects to backend elements
+
+The transformation of the objects of a resource is a list of steps selected once for the
+resource. Each object is then transformed by running these steps in order, without checking
+again which transformations apply to the resource.
+"""
+from timeit import default_timer
+
+
+class Pipeline(object):  # pylint: disable=useless-object-inheritance
+    """
+    Ordered transformation steps, with their timing counters
+    """
+    def __init__(self, steps):
+        """
+        Each step is a function receiving the element and the run arguments. It returns the
+        transformed element, or None if the element must not be imported; the next steps
+        are then not run.
+
+        :param steps: (step name, function) list
+        :type steps: list
+        """
+        self.steps = list(steps)
+        self.calls = dict((name, 0) for name, dummy in self.steps)
+        self.durations = dict((name, 0.0) for name, dummy in self.steps)
+
+    def run(self, item, *args):
+        """
+        Transform an element
+
+        :param item: element
+        :param args: other arguments of the steps
+        :return: transformed element or None if the element must not be imported
+        """
+        for name, step in self.steps:
+            start = default_timer()
+            item = step(item, *args)
+            self.durations[name] += default_timer() - start
+            self.calls[name] += 1
+            if item is None:
+                return None
+        return item
+
+    def get_stats(self):
+        """
+        Get the timing counters of the steps, the longest step first
+
+        :return: (step name, calls count, duration) list
+        :rtype: list
+        """
+        return sorted([(name, self.calls[name], self.durations[name])
+                       for name, dummy in self.steps], key=lambda stat: -stat[2])
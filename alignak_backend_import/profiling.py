@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Profiling of the importation
+
+The importation stages (configuration loading, templates, backend cleaning...) and the
+importation phases are measured in timing spans: wall time, CPU time, objects count and backend
+requests count. The spans are gathered in a JSON report, by stage, by phase and by resource.
+
+The CPU time is the time of the thread running the span when the Python version can measure it
+(Python 3.7+), else the time of the whole process.
+"""
+import json
+import time
+import threading
+
+from timeit import default_timer
+
+
+def get_cpu_time(thread=True):
+    """
+    Get the CPU time of the current thread, or of the process
+
+    :param thread: CPU time of the current thread, if it can be measured
+    :type thread: bool
+    :return: CPU time, in seconds
+    :rtype: float
+    """
+    if thread and hasattr(time, 'thread_time'):
+        return time.thread_time()
+    if hasattr(time, 'process_time'):
+        return time.process_time()
+    return time.clock()  # pylint: disable=no-member
+
+
+class Span(object):  # pylint: disable=useless-object-inheritance
+    """
+    A measured part of the importation
+    """
+    def __init__(self, profiler, name, kind, resource=None, objects=None):
+        # pylint: disable=too-many-arguments
+        """
+        :param profiler: profiler the span is reported to
+        :type profiler: Profiler
+        :param name: span name
+        :type name: str
+        :param kind: span kind: stage, phase or step (part of a phase)
+        :type kind: str
+        :param resource: backend resource of the span, if any
+        :type resource: str
+        :param objects: objects count of the span, if any
+        :type objects: int
+        """
+        self.profiler = profiler
+        self.values = {
+            'name': name, 'kind': kind, 'resource': resource, 'objects': objects,
+            'wall_time': 0.0, 'cpu_time': 0.0, 'requests': 0
+        }
+        self.started = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    def start(self):
+        """
+        Start measuring the span
+
+        :return: the span
+        :rtype: Span
+        """
+        self.started = (default_timer(), get_cpu_time(),
+                        self.profiler.get_requests(self.values['resource']))
+        return self
+
+    def stop(self):
+        """
+        Stop measuring the span and report it to the profiler
+
+        :return: span values
+        :rtype: dict
+        """
+        self.values['wall_time'] = default_timer() - self.started[0]
+        self.values['cpu_time'] = get_cpu_time() - self.started[1]
+        requests = self.profiler.get_requests(self.values['resource'])
+        self.values['requests'] = requests - self.started[2]
+        self.profiler.add(self.values)
+        return self.values
+
+
+class Profiler(object):  # pylint: disable=useless-object-inheritance
+    """
+    Timing spans of the importation
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.start = default_timer()
+        self.cpu_start = get_cpu_time(thread=False)
+        self.spans = []
+        # Backend requests counter (see session.ConnectionsCounter), once connected
+        self.counter = None
+        # Memory checkpoints at the end of the stages and phases (see memory.MemoryTracker)
+        self.memory = None
+
+    def get_requests(self, resource=None):
+        """
+        Get the count of the backend requests sent
+
+        :param resource: backend resource, None for all the resources
+        :type resource: str
+        :return: requests count
+        :rtype: int
+        """
+        if self.counter is None:
+            return 0
+        return self.counter.get_requests(resource)
+
+    def span(self, name, kind='stage', resource=None, objects=None):
+        """
+        Get a timing span, measured in a `with` block or between its start and stop
+
+        The requests of a span with a resource are the requests sent for this resource while
+        the span runs, else all the requests sent while the span runs.
+
+        :param name: span name
+        :type name: str
+        :param kind: span kind: stage, phase or step (part of a phase)
+        :type kind: str
+        :param resource: backend resource of the span, if any
+        :type resource: str
+        :param objects: objects count of the span, if any
+        :type objects: int
+        :return: span
+        :rtype: Span
+        """
+        return Span(self, name, kind, resource, objects)
+
+    def add(self, values):
+        """
+        Add a measured span, with a memory checkpoint if it is a stage or a phase and the
+        memory is tracked
+
+        :param values: span values
+        :type values: dict
+        :return: None
+        """
+        values = dict(values)
+        if self.memory is not None and values['kind'] in ['stage', 'phase']:
+            values['memory'] = self.memory.checkpoint(values['name'])
+        with self._lock:
+            self.spans.append(values)
+
+    def get_report(self):
+        """
+        Get the profiling report
+
+        :return: report with the total times, the stages, phases and steps spans and the
+        phases values summed by resource
+        :rtype: dict
+        """
+        with self._lock:
+            spans = list(self.spans)
+        resources = {}
+        for span in spans:
+            if span['kind'] != 'phase' or span['resource'] is None:
+                continue
+            resource = resources.setdefault(span['resource'], {
+                'phases': [], 'wall_time': 0.0, 'cpu_time': 0.0, 'objects': 0, 'requests': 0
+            })
+            resource['phases'].append(span['name'])
+            for key in ['wall_time', 'cpu_time', 'objects', 'requests']:
+                resource[key] += span[key] or 0
+        for name, resource in resources.items():
+            resource['total_requests'] = self.get_requests(name)
+        return {
+            'wall_time': default_timer() - self.start,
+            'cpu_time': get_cpu_time(thread=False) - self.cpu_start,
+            'requests': self.get_requests(),
+            'stages': [span for span in spans if span['kind'] == 'stage'],
+            'phases': [span for span in spans if span['kind'] == 'phase'],
+            'steps': [span for span in spans if span['kind'] == 'step'],
+            'resources': resources
+        }
+
+    def write_report(self, file_name):
+        """
+        Write the profiling report to a JSON file
+
+        :param file_name: report file name
+        :type file_name: str
+        :return: report
+        :rtype: dict
+        """
+        report = self.get_report()
+        with open(file_name, 'w') as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+        return report
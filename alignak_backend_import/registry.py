@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Registry of the objects that exist in the Alignak backend
+
+The registry maps each known backend object _id to its name and maintains the reverse indexes
+(name, Alignak uuid and, for the services, host and name), so that resolving a link from a name
+or an uuid is a dictionary lookup rather than a scan of all the already imported objects.
+"""
+
+
+class ObjectsRegistry(object):  # pylint: disable=useless-object-inheritance
+    """
+    Bidirectional registry of the backend objects, per resource type:
+    - _id -> name
+    - name -> _id and Alignak uuid -> _id
+    - (host _id, name) -> _id for the resources attached to an host (services)
+    """
+
+    def __init__(self):
+        self._names = {}
+        self._by_name = {}
+        self._by_uuid = {}
+        self._by_host_name = {}
+
+    def __contains__(self, resource):
+        return resource in self._names
+
+    def __len__(self):
+        return len(self._names)
+
+    def resources(self):
+        """
+        Get the sorted list of the registered resources
+
+        :return: resources names list
+        :rtype: list
+        """
+        return sorted(self._names)
+
+    def count(self, resource):
+        """
+        Get the number of registered objects for a resource
+
+        :param resource: resource name (command, user, host...)
+        :type resource: str
+        :return: objects count
+        :rtype: int
+        """
+        return len(self._names.get(resource, {}))
+
+    def init(self, resource):
+        """
+        Prepare the indexes of a resource, clearing them if they still exist
+
+        :param resource: resource name (command, user, host...)
+        :type resource: str
+        :return: None
+        """
+        self._names[resource] = {}
+        self._by_name[resource] = {}
+        self._by_uuid[resource] = {}
+        self._by_host_name[resource] = {}
+
+    def register(self, resource, _id, name, uuid=None, host=None):
+        # pylint: disable=too-many-arguments
+        """
+        Register a backend object
+
+        When several objects share the same name (or uuid), the first registered one is
+        returned when resolving this name.
+
+        :param resource: resource name (command, user, host...)
+        :type resource: str
+        :param _id: backend object identifier
+        :type _id: str
+        :param name: object name
+        :type name: str
+        :param uuid: Alignak object uuid
+        :type uuid: str
+        :param host: backend _id of the host the object is attached to (services)
+        :type host: str
+        :return: None
+        """
+        if resource not in self._names:
+            self.init(resource)
+
+        self._names[resource][_id] = name
+        self._by_name[resource].setdefault(name, _id)
+        if uuid is not None:
+            self._by_uuid[resource].setdefault(uuid, _id)
+        if host is not None:
+            try:
+                self._by_host_name[resource].setdefault((host, name), _id)
+            except TypeError:
+                # Unhashable host (list of hosts templates...)
+                pass
+
+    def get_name(self, resource, _id, default=None):
+        """
+        Get the name of a registered object
+
+        :param resource: resource name (command, user, host...)
+        :type resource: str
+        :param _id: backend object identifier
+        :type _id: str
+        :param default: value returned if the object is not registered
+        :return: object name
+        :rtype: str
+        """
+        try:
+            return self._names[resource].get(_id, default)
+        except (KeyError, TypeError):
+            return default
+
+    def resolve(self, resource, value, by_id=True):
+        """
+        Get the backend _id of an object from its _id, its name or its Alignak uuid
+
+        The value is searched for, in this order, as a backend _id (if by_id is set),
+        an object name and an Alignak uuid.
+
+        :param resource: resource name (command, user, host...)
+        :type resource: str
+        :param value: searched value
+        :type value: str
+        :param by_id: consider the value as a possible backend _id
+        :type by_id: bool
+        :return: backend _id or None if the object is not registered
+        :rtype: str
+        """
+        if resource not in self._names:
+            return None
+        try:
+            if by_id and value in self._names[resource]:
+                return value
+            if value in self._by_name[resource]:
+                return self._by_name[resource][value]
+            return self._by_uuid[resource].get(value)
+        except TypeError:
+            # Unhashable value (list, set...)
+            return None
+
+    def get_by_host(self, resource, host, name):
+        """
+        Get the backend _id of an object attached to an host (eg. a service)
+
+        :param resource: resource name (service...)
+        :type resource: str
+        :param host: host backend _id
+        :type host: str
+        :param name: object name
+        :type name: str
+        :return: backend _id or None if the object is not registered
+        :rtype: str
+        """
+        try:
+            return self._by_host_name.get(resource, {}).get((host, name))
+        except TypeError:
+            return None
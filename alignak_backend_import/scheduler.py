@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Importation phases scheduler
+
+The importation is made of phases (realms, commands, hosts templates, hosts...). Each phase
+provides a backend resource and uses some other resources to create its links. The scheduler
+builds the dependency graph of the phases and runs the independent phases concurrently.
+"""
+import threading
+
+
+class ImportPhase(object):  # pylint: disable=useless-object-inheritance, too-few-public-methods
+    """
+    An importation phase
+    """
+    def __init__(self, name, function, provides=None, uses=None, requires=None, weight=1):
+        # pylint: disable=too-many-arguments
+        self.name = name
+        self.function = function
+        self.provides = provides
+        self.uses = uses or []
+        self.requires = list(requires or [])
+        self.weight = weight
+
+
+class PhasesScheduler(object):  # pylint: disable=useless-object-inheritance
+    """
+    Build the dependency graph of the importation phases and run them
+
+    The dependencies are built from the resources provided and used by the phases. When a phase
+    uses a resource provided by another phase:
+    - if this other phase is declared before, the phase requires this other phase
+    - else, the other phase requires the phase
+
+    This keeps the declaration order between the phases that share a resource, so the links
+    that can be resolved when an element is created are the same as when all the phases are
+    run one after the other, in the declaration order.
+    """
+    def __init__(self):
+        self.phases = []
+        self._phases = {}
+
+    def add(self, name, function, provides=None, uses=None, requires=None, weight=1):
+        # pylint: disable=too-many-arguments
+        """
+        Declare a phase
+
+        :param name: phase name
+        :type name: str
+        :param function: function called to run the phase
+        :param provides: resource provided by the phase
+        :type provides: str
+        :param uses: resources used by the phase
+        :type uses: list
+        :param requires: names of the phases that must be run before this phase
+        :type requires: list
+        :param weight: estimated phase cost (eg. elements count)
+        :type weight: int
+        :return: None
+        """
+        if name in self._phases:
+            raise ValueError("Duplicate phase: %s" % name)
+        phase = ImportPhase(name, function, provides, uses, requires, weight)
+        self.phases.append(phase)
+        self._phases[name] = phase
+
+    def get_requirements(self):
+        """
+        Get the requirements of each phase
+
+        :return: phase name -> list of the required phases names
+        :rtype: dict
+        """
+        requirements = {}
+        for phase in self.phases:
+            requirements[phase.name] = list(phase.requires)
+            for required in phase.requires:
+                if required not in self._phases:
+                    raise ValueError("Unknown phase %s required by %s" % (required, phase.name))
+
+        for index, phase in enumerate(self.phases):
+            for other_index, other in enumerate(self.phases):
+                if other is phase or other.provides is None or other.provides not in phase.uses:
+                    continue
+                if other_index < index:
+                    if other.name not in requirements[phase.name]:
+                        requirements[phase.name].append(other.name)
+                elif phase.name not in requirements[other.name]:
+                    requirements[other.name].append(phase.name)
+        return requirements
+
+    def get_order(self):
+        """
+        Get a topological order of the phases, keeping the declaration order when possible
+
+        :return: phases names list
+        :rtype: list
+        """
+        requirements = self.get_requirements()
+        order = []
+        done = set()
+        while len(order) < len(self.phases):
+            todo = [phase.name for phase in self.phases if phase.name not in done]
+            ready = [name for name in todo
+                     if all(required in done for required in requirements[name])]
+            if not ready:
+                raise ValueError("Cyclic dependency between the phases: %s"
+                                 % ', '.join(todo))
+            order.append(ready[0])
+            done.add(ready[0])
+        return order
+
+    def get_levels(self):
+        """
+        Get the phases grouped by level: the phases of a level only require phases
+        of the previous levels and they may run concurrently
+
+        :return: list of phases names lists
+        :rtype: list
+        """
+        requirements = self.get_requirements()
+        level = {}
+        for name in self.get_order():
+            level[name] = 1 + max([level[required] for required in requirements[name]] or [-1])
+        levels = [[] for dummy in range(max(level.values()) + 1)] if level else []
+        for phase in self.phases:
+            levels[level[phase.name]].append(phase.name)
+        return levels
+
+    def get_critical_path(self):
+        """
+        Get the heaviest chain of dependent phases
+
+        :return: (phases names list, total weight)
+        :rtype: tuple
+        """
+        requirements = self.get_requirements()
+        cost = {}
+        previous = {}
+        for name in self.get_order():
+            cost[name] = self._phases[name].weight
+            previous[name] = None
+            for required in requirements[name]:
+                if cost[required] + self._phases[name].weight > cost[name]:
+                    cost[name] = cost[required] + self._phases[name].weight
+                    previous[name] = required
+        if not cost:
+            return ([], 0)
+
+        name = max(self.get_order(), key=lambda phase_name: cost[phase_name])
+        total = cost[name]
+        path = []
+        while name is not None:
+            path.insert(0, name)
+            name = previous[name]
+        return (path, total)
+
+    def get_plan(self):
+        """
+        Get the importation plan as text lines
+
+        :return: lines list
+        :rtype: list
+        """
+        requirements = self.get_requirements()
+        lines = []
+        for index, names in enumerate(self.get_levels()):
+            lines.append("Level %d:" % index)
+            for name in names:
+                lines.append("- %s (weight: %d), requires: %s"
+                             % (name, self._phases[name].weight,
+                                ', '.join(requirements[name]) or 'none'))
+        path, total = self.get_critical_path()
+        lines.append("Critical path (weight: %d): %s" % (total, ' -> '.join(path)))
+        lines.append("Total weight: %d" % sum(phase.weight for phase in self.phases))
+        return lines
+
+    def run(self, workers=1):
+        """
+        Run all the phases
+
+        With one worker, the phases are run one after the other in the topological order.
+        Else, each phase is run in its own thread as soon as all its required phases are
+        finished, with at most workers phases running at the same time.
+
+        If a phase raises an exception (including SystemExit), no more phases are started and
+        the first exception is raised again once the running phases are finished.
+
+        :param workers: maximum number of phases running concurrently
+        :type workers: int
+        :return: None
+        """
+        order = self.get_order()
+        if workers <= 1:
+            for name in order:
+                self._phases[name].function()
+            return
+
+        requirements = self.get_requirements()
+        condition = threading.Condition()
+        started = set()
+        running = set()
+        done = set()
+        errors = []
+
+        def run_phase(name):
+            """Run a phase in a thread"""
+            try:
+                self._phases[name].function()
+            except BaseException as exp:  # pylint: disable=broad-except
+                with condition:
+                    errors.append(exp)
+            finally:
+                with condition:
+                    running.discard(name)
+                    done.add(name)
+                    condition.notify_all()
+
+        with condition:
+            while True:
+                if not errors:
+                    for name in order:
+                        if len(running) >= workers:
+                            break
+                        if name in started:
+                            continue
+                        if not all(required in done for required in requirements[name]):
+                            continue
+                        started.add(name)
+                        running.add(name)
+                        thread = threading.Thread(target=run_phase, args=(name,),
+                                                  name='import-%s' % name)
+                        thread.daemon = True
+                        thread.start()
+                if not running:
+                    break
+                condition.wait()
+
+        if errors:
+            raise errors[0]
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (C) 2015-2018: Alignak team, see AUTHORS.txt file for contributors
+#
+# This file is part of Alignak Backend Import.
+#
+# Alignak Backend Import is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Alignak Backend Import is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Alignak Backend Import.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Pooled HTTP session for the Alignak backend client
+
+The backend client sends all its requests through its requests session. This module replaces
+this session with a session that uses connection pools of a defined size, may limit the number
+of requests sent concurrently and counts the new and the reused connections.
+"""
+import threading
+
+from timeit import default_timer
+
+import requests
+from six import binary_type, text_type
+from six.moves.urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from alignak_backend_import.metrics import RequestsMetrics
+
+
+class ConnectionsCounter(object):  # pylint: disable=useless-object-inheritance
+    """
+    Thread-safe counters of the HTTP requests and connections
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new = 0
+        self.reused = 0
+        self.resources = {}
+        # Requests metrics by method and resource
+        self.metrics = RequestsMetrics()
+
+    def count_request(self, resource=None):
+        """
+        Count a sent request
+
+        :param resource: backend resource of the request
+        :type resource: str
+        :return: None
+        """
+        with self._lock:
+            self.requests += 1
+            if resource is not None:
+                self.resources[resource] = self.resources.get(resource, 0) + 1
+
+    def get_requests(self, resource=None):
+        """
+        Get the count of the sent requests
+
+        :param resource: backend resource, None for all the resources
+        :type resource: str
+        :return: requests count
+        :rtype: int
+        """
+        with self._lock:
+            if resource is None:
+                return self.requests
+            return self.resources.get(resource, 0)
+
+    def count_connection(self, new):
+        """
+        Count a connection got from a pool
+
+        :param new: True if the connection is not yet connected
+        :type new: bool
+        :return: None
+        """
+        with self._lock:
+            if new:
+                self.new += 1
+            else:
+                self.reused += 1
+
+    def get_stats(self):
+        """
+        Get the counters values
+
+        :return: requests, new connections and reused connections count
+        :rtype: dict
+        """
+        with self._lock:
+            return {'requests': self.requests, 'new': self.new, 'reused': self.reused}
+
+
+def counting_pool_class(pool_class, counter):
+    """
+    Get a connection pool class that counts the new and the reused connections
+
+    A connection got from the pool without a socket is a new one, it will be connected
+    when the request is sent.
+
+    :param pool_class: urllib3 connection pool class
+    :param counter: connections counter
+    :type counter: ConnectionsCounter
+    :return: connection pool class
+    """
+    def _get_conn(self, timeout=None):
+        """Get a connection from the pool and count it"""
+        conn = pool_class._get_conn(self, timeout=timeout)  # pylint: disable=protected-access
+        counter.count_connection(getattr(conn, 'sock', None) is None)
+        return conn
+
+    return type('Counting%s' % pool_class.__name__, (pool_class,), {'_get_conn': _get_conn})
+
+
+def get_resource(url, root_path=''):
+    """
+    Get the backend resource of a request URL: the first part of the URL path after the
+    backend root path
+
+    :param url: request URL
+    :type url: str
+    :param root_path: backend root path (eg. /backend)
+    :type root_path: str
+    :return: resource name
+    :rtype: str
+    """
+    path = urlparse(url).path
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    return path.strip('/').split('/')[0]
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter that counts the requests and the connections
+    """
+    def __init__(self, counter, root_path='', **kwargs):
+        self.counter = counter
+        self.root_path = root_path
+        super(PooledHTTPAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """
+        Initialize the pool manager with the counting connection pools
+
+        :return: None
+        """
+        super(PooledHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': counting_pool_class(HTTPConnectionPool, self.counter),
+            'https': counting_pool_class(HTTPSConnectionPool, self.counter)
+        }
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """
+        Send a request, count it and record its metrics
+
+        The latency is measured until the response body is received, unless the response is
+        streamed.
+
+        :return: requests.Response
+        """
+        resource = get_resource(request.url, self.root_path)
+        self.counter.count_request(resource)
+        sent = 0
+        if isinstance(request.body, (binary_type, text_type)):
+            sent = len(request.body)
+        start = default_timer()
+        try:
+            response = super(PooledHTTPAdapter, self).send(request, **kwargs)
+            received = 0
+            if not kwargs.get('stream'):
+                received = len(response.content or b'')
+        except Exception:
+            self.counter.metrics.record(request.method, resource, default_timer() - start,
+                                        sent, 0, error=True)
+            raise
+        self.counter.metrics.record(request.method, resource, default_timer() - start, sent,
+                                    received, error=response.status_code >= 400)
+        return response
+
+
+def setup_session(backend, pool_size=10, keep_alive=True, connect_timeout=None,
+                  read_timeout=None, max_in_flight=0):
+    # pylint: disable=too-many-arguments
+    """
+    Replace the session of a backend client with a pooled session
+
+    The retry policy of the former session is kept. When the in-flight requests are limited,
+    the pool holds at most max_in_flight connections and a request waits for a free connection
+    before being sent.
+
+    :param backend: backend client
+    :type backend: alignak_backend_client.client.Backend
+    :param pool_size: number of connections kept alive per backend host
+    :type pool_size: int
+    :param keep_alive: keep the connections alive between the requests
+    :type keep_alive: bool
+    :param connect_timeout: connection timeout (seconds), None for no timeout
+    :type connect_timeout: float
+    :param read_timeout: response timeout (seconds), None for no timeout
+    :type read_timeout: float
+    :param max_in_flight: maximum number of requests sent concurrently, 0 for no limit
+    :type max_in_flight: int
+    :return: connections counter of the session
+    :rtype: ConnectionsCounter
+    """
+    counter = ConnectionsCounter()
+    root_path = urlparse(getattr(backend, 'url_endpoint_root', '') or '').path.rstrip('/')
+    session = requests.Session()
+    for prefix in ['http://', 'https://']:
+        max_retries = 0
+        if backend.session is not None:
+            max_retries = backend.session.get_adapter(prefix).max_retries
+        session.mount(prefix, PooledHTTPAdapter(counter, root_path, max_retries=max_retries,
+                                                pool_maxsize=max_in_flight or pool_size,
+                                                pool_block=max_in_flight > 0))
+    if backend.session is not None:
+        backend.session.close()
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    backend.session = session
+
+    if connect_timeout is not None or read_timeout is not None:
+        backend.timeout = (connect_timeout, read_timeout)
+
+    return counter
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest2
+
+from alignak_backend_import.cache import ConfigurationCache, get_cfg_files
+
+
+class TestCache(unittest2.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.folder, 'objects', 'hosts'))
+        self.main = self.write('alignak.cfg', 'cfg_dir=objects\ncfg_file=commands.cfg\n')
+        self.write('commands.cfg', 'define command {\n}\n')
+        self.host = self.write(os.path.join('objects', 'hosts', 'host_1.cfg'), 'define host {\n}\n')
+        self.write(os.path.join('objects', 'hosts', 'README'), 'Not a configuration file')
+        self.cache_dir = os.path.join(self.folder, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def write(self, name, content):
+        file_name = os.path.join(self.folder, name)
+        with open(file_name, 'w') as cfg:
+            cfg.write(content)
+        return file_name
+
+    def test_cfg_files(self):
+        self.assertEqual(get_cfg_files([self.main]),
+                         [self.main, self.host, os.path.join(self.folder, 'commands.cfg')])
+
+    def test_hit_and_miss(self):
+        cache = ConfigurationCache([self.main], '2.1.5', self.cache_dir)
+        self.assertIsNone(cache.load())
+        cache.save({'conf': ['host_1']})
+
+        # Same files
+        cache = ConfigurationCache([self.main], '2.1.5', self.cache_dir)
+        self.assertEqual(cache.load(), {'conf': ['host_1']})
+
+        # Another Alignak version
+        self.assertIsNone(ConfigurationCache([self.main], '2.1.6', self.cache_dir).load())
+
+        # A changed file
+        self.write(os.path.join('objects', 'hosts', 'host_1.cfg'), 'define host {\n }\n')
+        self.assertIsNone(ConfigurationCache([self.main], '2.1.5', self.cache_dir).load())
+
+        # A new file
+        cache = ConfigurationCache([self.main], '2.1.5', self.cache_dir)
+        cache.save({'conf': ['host_1']})
+        self.write(os.path.join('objects', 'host_2.cfg'), 'define host {\n}\n')
+        self.assertIsNone(ConfigurationCache([self.main], '2.1.5', self.cache_dir).load())
+
+    def test_corrupted(self):
+        cache = ConfigurationCache([self.main], '2.1.5', self.cache_dir)
+        cache.save({'conf': ['host_1']})
+        with open(cache.cache_file, 'r+b') as cache_file:
+            cache_file.truncate(20)
+        self.assertIsNone(ConfigurationCache([self.main], '2.1.5', self.cache_dir).load())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import json
+import time
+import unittest2
+
+from alignak_backend_import.extractors import Extractor
+
+
+class Item(object):
+    properties = dict(('prop_%d' % idx, None) for idx in range(150))
+    properties.update({'host_name': None, 'register': None, 'imported_from': None})
+
+    def __init__(self, idx):
+        for prop in self.properties:
+            setattr(self, prop, 'value %d' % idx)
+
+
+class TestExtractors(unittest2.TestCase):
+
+    def test_extract(self):
+        item = Item(1)
+        del item.prop_2
+        extractor = Extractor(Item.properties, {'prop_1': {}, 'prop_2': {}, 'prop_3': {}},
+                              keep=['prop_4'])
+        self.assertEqual(sorted(extractor.names),
+                         ['host_name', 'prop_1', 'prop_2', 'prop_3', 'prop_4'])
+        self.assertEqual(extractor(Item(0)), {'host_name': 'value 0', 'prop_1': 'value 0',
+                                              'prop_2': 'value 0', 'prop_3': 'value 0',
+                                              'prop_4': 'value 0'})
+        # Undefined properties are ignored
+        self.assertEqual(extractor(item), {'host_name': 'value 1', 'prop_1': 'value 1',
+                                           'prop_3': 'value 1', 'prop_4': 'value 1'})
+        self.assertEqual(extractor(Item(2))['prop_2'], 'value 2')
+
+        # Schema allowing unknown fields
+        self.assertEqual(len(Extractor(Item.properties)(Item(0))), len(Item.properties))
+
+    def test_benchmark(self):
+        """Extract the properties of 20k objects"""
+        count = 20000
+        items = [Item(idx) for idx in range(count)]
+        fields = dict(('prop_%d' % idx, {}) for idx in range(0, 150, 5))
+
+        start = time.time()
+        for item_obj in items:
+            item = {}
+            for prop in list(item_obj.properties.keys()) + ['store_use']:
+                if not hasattr(item_obj, prop):
+                    continue
+                item[prop] = getattr(item_obj, prop)
+        all_duration = time.time() - start
+        all_size = len(json.dumps(item))
+
+        start = time.time()
+        extractor = Extractor(list(Item.properties.keys()) + ['store_use'], fields)
+        for item_obj in items:
+            item = extractor(item_obj)
+        duration = time.time() - start
+        size = len(json.dumps(item))
+
+        print("Properties of %d objects: all %.3fs (%d bytes), extracted %.3fs (%d bytes)"
+              % (count, all_duration, all_size, duration, size))
+        self.assertEqual(len(item), 31)
+        self.assertLess(duration, all_duration)
+        self.assertLess(size, all_size)
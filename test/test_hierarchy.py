@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+import unittest2
+
+from operator import itemgetter
+
+from alignak_backend_import.hierarchy import Hierarchy, sort_by_requirements
+
+
+def build(groups, first_parent=False):
+    groups = [{'name': name, 'members': members} for name, members in groups]
+    return Hierarchy(groups, itemgetter('name'), itemgetter('members'), first_parent)
+
+
+class TestHierarchy(unittest2.TestCase):
+
+    def test_parents(self):
+        hierarchy = build([('all', ['linux', 'windows']),
+                           ('linux', ['debian', 'unknown']),
+                           ('windows', []),
+                           ('debian', None),
+                           ('servers', ['debian'])])
+        parents = dict((group['name'], parent['name'] if parent else None)
+                       for group, parent in hierarchy)
+        self.assertEqual(parents, {'all': None, 'linux': 'all', 'windows': 'all',
+                                   'debian': 'servers', 'servers': None})
+
+        hierarchy = build([('all', ['linux', 'windows']),
+                           ('linux', ['debian']),
+                           ('windows', []),
+                           ('debian', []),
+                           ('servers', ['debian'])], first_parent=True)
+        parents = dict((group['name'], parent['name'] if parent else None)
+                       for group, parent in hierarchy)
+        self.assertEqual(parents['debian'], 'linux')
+
+    def test_order(self):
+        hierarchy = build([('debian', []),
+                           ('linux', ['debian']),
+                           ('windows', []),
+                           ('all', ['linux', 'windows'])])
+        ordered, cyclic = hierarchy.get_order()
+        self.assertEqual([group['name'] for group in ordered],
+                         ['all', 'linux', 'windows', 'debian'])
+        self.assertEqual(cyclic, [])
+
+    def test_cycle(self):
+        hierarchy = build([('a', ['b']), ('b', ['a']), ('c', ['d']), ('d', []), ('e', ['e'])])
+        ordered, cyclic = hierarchy.get_order()
+        self.assertEqual([group['name'] for group in ordered], ['c', 'd'])
+        self.assertEqual([group['name'] for group in cyclic], ['a', 'b', 'e'])
+
+    def test_sort_templates(self):
+        templates = [{'name': 'linux-server', 'use': ['generic-host', 'linux']},
+                     {'name': 'windows-server', 'use': 'generic-host, windows'},
+                     {'name': 'linux', 'use': ['unknown']},
+                     {'name': 'generic-host', 'use': []},
+                     {'name': 'windows'},
+                     {'name': 'loop-1', 'use': ['loop-2']},
+                     {'name': 'loop-2', 'use': ['loop-1']},
+                     {'name': 'in-loop', 'use': ['loop-1']}]
+        ordered, cyclic = sort_by_requirements(templates, itemgetter('name'),
+                                               lambda template: template.get('use'))
+        self.assertEqual([template['name'] for template in ordered],
+                         ['linux', 'generic-host', 'linux-server', 'windows', 'windows-server'])
+        self.assertEqual([template['name'] for template in cyclic],
+                         ['loop-1', 'loop-2', 'in-loop'])
+
+    def test_sort_hosts_levels(self):
+        hosts = [{'name': 'server', 'parents': ['switch']},
+                 {'name': 'switch', 'parents': ['router']},
+                 {'name': 'router', 'parents': []},
+                 {'name': 'printer', 'parents': ['switch']},
+                 {'name': 'gateway'},
+                 {'name': 'a', 'parents': ['b']},
+                 {'name': 'b', 'parents': ['a']}]
+        ordered, cyclic = sort_by_requirements(hosts, itemgetter('name'),
+                                               lambda host: host.get('parents'), levels=True)
+        self.assertEqual([host['name'] for host in ordered],
+                         ['router', 'gateway', 'switch', 'server', 'printer'])
+        self.assertEqual([host['name'] for host in cyclic], ['a', 'b'])
+
+    def test_scaling(self):
+        """Build the hierarchy of 100k groups"""
+        count = 100000
+        groups = [('group_%d' % idx, ['group_%d' % (idx * 2 + 1), 'group_%d' % (idx * 2 + 2)])
+                  for idx in range(count)]
+        start = time.time()
+        ordered, cyclic = build(groups).get_order()
+        duration = time.time() - start
+        print("Hierarchy of %d groups: %.3fs" % (count, duration))
+        self.assertEqual(len(ordered), count)
+        self.assertEqual(cyclic, [])
+        self.assertLess(duration, 2.0)
@@ -0,0 +1,611 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Importation steps tested with a fake backend, without an Alignak configuration
+"""
+
+from __future__ import print_function
+
+import time
+import threading
+import unittest2
+
+from logging import WARNING
+from multiprocessing.pool import ThreadPool
+
+from alignak_backend_client.client import BackendException
+
+from alignak_backend_import.cfg_to_backend import CfgToBackend
+from alignak_backend_import.logs import setup_logger
+from alignak_backend_import.profiling import Profiler
+from alignak_backend_import.registry import ObjectsRegistry
+
+
+class AlignakObject(object):
+    def __init__(self, uuid):
+        self.uuid = uuid
+
+
+class FakeBackend(object):
+    """Backend client recording the requests"""
+    def __init__(self, items=None):
+        # resource -> elements got from the backend
+        self.items = items or {}
+        self.requests = []
+        # names of the elements rejected by the backend
+        self.invalid = []
+        self.lock = threading.Lock()
+
+    def get(self, endpoint, params=None):
+        with self.lock:
+            self.requests.append(('get', endpoint, params))
+        items = self.items.get(endpoint, [])
+        return {'_items': items, '_meta': {'total': len(items), 'max_results': 50}}
+
+    def post(self, endpoint, data, headers=None):
+        with self.lock:
+            self.requests.append(('post', endpoint, data))
+        elements = data if isinstance(data, list) else [data]
+        if [element for element in elements if element.get('name') in self.invalid]:
+            raise BackendException(422, 'Insertion failure', {'_status': 'ERR'})
+        responses = [{'_id': 'id_%s' % element.get('name', element.get('user')),
+                      '_etag': 'etag_%s' % element.get('name', element.get('user'))}
+                     for element in elements]
+        return {'_items': responses} if isinstance(data, list) else responses[0]
+
+    def delete(self, endpoint, headers):
+        with self.lock:
+            self.requests.append(('delete', endpoint))
+        self.items.pop(endpoint, None)
+        return {}
+
+    def patch(self, endpoint, data, headers=None, inception=False):
+        with self.lock:
+            self.requests.append(('patch', endpoint, dict(data), dict(headers or {})))
+        return {'_status': 'OK', '_id': endpoint.split('/')[-1], '_etag': 'etag_patched'}
+
+
+def get_importer(backend=None):
+    """Get an importer connected to a fake backend, without loading any configuration"""
+    importer = CfgToBackend.__new__(CfgToBackend)
+    importer.result = True
+    importer.errors_found = []
+    importer.later = {}
+    importer.inserted = ObjectsRegistry()
+    importer.ignored = {}
+    importer.updated = {}
+    importer.unchanged = {}
+    importer.current = threading.local()
+    importer.current.pending = []
+    importer.current.resource = None
+    importer.current.existing = None
+    importer.pool = None
+    importer.profiler = Profiler()
+    importer.logger = setup_logger(WARNING)
+    importer.current.logger = importer.logger
+    importer.backend = backend or FakeBackend()
+    importer.dry_run = False
+    importer.destroy_backend_data = False
+    importer.update_backend_data = False
+    importer.allow_duplicates = False
+    importer.batch_size = 10
+    importer.workers = 1
+    return importer
+
+
+class TestExisting(unittest2.TestCase):
+
+    def setUp(self):
+        # The service http only exists on the host A
+        self.backend = FakeBackend({'service': [
+            {'_id': 'svc_a', '_etag': 'etag_a', 'name': 'http', 'host': 'host_a',
+             'check_interval': 5}
+        ]})
+        self.importer = get_importer(self.backend)
+        self.importer.current.resource = ('service', [], False)
+
+    def test_update(self):
+        """In update mode, the service of the host B is created, the one of the host A is not
+        moved to the host B"""
+        importer = self.importer
+        importer.update_backend_data = True
+        importer.current.existing = importer.get_existing('service')
+        self.assertEqual(list(importer.current.existing), [('host_a', 'http')])
+
+        importer.import_element('service', {'name': 'http', 'host': 'host_a',
+                                            'check_interval': 10},
+                                AlignakObject('uuid_a'), {})
+        importer.import_element('service', {'name': 'http', 'host': 'host_b',
+                                            'check_interval': 10},
+                                AlignakObject('uuid_b'), {})
+
+        # Only the service of the host A is patched, with its own etag
+        patches = [request for request in self.backend.requests if request[0] == 'patch']
+        self.assertEqual(len(patches), 1)
+        self.assertEqual(patches[0][1], 'service/svc_a')
+        self.assertEqual(patches[0][2], {'check_interval': 10})
+        self.assertEqual(patches[0][3]['If-Match'], 'etag_a')
+        self.assertEqual(importer.updated, {'service': {'http': {'check_interval': 10}}})
+
+        # The service of the host B waits to be posted
+        self.assertEqual([item['host'] for item, dummy, dummy in importer.current.pending],
+                         ['host_b'])
+        self.assertEqual(importer.inserted.get_by_host('service', 'host_a', 'http'), 'svc_a')
+        self.assertIsNone(importer.inserted.get_by_host('service', 'host_b', 'http'))
+
+    def test_duplicate(self):
+        """With duplicates allowed, the service of the host A is ignored, the one of the host B
+        is created and not registered with the host A service identifier"""
+        importer = self.importer
+        importer.allow_duplicates = True
+        importer.current.existing = importer.get_existing('service', {'name': 1, 'host': 1})
+
+        importer.import_element('service', {'name': 'http', 'host': 'host_a'},
+                                AlignakObject('uuid_a'), {})
+        importer.import_element('service', {'name': 'http', 'host': 'host_b'},
+                                AlignakObject('uuid_b'), {})
+
+        self.assertEqual(list(importer.ignored['service']), ['http'])
+        self.assertEqual(importer.ignored['service']['http']['host'], 'host_a')
+        self.assertEqual([item['host'] for item, dummy, dummy in importer.current.pending],
+                         ['host_b'])
+        self.assertEqual(importer.inserted.resolve('service', 'uuid_a'), 'svc_a')
+        self.assertIsNone(importer.inserted.resolve('service', 'uuid_b'))
+        self.assertFalse([request for request in self.backend.requests
+                          if request[0] == 'patch'])
+
+    def test_user_password(self):
+        """An unchanged user is not patched, its password is stored hashed by the backend"""
+        backend = FakeBackend({'user': [
+            {'_id': 'user_1', '_etag': 'etag_1', 'name': 'admin', 'email': 'admin@localhost',
+             'password': 'pbkdf2:sha256:50000$salt$hash'}
+        ]})
+        importer = get_importer(backend)
+        importer.current.resource = ('user', [], False)
+        importer.update_backend_data = True
+        importer.current.existing = importer.get_existing('user')
+
+        importer.import_element('user', {'name': 'admin', 'email': 'admin@localhost',
+                                         'password': 'NOPASSWORDSET'},
+                                AlignakObject('uuid_1'), {})
+        self.assertEqual([request for request in backend.requests if request[0] == 'patch'],
+                         [])
+        self.assertEqual(importer.unchanged, {'user': 1})
+        self.assertEqual(importer.updated, {})
+
+        # A modified user is patched without its password
+        importer.import_element('user', {'name': 'admin', 'email': 'admin@example.com',
+                                         'password': 'secret'},
+                                AlignakObject('uuid_1'), {})
+        patches = [request for request in backend.requests if request[0] == 'patch']
+        self.assertEqual([patch[1:3] for patch in patches],
+                         [('user/user_1', {'email': 'admin@example.com'})])
+
+    def test_unknown_host(self):
+        """A service which host is not resolved is not matched with another host service"""
+        importer = self.importer
+        importer.current.existing = importer.get_existing('service')
+        self.assertIsNone(importer.find_existing('service', {'name': 'http'}))
+        self.assertIsNone(importer.find_existing('service', {'name': 'http',
+                                                             'host': ['tpl_1']}))
+
+
+class TestBatches(unittest2.TestCase):
+
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.importer = get_importer(self.backend)
+        self.importer.batch_size = 3
+        data_later = [{'field': 'parents', 'type': 'list', 'resource': 'host', 'now': False}]
+        self.importer.current.resource = ('host', data_later, False)
+        self.importer.later = {'host': {'parents': {}}}
+
+    def add_hosts(self, names):
+        for name in names:
+            later_tmp = {'parents': ['router']} if name == 'host_2' else {}
+            self.importer.current.pending.append(({'name': name}, AlignakObject('uuid_' + name),
+                                                  later_tmp))
+
+    def get_posts(self):
+        return [request[1:] for request in self.backend.requests if request[0] == 'post']
+
+    def test_list_post(self):
+        """The responses of a posted list are mapped back to the posted elements"""
+        self.add_hosts(['host_1', 'host_2', 'host_3'])
+        self.importer.flush_pending()
+
+        self.assertEqual(self.get_posts(), [
+            ('host', [{'name': 'host_1'}, {'name': 'host_2'}, {'name': 'host_3'}])
+        ])
+        self.assertEqual(self.importer.current.pending, [])
+        for name in ['host_1', 'host_2', 'host_3']:
+            self.assertEqual(self.importer.inserted.resolve('host', name), 'id_' + name)
+            self.assertEqual(self.importer.inserted.resolve('host', 'uuid_' + name),
+                             'id_' + name)
+        self.assertEqual(self.importer.later['host']['parents'], {
+            'id_host_2': {'type': 'list', 'resource': 'host', 'value': ['router'],
+                          '_etag': 'etag_host_2'}
+        })
+
+    def test_single_element(self):
+        """A single element is posted alone, and its response is not a list"""
+        self.add_hosts(['host_1', 'host_2', 'host_3', 'host_4'])
+        self.importer.flush_pending()
+
+        self.assertEqual(self.get_posts(), [
+            ('host', [{'name': 'host_1'}, {'name': 'host_2'}, {'name': 'host_3'}]),
+            ('host', {'name': 'host_4'})
+        ])
+        self.assertEqual(self.importer.inserted.resolve('host', 'host_4'), 'id_host_4')
+
+    def test_rejected_element(self):
+        """A rejected list is split until the invalid element is isolated"""
+        self.importer.batch_size = 4
+        self.backend.invalid = ['bad']
+        self.add_hosts(['host_1', 'host_2', 'bad', 'host_4'])
+        with self.assertRaises(SystemExit) as context:
+            self.importer.flush_pending()
+        self.assertEqual(context.exception.code, 5)
+
+        self.assertEqual([[element['name'] for element in data]
+                          if isinstance(data, list) else data['name']
+                          for dummy, data in self.get_posts()],
+                         [['host_1', 'host_2', 'bad', 'host_4'], ['host_1', 'host_2'],
+                          ['bad', 'host_4'], 'bad', 'host_4'])
+        for name in ['host_1', 'host_2', 'host_4']:
+            self.assertEqual(self.importer.inserted.resolve('host', name), 'id_' + name)
+        self.assertIsNone(self.importer.inserted.resolve('host', 'bad'))
+
+    def test_users_roles(self):
+        """A restriction role is posted for each user of a batch"""
+        self.importer.current.resource = ('user', [], False)
+        for name in ['user_1', 'user_2']:
+            self.importer.current.pending.append(({'name': name, '_realm': 'realm_1'},
+                                                  AlignakObject('uuid_' + name), {}))
+        self.importer.flush_pending()
+
+        self.assertEqual(self.get_posts(), [
+            ('user', [{'name': 'user_1', '_realm': 'realm_1'},
+                      {'name': 'user_2', '_realm': 'realm_1'}]),
+            ('userrestrictrole', {'user': 'id_user_1', 'realm': 'realm_1', 'sub_realm': True,
+                                  'resource': '*', 'crud': ['read']}),
+            ('userrestrictrole', {'user': 'id_user_2', 'realm': 'realm_1', 'sub_realm': True,
+                                  'resource': '*', 'crud': ['read']})
+        ])
+
+    def test_resolve_pending(self):
+        """The current batch is only posted to resolve one of its elements"""
+        self.add_hosts(['host_1', 'host_2'])
+        self.assertIsNone(self.importer.resolve_link('host', 'unknown'))
+        self.assertEqual(self.get_posts(), [])
+        self.assertEqual(len(self.importer.current.pending), 2)
+
+        self.assertEqual(self.importer.resolve_link('host', 'uuid_host_2'), 'id_host_2')
+        self.assertEqual(len(self.get_posts()), 1)
+        self.assertEqual(self.importer.current.pending, [])
+
+
+class TestServiceLinks(unittest2.TestCase):
+
+    def setUp(self):
+        self.importer = get_importer()
+        self.importer.current.linked = 0
+        for name in ['host_a', 'host_b']:
+            self.importer.inserted.register('host', 'id_' + name, name, 'uuid_' + name)
+            self.importer.inserted.register('service', 'id_http_' + name, 'http',
+                                            'uuid_http_' + name, host='id_' + name)
+
+    def link(self, phase_name, item):
+        """Resolve the list links of an element as the importation phase does"""
+        phase = [phase for phase in self.importer.get_import_phases()
+                 if phase['name'] == phase_name][0]
+        self.importer.current.resource = (phase['resource'], phase['data_later'], False)
+        later_tmp = {}
+        for link in phase['data_later']:
+            if link['type'] == 'list':
+                item = self.importer.link_list(link, False, item, None, later_tmp)
+        return item, later_tmp
+
+    def test_dependency(self):
+        """The services are searched for on the dependency hosts"""
+        item, later_tmp = self.link('servicedependency', {
+            'name': 'dep', 'hosts': ['host_b'], 'services': ['http'],
+            'dependent_hosts': ['host_a'], 'dependent_services': ['http']
+        })
+        self.assertEqual(later_tmp, {})
+        self.assertEqual(item['services'], ['id_http_host_b'])
+        self.assertEqual(item['dependent_services'], ['id_http_host_a'])
+
+    def test_escalation(self):
+        """The escalation hosts are resolved before its services"""
+        item, dummy = self.link('serviceescalation', {
+            'escalation_name': 'esc', 'hosts': ['host_b'], 'services': ['http'],
+            'hostgroups': [], 'users': [], 'usergroups': []
+        })
+        self.assertEqual(item['services'], ['id_http_host_b'])
+
+        # Linked with their uuid, without hosts
+        item, dummy = self.link('serviceescalation', {
+            'escalation_name': 'esc', 'hosts': [], 'services': ['uuid_http_host_b'],
+            'hostgroups': [], 'users': [], 'usergroups': []
+        })
+        self.assertEqual(item['services'], ['id_http_host_b'])
+
+
+class TestDelete(unittest2.TestCase):
+
+    def test_levels(self):
+        """The resources are deleted level by level, the resources of a level concurrently"""
+        backend = FakeBackend()
+        importer = get_importer(backend)
+        importer.pool = ThreadPool(4)
+        try:
+            importer.delete_data()
+        finally:
+            importer.pool.close()
+            importer.pool.join()
+
+        deleted = [request[1] for request in backend.requests if request[0] == 'delete']
+        levels = [['realm'], ['command', 'timeperiod'],
+                  ['user', 'usergroup', 'host', 'hostdependency', 'hostgroup', 'hostescalation',
+                   'service', 'servicedependency', 'servicegroup', 'serviceescalation',
+                   'livesynthesis', 'actionacknowledge', 'actiondowntime', 'actionforcecheck'],
+                  ['userrestrictrole'], ['alignakretention']]
+        start = 0
+        for level in levels:
+            self.assertEqual(sorted(deleted[start:start + len(level)]), sorted(level))
+            start += len(level)
+        self.assertEqual(len(deleted), start)
+
+        # Each resource deletion is checked with a count only request
+        for resource in deleted[:-1]:
+            self.assertIn(('get', resource, {'max_results': 1}), backend.requests)
+
+    def test_remaining(self):
+        """The remaining elements count is the total of a single element page"""
+        backend = FakeBackend({'realm': [{'_id': 'id_all', 'name': 'All'}]})
+        importer = get_importer(backend)
+        importer.dry_run = True
+        self.assertEqual(importer.delete_resource('realm'), 1)
+        self.assertEqual(backend.requests, [('get', 'realm', {'max_results': 1})])
+
+
+class TestDateranges(unittest2.TestCase):
+
+    def test_timeperiods(self):
+        """The dateranges are stored by timeperiod name, a timeperiod may have no dateranges"""
+        importer = get_importer()
+        importer.raw_objects = {'timeperiod': [
+            {'timeperiod_name': ['workhours'], 'alias': ['Work hours'],
+             'monday': ['09:00-17:00'], 'tuesday': ['09:00-12:00', '14:00-17:00'],
+             'december': ['25             00:00-00:00']},
+            {'timeperiod_name': ['none'], 'alias': ['No time']},
+            {'name': ['template'], 'register': ['0'], 'sunday': ['00:00-24:00']}
+        ]}
+        importer.recompose_dateranges()
+
+        self.assertEqual(sorted(importer.dateranges), ['none', 'workhours'])
+        self.assertEqual(importer.dateranges['none'], [])
+        self.assertEqual(sorted(importer.dateranges['workhours'], key=lambda daterange:
+                                sorted(daterange.items())), [
+            {'december 25': '00:00-00:00'},
+            {'monday': '09:00-17:00'},
+            {'tuesday': '09:00-12:00'},
+            {'tuesday': '14:00-17:00'}
+        ])
+
+        # The converted timeperiods get their dateranges
+        source = importer.convert_objects({'timeperiod_name': 'workhours', 'dateranges': []})
+        self.assertEqual(len(source['dateranges']), 4)
+        source = importer.convert_objects({'timeperiod_name': 'none',
+                                          'dateranges': [{'monday': '00:00-24:00'}]})
+        self.assertEqual(source['dateranges'], [])
+
+
+class TestUpdateLater(unittest2.TestCase):
+
+    def test_merged_fields(self):
+        """The links of an element are updated with a single patch, with the tracked _etag"""
+        backend = FakeBackend()
+        importer = get_importer(backend)
+        for resource, name in [('host', 'host_1'), ('host', 'host_2'), ('host', 'router'),
+                               ('timeperiod', '24x7')]:
+            importer.inserted.register(resource, 'id_' + name, name, 'uuid_' + name)
+        importer.later = {'host': {
+            'parents': {
+                'id_host_1': {'type': 'list', 'resource': 'host', 'value': ['router'],
+                              '_etag': 'etag_host_1'},
+                'id_host_2': {'type': 'list', 'resource': 'host', 'value': 'router, host_1',
+                              '_etag': 'etag_host_2'}
+            },
+            'check_period': {
+                'id_host_1': {'type': 'simple', 'resource': 'timeperiod', 'value': '24x7',
+                              '_etag': 'etag_host_1'}
+            },
+            'notification_period': {
+                'id_host_2': {'type': 'simple', 'resource': 'timeperiod', 'value': '24x7',
+                              '_etag': 'etag_host_2'}
+            }
+        }}
+
+        importer.update_later('host', ['parents', 'check_period'])
+
+        patches = sorted(request[1:] for request in backend.requests if request[0] == 'patch')
+        self.assertEqual([(endpoint, data, headers['If-Match'])
+                          for endpoint, data, headers in patches], [
+            ('host/id_host_1', {'parents': ['id_router'], 'check_period': 'id_24x7'},
+             'etag_host_1'),
+            ('host/id_host_2', {'parents': ['id_router', 'id_host_1']}, 'etag_host_2')
+        ])
+        self.assertEqual([request for request in backend.requests if request[0] == 'get'], [])
+        self.assertEqual(importer.errors_found, [])
+
+        # The updated links are removed, the element etag is updated for its other links
+        self.assertEqual(importer.later['host']['parents'], {})
+        self.assertEqual(importer.later['host']['check_period'], {})
+        self.assertEqual(importer.later['host']['notification_period']['id_host_2']['_etag'],
+                         'etag_patched')
+
+
+class TestWorkers(unittest2.TestCase):
+
+    def setUp(self):
+        self.importer = get_importer()
+        self.importer.batch_size = 2
+        self.importer.workers = 4
+        self.importer.pool = ThreadPool(4)
+        data_later = [{'field': 'parents', 'type': 'list', 'resource': 'host', 'now': False}]
+        self.importer.current.resource = ('host', data_later, False)
+        self.importer.later = {'host': {'parents': {}}}
+        for idx in range(8):
+            name = 'host_%d' % idx
+            self.importer.current.pending.append(({'name': name}, AlignakObject('uuid_' + name),
+                                                  {'parents': ['router_%d' % idx]}))
+
+        # Batches threads, first elements of the batches as they finish and exit threads
+        self.threads = []
+        self.finished = []
+        self.exits = []
+
+        def send_batch(r_name, batch):
+            """The first batches respond last, the batch of host_4 fails"""
+            names = [item['name'] for item, dummy, dummy in batch]
+            time.sleep(0.05 * (4 - int(names[0].split('_')[1]) // 2))
+            self.threads.append(threading.current_thread())
+            self.finished.append(names[0])
+            if 'host_4' in names:
+                return (None, None, ("# Post/patch error for: %s : %s" % (r_name, names),
+                                     BackendException(500, 'Server error')))
+            return ([{'_id': 'id_' + name, '_etag': 'etag_' + name} for name in names], [],
+                    None)
+
+        def exit_importer(code):
+            self.exits.append((threading.current_thread(), code))
+            raise SystemExit(code)
+
+        self.importer.send_batch = send_batch
+        self.importer.exit = exit_importer
+
+    def tearDown(self):
+        self.importer.pool.close()
+        self.importer.pool.join()
+
+    def test_failed_batch(self):
+        """The batches are posted by the workers, the failed batch makes the importation exit
+        from the calling thread once all the batches are managed"""
+        with self.assertRaises(SystemExit):
+            self.importer.flush_pending()
+
+        self.assertEqual(self.finished, ['host_6', 'host_4', 'host_2', 'host_0'])
+        self.assertEqual(len(self.threads), 4)
+        self.assertNotIn(threading.current_thread(), self.threads)
+        self.assertEqual(self.exits, [(threading.current_thread(), 5)])
+
+        # The elements of the other batches are registered with their later links
+        for idx in [0, 1, 2, 3, 6, 7]:
+            self.assertEqual(self.importer.inserted.resolve('host', 'host_%d' % idx),
+                             'id_host_%d' % idx)
+        for idx in [4, 5]:
+            self.assertIsNone(self.importer.inserted.resolve('host', 'host_%d' % idx))
+        self.assertEqual(sorted(self.importer.later['host']['parents']),
+                         ['id_host_%d' % idx for idx in [0, 1, 2, 3, 6, 7]])
+        for idx in [0, 1, 2, 3, 6, 7]:
+            self.assertEqual(self.importer.later['host']['parents']['id_host_%d' % idx], {
+                'type': 'list', 'resource': 'host', 'value': ['router_%d' % idx],
+                '_etag': 'etag_host_%d' % idx
+            })
+        self.assertEqual(self.importer.current.pending, [])
+
+
+class SlowConfiguration(object):
+    """Alignak configuration which objects lists are slowly iterated"""
+    def __init__(self, **lists):
+        self.lists = lists
+
+    def __getattr__(self, name):
+        if name not in self.__dict__.get('lists', {}):
+            raise AttributeError(name)
+
+        def iterate():
+            for element in self.lists[name]:
+                time.sleep(0.001)
+                yield element
+        return iterate()
+
+
+class Command(object):
+    def __init__(self, command_name):
+        self.command_name = command_name
+        self.uuid = 'uuid_%s' % command_name
+
+
+class NotificationWay(object):
+    def __init__(self, name):
+        self.notificationway_name = name
+        self.uuid = 'uuid_%s' % name
+        self.host_notifications_enabled = True
+        self.service_notifications_enabled = True
+        self.host_notification_options = ['d', 'u', 'r']
+        self.service_notification_options = ['w', 'c', 'r']
+        self.min_business_impact = 0
+        self.host_notification_period = 'al_24x7'
+        self.service_notification_period = None
+
+    def get_name(self):
+        return self.notificationway_name
+
+
+class TestConcurrentIndexes(unittest2.TestCase):
+
+    def run_threads(self, function, count=8):
+        results = []
+        lock = threading.Lock()
+
+        def run():
+            result = function()
+            with lock:
+                results.append(result)
+        threads = [threading.Thread(target=run) for dummy in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_commands(self):
+        """The commands are resolved while the commands index is built in another thread"""
+        importer = get_importer()
+        importer.commands_index = None
+        importer.command_calls = {}
+        importer.alignak_conf = SlowConfiguration(
+            commands=[Command('cmd_%d' % idx) for idx in range(20)])
+
+        results = self.run_threads(lambda: importer.recompose_commands('cmd_19!arg'))
+        self.assertEqual(results, [[('uuid_cmd_19', 'cmd_19', ['arg'])]] * 8)
+        self.assertEqual(len(importer.commands_index), 20)
+
+    def test_notification_ways(self):
+        """The notification ways and their properties are got while they are indexed in
+        another thread"""
+        importer = get_importer()
+        importer.notificationways_index = None
+        importer.notificationways = {}
+        importer.al_always, importer.al_none, importer.al_never = 'al_24x7', None, 'al_never'
+        importer.tp_always, importer.tp_never = 'tp_24x7', 'tp_never'
+        importer.alignak_conf = SlowConfiguration(
+            notificationways=[NotificationWay('nw_%d' % idx) for idx in range(20)])
+
+        def get_properties():
+            nw = importer.get_notification_way('nw_19')
+            return importer.notificationways[nw.uuid]['host_notification_period']
+
+        self.assertEqual(self.run_threads(get_properties), ['tp_24x7'] * 8)
+        self.assertEqual(importer.get_notification_way('uuid_nw_0').get_name(), 'nw_0')
+        self.assertIsNone(importer.get_notification_way(['unhashable']))
+        self.assertEqual(importer.notificationways['uuid_nw_0']['service_notification_period'],
+                         'tp_never')
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+import unittest2
+
+from operator import attrgetter
+
+from alignak_backend_import.indexes import index_by, copy_use, split_command_call
+
+
+class Item(object):
+    def __init__(self, **kwargs):
+        for key in kwargs:
+            setattr(self, key, kwargs[key])
+
+
+class TestIndexes(unittest2.TestCase):
+
+    def test_index_by(self):
+        items = [Item(host_name='host_1'), Item(host_name='host_2'), Item(host_name='host_1'),
+                 Item(name='no host name'), Item(host_name=['unhashable'])]
+        index = index_by(items, attrgetter('host_name'))
+        self.assertEqual(sorted(index), ['host_1', 'host_2'])
+        self.assertEqual(index['host_1'], [items[0], items[2]])
+
+    def test_copy_use(self):
+        raw = [Item(contact_name='user_1', use=['tpl_1']),
+               Item(contact_name='user_2', use=[]),
+               Item(contact_name='user_3', use=['tpl_3'])]
+        conf = [Item(contact_name='user_1'), Item(contact_name='user_2'),
+                Item(contact_name='user_2')]
+        index = index_by(conf, attrgetter('contact_name'))
+
+        copy_use(raw, index, attrgetter('contact_name'), only_defined=True)
+        self.assertEqual(conf[0].store_use, ['tpl_1'])
+        self.assertFalse(hasattr(conf[1], 'store_use'))
+
+        copy_use(raw, index, attrgetter('contact_name'))
+        self.assertEqual(conf[1].store_use, [])
+        self.assertEqual(conf[2].store_use, [])
+
+    def test_services_benchmark(self):
+        """Match 100k raw services with 100k configuration services"""
+        count = 100000
+        raw = [Item(service_description='svc_%d' % (idx % 100), host='host_%d' % (idx // 100),
+                    use=['tpl_%d' % (idx % 10)]) for idx in range(count)]
+        conf = [Item(service_description='svc_%d' % (idx % 100), host='host_%d' % (idx // 100))
+                for idx in range(count)]
+
+        start = time.time()
+        key = attrgetter('service_description', 'host')
+        copy_use(raw, index_by(conf, key), key)
+        duration = time.time() - start
+        print("Services templates for %d services: %.3fs" % (count, duration))
+
+        self.assertEqual(conf[12345].store_use, ['tpl_5'])
+        self.assertLess(duration, 1.0)
+
+    def test_split_command_call(self):
+        self.assertEqual(split_command_call('check_ping'), ('check_ping', []))
+        self.assertEqual(split_command_call(' check_ping !100,20%!500,60%'),
+                         ('check_ping', ['100,20%', '500,60%']))
+        # Escaped exclamation mark
+        self.assertEqual(split_command_call(r'check_http!-s "Hello\!"!80'),
+                         ('check_http', ['-s "Hello!"', '80']))
+
+        cache = {}
+        name, args = split_command_call('check_ping!1!2', cache)
+        self.assertEqual((name, args), ('check_ping', ['1', '2']))
+        self.assertIn('check_ping!1!2', cache)
+        # The cached arguments are not modified by the caller
+        args.append('3')
+        self.assertEqual(split_command_call('check_ping!1!2', cache), ('check_ping', ['1', '2']))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest2
+
+from alignak_backend_import.loading import ParsingCapture
+
+
+class Config(object):
+    def read_legacy_cfg_files(self, cfg_files):
+        return '\n'.join(cfg_files)
+
+    def read_config_buf(self, cfg_buffer):
+        return {'host': [{'host_name': [line]} for line in cfg_buffer.splitlines()]}
+
+
+class Arbiter(object):
+    def load_monitoring_config_file(self):
+        conf = Config()
+        return conf.read_config_buf(conf.read_legacy_cfg_files(['host_1', 'host_2']))
+
+
+class TestLoading(unittest2.TestCase):
+
+    def test_capture(self):
+        read_config_buf = Config.__dict__['read_config_buf']
+        with ParsingCapture(Config) as parsing:
+            raw_objects = Arbiter().load_monitoring_config_file()
+
+        # The same parsed objects, not parsed again
+        self.assertIs(parsing.raw_objects, raw_objects)
+        self.assertEqual(parsing.raw_objects,
+                         {'host': [{'host_name': ['host_1']}, {'host_name': ['host_2']}]})
+        self.assertEqual(sorted(parsing.durations), ['read_config_buf', 'read_legacy_cfg_files'])
+
+        # The configuration class is restored
+        self.assertIs(Config.__dict__['read_config_buf'], read_config_buf)
+        Config().read_config_buf('host_3')
+        self.assertEqual(len(parsing.raw_objects['host']), 2)
+
+    def test_restored_on_error(self):
+        def failing(config, cfg_buffer):
+            raise ValueError(cfg_buffer)
+
+        class FailingConfig(Config):
+            read_config_buf = failing
+
+        with self.assertRaises(ValueError):
+            with ParsingCapture(FailingConfig) as parsing:
+                FailingConfig().read_config_buf('host_1')
+        self.assertIs(FailingConfig.__dict__['read_config_buf'], failing)
+        self.assertIsNone(parsing.raw_objects)
+        # Inherited methods are not replaced
+        self.assertNotIn('read_legacy_cfg_files', vars(FailingConfig))
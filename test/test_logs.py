@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+import tempfile
+import unittest2
+
+from alignak_backend_import.logs import TRACE, Progress, get_phase_logger, parse_levels
+from alignak_backend_import.logs import setup_logger
+
+
+class Formatted(object):
+    """Count how many times the object is formatted"""
+    count = 0
+
+    def __str__(self):
+        Formatted.count += 1
+        return 'formatted'
+
+
+class Messages(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestLogs(unittest2.TestCase):
+
+    def tearDown(self):
+        setup_logger()
+
+    def test_parse_levels(self):
+        self.assertEqual(parse_levels(None), {})
+        self.assertEqual(parse_levels('host=debug, service=WARNING'),
+                         {'host': logging.DEBUG, 'service': logging.WARNING})
+        with self.assertRaises(ValueError):
+            parse_levels('host=verbose')
+
+    def test_deferred_formatting(self):
+        logger = setup_logger(logging.INFO)
+        Formatted.count = 0
+        logger.debug("Not displayed: %s", Formatted())
+        logger.log(TRACE, "Not displayed: %s", Formatted())
+        self.assertEqual(Formatted.count, 0)
+
+    def test_phases_levels(self):
+        setup_logger(logging.INFO, phases_levels={'service': logging.DEBUG})
+        messages = Messages()
+        logging.getLogger('alignak_backend_import').addHandler(messages)
+        get_phase_logger('host').debug("host message")
+        get_phase_logger('service').debug("service message")
+        self.assertEqual(messages.messages, ['service message'])
+
+    def test_log_file(self):
+        fd, log_file = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            logger = setup_logger(logging.INFO, log_file)
+            logger.info("Imported %d hosts", 3)
+            for handler in logger.handlers:
+                handler.flush()
+            with open(log_file) as lines:
+                content = lines.read()
+            self.assertIn("INFO: alignak_backend_import: Imported 3 hosts", content)
+        finally:
+            setup_logger()
+            os.remove(log_file)
+
+    def test_progress(self):
+        logger = logging.getLogger('test_progress')
+        logger.setLevel(logging.INFO)
+        messages = Messages()
+        logger.addHandler(messages)
+
+        progress = Progress(logger, 'host', 1000, interval=3600)
+        for dummy in range(500):
+            progress.update()
+        # Sampled: nothing displayed before the interval
+        self.assertEqual(messages.messages, [])
+        progress.done()
+        self.assertEqual(len(messages.messages), 1)
+        self.assertTrue(messages.messages[0].startswith('host: 500/1000 elements (50%)'))
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest2
+
+from alignak_backend_import.memory import MemoryTracker, format_size
+from alignak_backend_import.profiling import Profiler
+
+
+class TestMemory(unittest2.TestCase):
+
+    def test_format_size(self):
+        self.assertEqual(format_size(None), 'n/a')
+        self.assertEqual(format_size(512), '512.0 B')
+        self.assertEqual(format_size(-3 * 1024 * 1024), '-3.0 MiB')
+        self.assertEqual(format_size(5 * 1024 ** 3), '5.0 GiB')
+
+    @unittest2.skipIf(sys.version_info < (3, 4), "tracemalloc requires Python 3.4")
+    def test_checkpoints(self):
+        profiler = Profiler()
+        profiler.memory = MemoryTracker(top=3)
+        profiler.memory.start()
+        try:
+            with profiler.span('load_configuration'):
+                kept = [{'host_name': 'host_%d' % index} for index in range(20000)]
+            with profiler.span('host', 'phase', 'host'):
+                pass
+            with profiler.span('host.update_later', 'step', 'host'):
+                pass
+        finally:
+            profiler.memory.stop()
+
+        # No checkpoint for the steps
+        checkpoints = profiler.memory.checkpoints
+        self.assertEqual([checkpoint['name'] for checkpoint in checkpoints],
+                         ['load_configuration', 'host'])
+        self.assertGreater(checkpoints[0]['growth'], 1024 * 1024)
+        self.assertLess(abs(checkpoints[1]['growth']), checkpoints[0]['growth'])
+        self.assertIn(__file__.rstrip('c'), checkpoints[0]['top'][0][0])
+        self.assertGreater(checkpoints[0]['peak_rss'], 0)
+
+        report = profiler.get_report()
+        self.assertEqual(report['stages'][0]['memory']['name'], 'load_configuration')
+        lines = profiler.memory.get_lines()
+        self.assertTrue(lines[0].startswith('load_configuration: peak RSS '))
+        self.assertEqual(len(kept), 20000)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import tempfile
+import unittest2
+
+from alignak_backend_import.metrics import LatencyHistogram, RequestsMetrics
+
+
+class TestMetrics(unittest2.TestCase):
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.get_percentile(50), 0.0)
+        # 1ms to 100ms
+        for latency in range(1, 101):
+            histogram.add(latency / 1000.0)
+        for percent in [50, 95, 99]:
+            expected = percent / 1000.0
+            self.assertGreaterEqual(histogram.get_percentile(percent), expected)
+            self.assertLess(histogram.get_percentile(percent), expected * 1.1)
+        self.assertEqual(histogram.get_percentile(100), 0.1)
+        self.assertAlmostEqual(histogram.to_dict()['mean'], 0.0505)
+
+        # The buckets count does not depend on the latencies count
+        for dummy in range(10000):
+            histogram.add(0.05)
+        self.assertLess(len(histogram.buckets), 60)
+
+    def test_endpoints(self):
+        metrics = RequestsMetrics()
+        metrics.record('POST', 'host', 0.020, sent=100, received=50)
+        metrics.record('POST', 'host', 0.040, sent=100, received=50, error=True)
+        metrics.record('GET', 'host', 0.010, received=1000)
+
+        report = metrics.get_report()
+        self.assertEqual([(endpoint['method'], endpoint['resource'], endpoint['requests'])
+                          for endpoint in report], [('GET', 'host', 1), ('POST', 'host', 2)])
+        post = report[1]
+        self.assertEqual((post['errors'], post['sent'], post['received']), (1, 200, 100))
+        self.assertEqual(post['latency']['max'], 0.040)
+
+        lines = metrics.get_lines()
+        self.assertTrue(lines[1].startswith('POST host: 2 requests, 1 errors, sent 200 bytes, '
+                                            'received 100 bytes, latency p50 '))
+
+        fd, report_file = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            metrics.write_report(report_file)
+            with open(report_file) as content:
+                self.assertEqual(len(json.load(content)), 2)
+        finally:
+            os.remove(report_file)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest2
+
+from alignak_backend_import.pipeline import Pipeline
+
+
+def rename(item, later):
+    item['name'] = item.pop('host_name')
+    return item
+
+
+def ignore_all(item, later):
+    if item['name'] == 'All':
+        return None
+    return item
+
+
+def keep_later(item, later):
+    later['parents'] = item.pop('parents')
+    return item
+
+
+class TestPipeline(unittest2.TestCase):
+
+    def test_run(self):
+        pipeline = Pipeline([('rename', rename), ('ignore', ignore_all), ('later', keep_later)])
+
+        later = {}
+        item = pipeline.run({'host_name': 'host_1', 'parents': ['router']}, later)
+        self.assertEqual(item, {'name': 'host_1'})
+        self.assertEqual(later, {'parents': ['router']})
+
+        # The next steps are not run for an ignored element
+        later = {}
+        self.assertIsNone(pipeline.run({'host_name': 'All', 'parents': []}, later))
+        self.assertEqual(later, {})
+
+        stats = dict((name, calls) for name, calls, dummy in pipeline.get_stats())
+        self.assertEqual(stats, {'rename': 2, 'ignore': 2, 'later': 1})
+        durations = [duration for dummy, dummy, duration in pipeline.get_stats()]
+        self.assertEqual(durations, sorted(durations, reverse=True))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import tempfile
+import unittest2
+
+from alignak_backend_import.profiling import Profiler
+from alignak_backend_import.session import ConnectionsCounter
+
+
+class TestProfiling(unittest2.TestCase):
+
+    def test_report(self):
+        profiler = Profiler()
+        with profiler.span('load_configuration'):
+            pass
+
+        # Requests are counted once connected
+        profiler.counter = ConnectionsCounter()
+        with profiler.span('host_template', 'phase', 'host', 2):
+            profiler.counter.count_request('host')
+            profiler.counter.count_request('host')
+        with profiler.span('host', 'phase', 'host', 10):
+            profiler.counter.count_request('command')
+            with profiler.span('host.update_later', 'step', 'host'):
+                profiler.counter.count_request('host')
+
+        report = profiler.get_report()
+        self.assertEqual([span['name'] for span in report['stages']], ['load_configuration'])
+        self.assertEqual([(span['name'], span['objects'], span['requests'])
+                          for span in report['phases']],
+                         [('host_template', 2, 2), ('host', 10, 1)])
+        self.assertEqual([span['name'] for span in report['steps']], ['host.update_later'])
+        self.assertEqual(report['requests'], 4)
+
+        host = report['resources']['host']
+        self.assertEqual(host['phases'], ['host_template', 'host'])
+        self.assertEqual(host['objects'], 12)
+        self.assertEqual(host['requests'], 3)
+        self.assertGreaterEqual(report['wall_time'], host['wall_time'])
+
+    def test_write_report(self):
+        profiler = Profiler()
+        span = profiler.span('build_templates').start()
+        span.stop()
+        fd, report_file = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            profiler.write_report(report_file)
+            with open(report_file) as content:
+                report = json.load(content)
+            self.assertEqual(report['stages'][0]['name'], 'build_templates')
+            self.assertEqual(report['requests'], 0)
+        finally:
+            os.remove(report_file)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+import unittest2
+
+from alignak_backend_import.registry import ObjectsRegistry
+
+
+class TestObjectsRegistry(unittest2.TestCase):
+
+    def test_resolve(self):
+        registry = ObjectsRegistry()
+        self.assertFalse(registry)
+        self.assertIsNone(registry.resolve('host', 'host_1'))
+
+        registry.register('host', 'id_1', 'host_1', 'uuid_1')
+        registry.register('host', 'id_2', 'host_2', 'uuid_2')
+        self.assertTrue(registry)
+        self.assertIn('host', registry)
+        self.assertEqual(registry.count('host'), 2)
+
+        # By _id, name or uuid
+        self.assertEqual(registry.resolve('host', 'id_1'), 'id_1')
+        self.assertEqual(registry.resolve('host', 'host_2'), 'id_2')
+        self.assertEqual(registry.resolve('host', 'uuid_2'), 'id_2')
+        self.assertIsNone(registry.resolve('host', 'id_1', by_id=False))
+        self.assertIsNone(registry.resolve('host', 'unknown'))
+        self.assertIsNone(registry.resolve('host', ['host_1']))
+        self.assertIsNone(registry.resolve('service', 'host_1'))
+
+        self.assertEqual(registry.get_name('host', 'id_2'), 'host_2')
+        self.assertEqual(registry.get_name('host', 'unknown', 'default'), 'default')
+
+    def test_first_registered_wins(self):
+        registry = ObjectsRegistry()
+        registry.register('service', 'id_1', 'http', 'uuid_1', host='host_1')
+        registry.register('service', 'id_2', 'http', 'uuid_2', host='host_2')
+        self.assertEqual(registry.resolve('service', 'http'), 'id_1')
+        self.assertEqual(registry.get_by_host('service', 'host_1', 'http'), 'id_1')
+        self.assertEqual(registry.get_by_host('service', 'host_2', 'http'), 'id_2')
+        self.assertIsNone(registry.get_by_host('service', 'host_3', 'http'))
+
+    def test_init(self):
+        registry = ObjectsRegistry()
+        registry.register('host_template', 'id_1', 'tpl_1')
+        registry.register('host', 'id_1', 'tpl_1')
+        self.assertEqual(registry.resources(), ['host', 'host_template'])
+        registry.init('host_template')
+        self.assertEqual(registry.count('host_template'), 0)
+        self.assertEqual(registry.count('host'), 1)
+
+    def test_scaling(self):
+        """Resolving links must not depend on the number of registered objects"""
+        def run(count):
+            registry = ObjectsRegistry()
+            start = time.time()
+            for idx in range(count):
+                registry.register('service', 'id_%d' % idx, 'svc_%d' % idx, 'uuid_%d' % idx,
+                                  host='host_%d' % (idx % 100))
+            for idx in range(count):
+                assert registry.resolve('service', 'svc_%d' % idx) == 'id_%d' % idx
+                assert registry.resolve('service', 'uuid_%d' % idx) == 'id_%d' % idx
+            return time.time() - start
+
+        small = run(10000)
+        large = run(100000)
+        print("Registry: 10k objects: %.3fs, 100k objects: %.3fs" % (small, large))
+        # Linear is ~10 times longer, quadratic would be ~100 times longer
+        self.assertLess(large, max(small, 0.01) * 30)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import threading
+import time
+import unittest2
+
+from alignak_backend_import.scheduler import PhasesScheduler
+
+
+class TestPhasesScheduler(unittest2.TestCase):
+
+    def build(self, function=None):
+        scheduler = PhasesScheduler()
+        function = function or (lambda: None)
+        scheduler.add('realm', function, provides='realm', uses=['realm'], weight=1)
+        scheduler.add('command', function, provides='command', uses=['realm'], weight=10)
+        scheduler.add('timeperiod', function, provides='timeperiod', uses=['realm'], weight=2)
+        scheduler.add('host', function, provides='host',
+                      uses=['realm', 'command', 'timeperiod', 'hostgroup'], weight=50)
+        scheduler.add('hostgroup', function, provides='hostgroup',
+                      uses=['realm', 'host', 'hostgroup'], weight=5)
+        return scheduler
+
+    def test_requirements(self):
+        scheduler = self.build()
+        requirements = scheduler.get_requirements()
+        self.assertEqual(requirements['realm'], [])
+        self.assertEqual(requirements['command'], ['realm'])
+        self.assertEqual(sorted(requirements['host']), ['command', 'realm', 'timeperiod'])
+        # hostgroup is declared after host that uses the hostgroups: it must run after host
+        self.assertEqual(sorted(requirements['hostgroup']), ['host', 'realm'])
+
+    def test_order_levels(self):
+        scheduler = self.build()
+        self.assertEqual(scheduler.get_order(),
+                         ['realm', 'command', 'timeperiod', 'host', 'hostgroup'])
+        self.assertEqual(scheduler.get_levels(),
+                         [['realm'], ['command', 'timeperiod'], ['host'], ['hostgroup']])
+
+        path, total = scheduler.get_critical_path()
+        self.assertEqual(path, ['realm', 'command', 'host', 'hostgroup'])
+        self.assertEqual(total, 66)
+
+        plan = scheduler.get_plan()
+        self.assertIn("Critical path (weight: 66): realm -> command -> host -> hostgroup", plan)
+        self.assertIn("Total weight: 68", plan)
+
+    def test_errors(self):
+        scheduler = PhasesScheduler()
+        scheduler.add('a', None, requires=['b'])
+        scheduler.add('b', None, requires=['a'])
+        with self.assertRaises(ValueError):
+            scheduler.get_order()
+        with self.assertRaises(ValueError):
+            scheduler.add('a', None)
+
+        scheduler = PhasesScheduler()
+        scheduler.add('a', None, requires=['unknown'])
+        with self.assertRaises(ValueError):
+            scheduler.get_order()
+
+    def test_run(self):
+        lock = threading.Lock()
+        started = []
+        finished = []
+
+        def phase(name):
+            def run():
+                with lock:
+                    started.append((name, list(finished)))
+                time.sleep(0.05)
+                with lock:
+                    finished.append(name)
+            return run
+
+        scheduler = PhasesScheduler()
+        scheduler.add('realm', phase('realm'), provides='realm')
+        scheduler.add('command', phase('command'), provides='command', uses=['realm'])
+        scheduler.add('timeperiod', phase('timeperiod'), provides='timeperiod', uses=['realm'])
+        scheduler.add('host', phase('host'), provides='host', uses=['command', 'timeperiod'])
+
+        scheduler.run(workers=4)
+        self.assertEqual(sorted(finished), ['command', 'host', 'realm', 'timeperiod'])
+        started = dict(started)
+        self.assertEqual(started['realm'], [])
+        self.assertEqual(started['command'], ['realm'])
+        self.assertEqual(started['timeperiod'], ['realm'])
+        self.assertEqual(sorted(started['host']), ['command', 'realm', 'timeperiod'])
+
+    def test_run_exit(self):
+        ran = []
+
+        def fail():
+            raise SystemExit(5)
+
+        scheduler = PhasesScheduler()
+        scheduler.add('realm', fail, provides='realm')
+        scheduler.add('command', lambda: ran.append('command'), uses=['realm'])
+        for workers in [1, 4]:
+            with self.assertRaises(SystemExit) as context:
+                scheduler.run(workers=workers)
+            self.assertEqual(context.exception.code, 5)
+        self.assertEqual(ran, [])
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import threading
+import unittest2
+
+import requests
+
+try:
+    from socketserver import ThreadingMixIn
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    from SocketServer import ThreadingMixIn
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from alignak_backend_import.session import setup_session
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class Client(object):
+    """Same session and timeout attributes as the backend client"""
+    def __init__(self):
+        self.session = requests.Session()
+        self.timeout = None
+
+
+class TestSession(unittest2.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        cls.url = 'http://127.0.0.1:%d/' % cls.server.server_address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_keep_alive(self):
+        client = Client()
+        counter = setup_session(client, pool_size=2, connect_timeout=5, read_timeout=30)
+        self.assertEqual(client.timeout, (5, 30))
+        for dummy in range(5):
+            client.session.get(self.url, timeout=client.timeout)
+        self.assertEqual(counter.get_stats(), {'requests': 5, 'new': 1, 'reused': 4})
+
+    def test_no_keep_alive(self):
+        client = Client()
+        counter = setup_session(client, keep_alive=False)
+        self.assertIsNone(client.timeout)
+        for dummy in range(5):
+            client.session.get(self.url)
+        self.assertEqual(counter.get_stats(), {'requests': 5, 'new': 5, 'reused': 0})
+
+    def test_max_in_flight(self):
+        client = Client()
+        counter = setup_session(client, pool_size=4, max_in_flight=2)
+        threads = [threading.Thread(target=client.session.get, args=(self.url,))
+                   for dummy in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = counter.get_stats()
+        self.assertEqual(stats['requests'], 8)
+        self.assertLessEqual(stats['new'], 2)
+        self.assertEqual(stats['new'] + stats['reused'], 8)
+
+    def test_resources(self):
+        client = Client()
+        client.url_endpoint_root = self.url + 'backend'
+        counter = setup_session(client)
+        client.session.get(self.url + 'backend/host', params={'max_results': 1})
+        client.session.get(self.url + 'backend/host/5a1b2c')
+        client.session.get(self.url + 'backend/service')
+        self.assertEqual(counter.get_requests(), 3)
+        self.assertEqual(counter.get_requests('host'), 2)
+        self.assertEqual(counter.get_requests('service'), 1)
+        self.assertEqual(counter.get_requests('user'), 0)
+
+    def test_metrics(self):
+        client = Client()
+        counter = setup_session(client)
+        for dummy in range(3):
+            client.session.get(self.url + 'host')
+        report = counter.metrics.get_report()
+        self.assertEqual(len(report), 1)
+        self.assertEqual((report[0]['method'], report[0]['resource'], report[0]['requests'],
+                          report[0]['errors'], report[0]['received']), ('GET', 'host', 3, 0, 6))
+        self.assertGreater(report[0]['latency']['p50'], 0)